@@ -0,0 +1,107 @@
+"""
+Benchmark: SEOLogAnalyzer reports on many distinct paths
+
+Builds a synthetic frame of bot rows directly (parsing millions of lines
+would dominate the run), then times building the base aggregates and each
+report. With --lambdas it also times the per-group Python lambda the
+reports used to aggregate with, (x == 200).sum() per path, against the
+named sum of the precomputed is_200 column.
+
+Usage:
+    python benchmarks/bench_analyzer.py [n_rows] [unique_paths] [--lambdas]
+    python benchmarks/bench_analyzer.py 3000000 1000000 --lambdas
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import SEOLogAnalyzer
+
+BOTS = ['googlebot', 'googlebot-mobile', 'bingbot', 'yandex', 'ahrefs', 'semrush', 'mj12bot']
+BOT_WEIGHTS = [40, 13, 20, 7, 7, 7, 6]
+STATUSES = [200, 301, 304, 404, 500]
+STATUS_WEIGHTS = [85, 5, 3, 5, 2]
+
+REPORTS = [
+    ('crawl_budget_summary', ()),
+    ('bot_distribution', ()),
+    ('googlebot_analysis', ()),
+    ('status_code_analysis', ()),
+    ('crawl_frequency_by_path', ()),
+    ('identify_crawl_traps', ()),
+    ('time_series_analysis', ()),
+    ('response_time_analysis', ()),
+    ('get_error_pages', (404,)),
+    ('daily_crawl_report', ()),
+]
+
+
+def make_bot_frame(n: int, unique_paths: int, seed: int = 0) -> pd.DataFrame:
+    """Bot rows shaped like ApacheLogParser output, over two days"""
+    rng = np.random.default_rng(seed)
+    
+    def weighted(values, weights):
+        p = np.array(weights) / sum(weights)
+        return np.array(values)[rng.choice(len(values), size=n, p=p)]
+    
+    seconds = np.sort(rng.integers(0, 2 * 86400, size=n))
+    timestamp = pd.Timestamp('2024-12-01', tz='UTC') + pd.to_timedelta(seconds, unit='s')
+    status = weighted(STATUSES, STATUS_WEIGHTS).astype(np.int32)
+    
+    df = pd.DataFrame({
+        'timestamp': timestamp,
+        'path': pd.Series(rng.integers(0, unique_paths, size=n)).map('/product/{}.html'.format),
+        'status': status,
+        'bytes': np.where(status == 200, rng.integers(200, 60000, size=n), 0),
+        'bot_type': weighted(BOTS, BOT_WEIGHTS),
+        'is_bot': True,
+    })
+    df['path'] = df['path'].astype(str)
+    df['bot_type'] = df['bot_type'].astype(str)
+    df['date'] = df['timestamp'].dt.date
+    df['hour'] = df['timestamp'].dt.hour
+    return df
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    n = int(args[0]) if args else 3000000
+    unique_paths = int(args[1]) if len(args) > 1 else 1000000
+    
+    df = make_bot_frame(n, unique_paths)
+    print(f"{n:,} bot rows, {df['path'].nunique():,} unique paths\n")
+    
+    analyzer = SEOLogAnalyzer(df)
+    elapsed, aggregates = timed(lambda: analyzer.aggregates)
+    print(f"{'base aggregates':<26}{elapsed:>8.2f}s  ({len(aggregates):,} groups)")
+    
+    total = elapsed
+    for name, report_args in REPORTS:
+        elapsed, _ = timed(getattr(analyzer, name), *report_args)
+        total += elapsed
+        print(f"{name:<26}{elapsed:>8.2f}s")
+    print(f"{'all reports':<26}{total:>8.2f}s")
+    
+    if '--lambdas' in sys.argv:
+        grain = aggregates.grain
+        print("\nsuccessful requests per path")
+        elapsed, _ = timed(lambda: df.groupby('path')['status'].agg(lambda x: (x == 200).sum()))
+        print(f"{'lambda on rows':<26}{elapsed:>8.2f}s")
+        elapsed, _ = timed(lambda: grain.groupby('path').agg(successful=('is_200', 'sum')))
+        print(f"{'named sum of is_200':<26}{elapsed:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: bot classification throughput
+
+Compares the original per-pattern re.search loop against BotClassifier
+(default and strict mode) on synthetic user agents.
+
+Usage:
+    python benchmarks/bench_bot_classifier.py [n_lines]
+"""
+
+import re
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import ApacheLogParser
+from src.classifier import BotClassifier
+from benchmarks.synthetic import make_lines
+
+
+def legacy_identify_bot(user_agent):
+    """Original ApacheLogParser._identify_bot implementation"""
+    for bot_name, pattern in ApacheLogParser.BOT_PATTERNS.items():
+        if re.search(pattern, user_agent, re.IGNORECASE):
+            return bot_name
+    return None
+
+
+def measure(func, user_agents):
+    start = time.perf_counter()
+    results = [func(ua) for ua in user_agents]
+    elapsed = time.perf_counter() - start
+    return len(user_agents) / elapsed, results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    parser = ApacheLogParser()
+    user_agents = [parser.parse_line(line)['user_agent'] for line in make_lines(n)]
+    
+    default = BotClassifier(ApacheLogParser.BOT_PATTERNS)
+    uncached = BotClassifier(ApacheLogParser.BOT_PATTERNS, cache_size=0)
+    strict = BotClassifier(ApacheLogParser.BOT_PATTERNS, strict=True)
+    
+    base_rate, expected = measure(legacy_identify_bot, user_agents)
+    print(f"{'legacy re.search loop':<32}{base_rate:>14,.0f} lines/sec")
+    
+    for label, classifier in [('BotClassifier (no memo)', uncached),
+                              ('BotClassifier', default),
+                              ('BotClassifier strict', strict)]:
+        rate, results = measure(classifier.classify, user_agents)
+        print(f"{label:<32}{rate:>14,.0f} lines/sec  ({rate / base_rate:.1f}x)")
+        if classifier is not strict:
+            assert results == expected, 'classifier disagrees with legacy loop'
+    
+    mobile = sum(1 for r in measure(strict.classify, user_agents)[1] if r == 'googlebot_mobile')
+    print(f"\nstrict mode recovered {mobile:,} googlebot_mobile hits shadowed by 'googlebot'")
+
+
+if __name__ == "__main__":
+    main()
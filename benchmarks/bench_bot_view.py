@@ -0,0 +1,68 @@
+"""
+Benchmark: SEOLogAnalyzer memory with a copied bot_df vs bot_view
+
+Parses a synthetic log, then measures with tracemalloc the memory the
+analyzer adds on top of the parsed frame: retained after construction,
+and peak while building the aggregates and running every report. numpy
+and pandas buffers are traced, so the numbers cover the copied columns.
+
+Usage:
+    python benchmarks/bench_bot_view.py [n_lines]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer import SEOLogAnalyzer
+from src.parser import ApacheLogParser
+from benchmarks.synthetic import write_log
+
+REPORTS = [
+    'crawl_budget_summary', 'bot_distribution', 'googlebot_analysis', 'status_code_analysis',
+    'crawl_frequency_by_path', 'identify_crawl_traps', 'time_series_analysis',
+    'response_time_analysis', 'get_error_pages', 'daily_crawl_report',
+]
+
+MIB = 1 << 20
+
+
+def measure(df, bot_view: bool):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    
+    analyzer = SEOLogAnalyzer(df, bot_view=bot_view)
+    retained, _ = tracemalloc.get_traced_memory()
+    for report in REPORTS:
+        getattr(analyzer, report)()
+    _, peak = tracemalloc.get_traced_memory()
+    
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    del analyzer
+    return retained / MIB, peak / MIB, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        df = ApacheLogParser().parse_file(write_log(os.path.join(tmp, 'access.log'), n, unique_paths=50000))
+    
+    frame = df.memory_usage(deep=True).sum() / MIB
+    print(f"{len(df):,} rows, {int(df['is_bot'].sum()):,} bot rows, frame {frame:,.0f} MiB\n")
+    print(f"{'':<12}{'retained':>12}{'peak':>12}{'time':>10}   (memory on top of the frame)")
+    
+    for label, bot_view in [('bot_df copy', False), ('bot_view', True)]:
+        retained, peak, elapsed = measure(df, bot_view)
+        print(f"{label:<12}{retained:>8,.1f} MiB{peak:>8,.1f} MiB{elapsed:>9.1f}s")
+
+
+if __name__ == "__main__":
+    main()
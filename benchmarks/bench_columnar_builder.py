@@ -0,0 +1,85 @@
+"""
+Benchmark: list-of-dicts vs ColumnBuilder accumulation
+
+Measures peak resident memory and wall time for accumulating parsed lines
+and materializing the DataFrame, the way parse_file did before (one dict per
+line, then pd.DataFrame(records)) and with the columnar builder. Each
+variant runs in a fresh interpreter so peak RSS is not shared.
+
+Usage:
+    python benchmarks/bench_columnar_builder.py [n_lines]
+    python benchmarks/bench_columnar_builder.py 10000000
+"""
+
+import resource
+import subprocess
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from src.parser import ApacheLogParser
+from benchmarks.synthetic import iter_lines
+
+
+def build_dicts(parser, n):
+    records = []
+    for line in iter_lines(n, unique_paths=50000):
+        parsed = parser._scan_line(line)
+        if parsed:
+            records.append(parsed)
+    df = pd.DataFrame(records)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d/%b/%Y:%H:%M:%S %z', utc=True)
+    return df
+
+
+def build_columns(parser, n):
+    builder = parser._new_builder()
+    for values in parser._scan_lines(iter_lines(n, unique_paths=50000)):
+        builder.append(values)
+    return parser._to_dataframe(builder)
+
+
+VARIANTS = {'dicts': build_dicts, 'columns': build_columns}
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_variant(name, n):
+    parser = ApacheLogParser()
+    baseline = peak_rss_mib()
+    start = time.perf_counter()
+    df = VARIANTS[name](parser, n)
+    elapsed = time.perf_counter() - start
+    print(f"{peak_rss_mib() - baseline:.1f} {elapsed:.2f} {len(df)}")
+
+
+def main():
+    if len(sys.argv) > 2:
+        run_variant(sys.argv[2], int(sys.argv[1]))
+        return
+    
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"Accumulating {n:,} lines\n")
+    
+    peaks = {}
+    for label, name in [('list of dicts', 'dicts'), ('ColumnBuilder', 'columns')]:
+        output = subprocess.run(
+            [sys.executable, __file__, str(n), name],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        peak, elapsed, rows = float(output[0]), float(output[1]), int(output[2])
+        peaks[name] = peak
+        print(f"{label:<16}{peak:>10,.0f} MiB peak RSS{elapsed:>10.1f} s   ({rows:,} rows)")
+    
+    print(f"\npeak memory reduced {peaks['dicts'] / peaks['columns']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark: split-based fast path vs LOG_PATTERN
+
+Checks a str.partition tokenizer differentially against the regex on a
+corpus of well-formed and deliberately mangled lines (every line the
+tokenizer accepts must produce exactly the regex's groups), then compares
+their throughput. The parser no longer has this fast path: on CPython the
+compiled regex is the faster tokenizer and parse_file gained nothing from
+trying the split first, so the script is kept to re-check that finding.
+
+Usage:
+    python benchmarks/bench_fast_path.py [n_lines]
+"""
+
+import random
+import sys
+import os
+import time
+from typing import Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import ApacheLogParser
+from benchmarks.synthetic import make_lines
+
+
+# Substitutions applied to well-formed lines to build the differential corpus
+MUTATIONS = [
+    lambda line: line.replace('66.249.', '2001:db8::', 1),
+    lambda line: line.replace(' - - [', ' - frank [', 1),
+    lambda line: line.replace('GET /', 'GET /a b/', 1),
+    lambda line: line.replace('GET /', 'GET /\t', 1),
+    lambda line: line.replace('GET /', 'GET /café/', 1),
+    lambda line: line.replace('GET /', 'GET  ', 1),
+    lambda line: line.replace('GET ', 'M_SEARCH ', 1),
+    lambda line: line.replace('GET ', '', 1),
+    lambda line: line.replace(' HTTP/1.1', '', 1),
+    lambda line: line.replace('HTTP/1.1', 'HTTP/x', 1),
+    lambda line: line.replace('" 200 ', '" 2²0 ', 1),
+    lambda line: line.replace('" 200 ', '" 2OO ', 1),
+    lambda line: line.replace(' "-" ', ' "a"b" ', 1),
+    lambda line: line.replace('Mozilla', 'Mo\\"zilla', 1),
+    lambda line: line.replace(':00] ', ':00]] ', 1),
+    lambda line: line.replace('[', '[]', 1),
+    lambda line: line + ' 1234 "extra"',
+    lambda line: line[:-1],
+    lambda line: line.rsplit(' "', 1)[0],
+]
+
+
+def split_combined(line: str) -> Optional[Tuple[str, ...]]:
+    """
+    Tokenize a well-formed Combined line without the regex
+    
+    Splits on the fixed delimiters with str.partition and checks every
+    field against the character class LOG_PATTERN would require. Fields in
+    that pattern cannot overlap their delimiters, so whenever these checks
+    pass the result equals LOG_PATTERN.match(line).groups(). Anything
+    unusual (IPv6, non-ASCII paths, stray quotes, missing fields) returns
+    None and is left to the regex.
+    
+    Args:
+        line: Stripped log line
+        
+    Returns:
+        (ip, timestamp, method, path, status, bytes, referer, user_agent)
+        or None
+    """
+    ip, sep, rest = line.partition(' - - [')
+    if not sep or not ip or ip.strip('0123456789.'):
+        return None
+    
+    timestamp, sep, rest = rest.partition('] "')
+    if not sep or not timestamp or ']' in timestamp:
+        return None
+    
+    method, sep, rest = rest.partition(' ')
+    if not sep or not (method.isascii() and method.isalnum()):
+        return None
+    
+    path, sep, rest = rest.partition(' HTTP/')
+    if not sep or not path or not (path.isascii() and path.isprintable()) or ' ' in path:
+        return None
+    
+    version, sep, rest = rest.partition('" ')
+    if not sep or not version or version.strip('0123456789.'):
+        return None
+    
+    status, sep, rest = rest.partition(' ')
+    if not sep or not (status.isascii() and status.isdigit()):
+        return None
+    
+    size, sep, rest = rest.partition(' "')
+    if not sep or not (size == '-' or (size.isascii() and size.isdigit())):
+        return None
+    
+    referer, sep, rest = rest.partition('" "')
+    if not sep or '"' in referer:
+        return None
+    
+    user_agent, sep, _ = rest.partition('"')
+    if not sep:
+        return None
+    
+    return ip, timestamp, method, path, status, size, referer, user_agent
+
+
+def build_corpus(n, seed=0):
+    rng = random.Random(seed)
+    lines = make_lines(n, seed)
+    corpus = list(lines)
+    for line in lines:
+        corpus.append(rng.choice(MUTATIONS)(line))
+        cut = rng.randrange(len(line))
+        corpus.append(line[:cut])
+        corpus.append(line[:cut] + rng.choice(' "[]-/\t') + line[cut:])
+    return corpus
+
+
+def check_differential(corpus):
+    pattern = ApacheLogParser.LOG_PATTERN
+    accepted = 0
+    for line in corpus:
+        line = line.strip()
+        values = split_combined(line)
+        if values is None:
+            continue
+        accepted += 1
+        match = pattern.match(line)
+        assert match is not None and match.groups() == values, f'fast path differs on {line!r}'
+    return accepted
+
+
+def tokenize_rate(tokenize, lines):
+    start = time.perf_counter()
+    rows = sum(1 for line in lines if tokenize(line.strip()) is not None)
+    return len(lines) / (time.perf_counter() - start), rows
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    
+    corpus = build_corpus(n // 4)
+    accepted = check_differential(corpus)
+    print(f"differential corpus: {len(corpus):,} lines, {accepted:,} taken by the fast path, "
+          f"all identical to LOG_PATTERN")
+    
+    lines = make_lines(n)
+    base_rate, base_rows = tokenize_rate(ApacheLogParser.LOG_PATTERN.match, lines)
+    rate, rows = tokenize_rate(split_combined, lines)
+    assert rows == base_rows
+    print(f"\n{'tokenize, LOG_PATTERN':<28}{base_rate:>14,.0f} lines/sec")
+    print(f"{'tokenize, fast path':<28}{rate:>14,.0f} lines/sec  ({rate / base_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
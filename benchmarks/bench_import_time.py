@@ -0,0 +1,81 @@
+"""
+Benchmark: import time of the package modules, with a regression budget
+
+Each module is imported in fresh interpreters (median of several runs,
+bytecode compiled beforehand) and must stay within its budget without
+loading pandas, numpy, matplotlib or seaborn, which are deferred to first
+DataFrame or plot use (see src/lazy.py). Exits with status 1 when a budget
+is exceeded, so it can run in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py [runs]
+"""
+
+import compileall
+import statistics
+import subprocess
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> import time budget in milliseconds. Several times the time
+# measured on a developer machine, which is mostly stdlib (re, typing,
+# json, ...); importing pandas alone takes several hundred.
+BUDGETS = {
+    'src.classifier': 40,
+    'src.records': 80,
+    'src.parser': 150,
+    'src.analyzer': 80,
+    'src.visualizer': 80,
+}
+
+# Modules that must only be imported on first use
+HEAVY = ('pandas', 'numpy', 'matplotlib', 'seaborn')
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "heavy = [name for name in {heavy!r} if name in sys.modules]\n"
+    "print(elapsed * 1000, ','.join(heavy) or '-')\n"
+)
+
+
+def measure(module: str, runs: int):
+    times = []
+    heavy = '-'
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(output[0]))
+        heavy = output[1]
+    return statistics.median(times), heavy
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    
+    # Measure imports, not compiling .py files to bytecode
+    compileall.compile_dir(os.path.join(ROOT, 'src'), quiet=1)
+    
+    print(f"{'module':<18}{'median':>10}{'budget':>10}  heavy modules loaded")
+    failed = []
+    for module, budget in BUDGETS.items():
+        elapsed, heavy = measure(module, runs)
+        ok = elapsed <= budget and heavy == '-'
+        if not ok:
+            failed.append(module)
+        print(f"{module:<18}{elapsed:>8.1f}ms{budget:>8}ms  {heavy:<36}{'' if ok else 'FAIL'}")
+    
+    if failed:
+        print(f"\nimport budget exceeded: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nall imports within budget")
+
+
+if __name__ == "__main__":
+    main()
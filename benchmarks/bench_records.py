@@ -0,0 +1,81 @@
+"""
+Benchmark: parse_line dicts vs iter_records LogRecords
+
+Compares per-record memory (tracemalloc, records kept alive) and
+throughput of ApacheLogParser.parse_line and records.iter_records, and
+checks that importing src.records does not pull in pandas or numpy.
+
+Usage:
+    python benchmarks/bench_records.py [n_lines]
+"""
+
+import subprocess
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import ApacheLogParser
+from src.records import iter_records
+from benchmarks.synthetic import make_lines
+
+
+def parse_dicts(parser, lines):
+    return [record for record in map(parser.parse_line, lines) if record]
+
+
+def parse_records(parser, lines):
+    return list(iter_records(lines))
+
+
+def measure(parse, parser, lines):
+    # Warm the timestamp and user agent memos so both variants start equal
+    parse(parser, lines[:1000])
+
+    tracemalloc.start()
+    records = parse(parser, lines)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+
+    start = time.perf_counter()
+    records = parse(parser, lines)
+    elapsed = time.perf_counter() - start
+    return retained / len(records), len(records) / elapsed
+
+
+def heavy_imports() -> list:
+    code = (
+        "import sys; import src.records; "
+        "print(' '.join(m for m in ('pandas', 'numpy') if m in sys.modules))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    return output.split()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lines = make_lines(n, unique_paths=50000)
+    parser = ApacheLogParser()
+    print(f"Parsing {n:,} lines (records kept in memory)\n")
+
+    results = {}
+    for label, parse in [('parse_line dicts', parse_dicts), ('iter_records', parse_records)]:
+        per_record, rate = measure(parse, parser, lines)
+        results[label] = per_record
+        print(f"{label:<20}{per_record:>10,.0f} bytes/record{rate:>14,.0f} records/sec")
+
+    print(f"\nper-record memory reduced "
+          f"{results['parse_line dicts'] / results['iter_records']:.1f}x")
+
+    loaded = heavy_imports()
+    print(f"import src.records loads: {', '.join(loaded) if loaded else 'neither pandas nor numpy'}")
+
+
+if __name__ == "__main__":
+    main()
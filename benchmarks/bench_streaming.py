@@ -0,0 +1,89 @@
+"""
+Benchmark: SEOLogAnalyzer on a whole parsed frame vs fed chunk by chunk
+
+Writes a synthetic log, then measures with tracemalloc the peak memory
+and the time of parsing it and running every report, once with
+parse_file and once with iter_chunks and SEOLogAnalyzer.update(), and
+checks that both give the same reports. A third run streams into an
+approximate analyzer (HyperLogLog sketches and heavy hitter summaries
+instead of per-path totals) and reports the memory it retains.
+
+Usage:
+    python benchmarks/bench_streaming.py [n_lines] [chunk_rows]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer import SEOLogAnalyzer
+from src.parser import ApacheLogParser
+from benchmarks.synthetic import write_log
+
+REPORTS = [
+    'crawl_budget_summary', 'bot_distribution', 'googlebot_analysis', 'status_code_analysis',
+    'crawl_frequency_by_path', 'identify_crawl_traps', 'time_series_analysis',
+    'response_time_analysis', 'get_error_pages', 'daily_crawl_report',
+]
+
+MIB = 1 << 20
+
+
+def batch(filepath: str, chunk_rows: int) -> SEOLogAnalyzer:
+    return SEOLogAnalyzer(ApacheLogParser().parse_file(filepath))
+
+
+def streamed(filepath: str, chunk_rows: int, approximate: bool = False) -> SEOLogAnalyzer:
+    analyzer = SEOLogAnalyzer(approximate=approximate)
+    for chunk in ApacheLogParser().iter_chunks(filepath, chunk_rows=chunk_rows):
+        analyzer.update(chunk)
+    return analyzer
+
+
+def approximated(filepath: str, chunk_rows: int) -> SEOLogAnalyzer:
+    return streamed(filepath, chunk_rows, approximate=True)
+
+
+def measure(build, filepath: str, chunk_rows: int):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    
+    analyzer = build(filepath, chunk_rows)
+    reports = [getattr(analyzer, report)() for report in REPORTS]
+    
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return reports, retained / MIB, peak / MIB, elapsed
+
+
+def same(a, b) -> bool:
+    return a.equals(b) if hasattr(a, 'equals') else a == b
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    chunk_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = write_log(os.path.join(tmp, 'access.log'), n, unique_paths=50000)
+        print(f"{n:,} lines, chunks of {chunk_rows:,} rows\n")
+        print(f"{'':<14}{'retained':>12}{'peak':>12}{'time':>10}")
+        
+        results = {}
+        for label, build in [('parse_file', batch), ('update()', streamed), ('approximate', approximated)]:
+            results[label], retained, peak, elapsed = measure(build, filepath, chunk_rows)
+            print(f"{label:<14}{retained:>8,.1f} MiB{peak:>8,.1f} MiB{elapsed:>9.1f}s")
+    
+    matches = all(same(a, b) for a, b in zip(results['parse_file'], results['update()']))
+    print(f"\nreports identical: {matches}")
+
+
+if __name__ == "__main__":
+    main()
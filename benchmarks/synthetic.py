@@ -0,0 +1,72 @@
+"""
+Synthetic Apache Combined log generator for benchmarks
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List
+
+
+USER_AGENTS = [
+    # (weight, user agent)
+    (40, 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'),
+    (25, 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Mobile/15E148 Safari/604.1'),
+    (20, 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15'),
+    (6, 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'),
+    (2, 'Mozilla/5.0 (Linux; Android 6.0.1; Nexus 5X Build/MMB29P) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36 (compatible; Googlebot-Mobile/2.1; +http://www.google.com/bot.html)'),
+    (3, 'Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)'),
+    (1, 'Mozilla/5.0 (compatible; YandexBot/3.0; +http://yandex.com/bots)'),
+    (1, 'Mozilla/5.0 (compatible; AhrefsBot/7.0; +http://ahrefs.com/robot/)'),
+    (1, 'Mozilla/5.0 (compatible; SemrushBot/7~bl; +http://www.semrush.com/bot.html)'),
+    (1, 'Mozilla/5.0 (compatible; MJ12bot/v1.4.8; http://mj12bot.com/)'),
+]
+
+PATHS = ['/', '/index.html', '/products/', '/blog/', '/about.html', '/contact.htm',
+         '/static/app.js', '/static/style.css', '/images/logo.png', '/sitemap.xml',
+         '/robots.txt', '/search?q=shoes', '/category/shoes?page=2']
+
+STATUSES = [(85, 200), (5, 301), (3, 304), (5, 404), (2, 500)]
+
+
+def _weighted(rng: random.Random, choices):
+    weights, values = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+def iter_lines(n: int, seed: int = 0, unique_paths: int = 0) -> Iterator[str]:
+    """
+    Yield n synthetic log lines in timestamp order
+    
+    Args:
+        n: Number of lines
+        seed: Random seed
+        unique_paths: If set, draw paths from this many distinct product URLs
+    """
+    rng = random.Random(seed)
+    ts = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    for i in range(n):
+        if rng.random() < 0.3:
+            ts += timedelta(seconds=1)
+        if unique_paths:
+            path = f'/product/{rng.randrange(unique_paths)}.html'
+        else:
+            path = rng.choice(PATHS)
+        status = _weighted(rng, STATUSES)
+        size = rng.randrange(200, 60000) if status == 200 else 0
+        ip = f'66.249.{rng.randrange(256)}.{rng.randrange(256)}'
+        yield (f'{ip} - - [{ts.strftime("%d/%b/%Y:%H:%M:%S %z")}] '
+               f'"GET {path} HTTP/1.1" {status} {size if size else "-"} '
+               f'"-" "{_weighted(rng, USER_AGENTS)}"')
+
+
+def make_lines(n: int, seed: int = 0, unique_paths: int = 0) -> List[str]:
+    """Materialize n synthetic log lines"""
+    return list(iter_lines(n, seed, unique_paths))
+
+
+def write_log(filepath: str, n: int, seed: int = 0, unique_paths: int = 0) -> str:
+    """Write n synthetic log lines to filepath"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for line in iter_lines(n, seed, unique_paths):
+            f.write(line + '\n')
+    return filepath
@@ -175,6 +175,9 @@ def main():
         path_freq.to_csv(f'{output_dir}/path_frequency.csv')
         print(f"✓ Path frequency exported to {output_dir}/path_frequency.csv")
     
+    cache = analyzer.cache_info()
+    print(f"\nAnalyzer cache: {cache['hits']} reports reused, {cache['misses']} computed")
+    
     print("\n" + "=" * 60)
     print("ANALYSIS COMPLETE!")
     print("=" * 60)
@@ -0,0 +1,709 @@
+"""
+Crawl Aggregates
+Base aggregates of bot traffic, computed once and shared by every report
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .lazy import lazy_import
+from .parser import concat_frames
+from .sketches import (
+    SpaceSaving, check_precision, estimate, grouped_registers, hash_values, merge_registers,
+)
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+# Grain of the base aggregates: every SEOLogAnalyzer report groups by a
+# subset of these columns
+GRAIN = ('bot_type', 'path', 'status', 'date', 'hour')
+
+# Status indicators as half-open [low, high) ranges. The grain holds the
+# number of requests of each group for which they hold, so reports count
+# them with a plain cythonized sum instead of a per-group Python lambda
+STATUS_INDICATORS = {
+    'is_200': (200, 201),
+    'is_4xx': (400, 500),
+    'is_5xx': (500, 600),
+}
+
+# Per-group totals of the grain; merging partial aggregates adds them up
+MEASURES = ('requests', 'bytes', *STATUS_INDICATORS)
+
+# Cells of the approximate distinct path counts: one HyperLogLog sketch of
+# the paths per (date, bot_type, status class)
+SKETCH_KEYS = ('date', 'bot_type', 'status_class')
+
+# Grain of the approximate mode, which leaves the per-path reports to the
+# heavy hitter summaries so that memory does not grow with distinct paths
+APPROXIMATE_GRAIN = ('bot_type', 'status', 'date', 'hour')
+
+# Heavy hitter summaries of the approximate mode, by their key columns.
+# error_paths only counts requests with a status of ERROR_STATUS or more,
+# googlebot_paths those of bot types containing GOOGLEBOT. Every path has
+# one counter per summary (per status in error_paths), so each reported
+# count is bounded; the requests of each bot type are summed alongside
+HEAVY_HITTERS = {
+    'paths': ('path',),
+    'googlebot_paths': ('path',),
+    'error_paths': ('status', 'path'),
+}
+ERROR_STATUS = 400
+GOOGLEBOT = 'googlebot'
+
+# Prefix of the per-bot-type request measures of the heavy hitter summaries
+BOT_MEASURE = 'bot:'
+
+# Integer codes of a key column (-1 for missing values) and the values
+# they index: categories for categoricals, else distinct values in order
+# of first appearance
+KeyCodes = Tuple['np.ndarray', 'pd.Index']
+
+
+def _key_codes(series: pd.Series) -> KeyCodes:
+    """Integer codes of a key column"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int64), series.cat.categories
+    codes, uniques = pd.factorize(series, sort=False)
+    return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+
+def _group_ids(n: int, codes: List[KeyCodes]) -> np.ndarray:
+    """
+    Group number of every row, numbered in order of first appearance
+    
+    Key codes are combined into a single int64 key, so the grouping is one
+    hash pass over one integer array instead of a multi-column groupby.
+    Missing values form groups of their own.
+    """
+    key = np.zeros(n, dtype=np.int64)
+    span = 1
+    for column_codes, uniques in codes:
+        size = len(uniques) + 1
+        if span * size >= 2 ** 63:
+            # Renumber the combinations seen so far to stay within int64
+            key, seen = pd.factorize(key, sort=False)
+            span = len(seen)
+        key = key * size + (column_codes + 1)
+        span *= size
+    
+    ids, _ = pd.factorize(key, sort=False)
+    return ids
+
+
+def _first_rows(ids: np.ndarray) -> np.ndarray:
+    """Position of the first row of every group of first-appearance ids"""
+    # A group starts where the running maximum of the ids grows
+    return np.flatnonzero(np.diff(np.maximum.accumulate(ids), prepend=-1) > 0)
+
+
+def _group_grain(values: Callable[[str], pd.Series], n: int,
+                 keys: Sequence[str] = GRAIN) -> Tuple[np.ndarray, np.ndarray, List[KeyCodes]]:
+    """
+    Group n rows by the grain columns
+    
+    Args:
+        values: Returns the n values of a key column
+        n: Number of rows
+        keys: Grain columns
+    
+    Returns:
+        Group id of every row, first row of every group and the key codes
+        of the grain columns
+    """
+    codes = [_key_codes(values(column)) for column in keys]
+    ids = _group_ids(n, codes)
+    return ids, _first_rows(ids), codes
+
+
+def _union_categories(categories: Iterable[Dict[str, pd.Index]]) -> Dict[str, pd.Index]:
+    """Categories of categorical columns of consecutive chunks, as concat_frames unions them"""
+    union = {}
+    for chunk in categories:
+        for column, values in chunk.items():
+            union[column] = union[column].union(values) if column in union else values
+    return union
+
+
+def _bot_measures(codes: KeyCodes, selected: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-row indicators of the bot types of the selected rows, as heavy hitter measures"""
+    bot_codes, bot_types = codes
+    present = np.unique(bot_codes[selected & (bot_codes >= 0)])
+    return {BOT_MEASURE + str(bot_types[code]): bot_codes == code for code in present}
+
+
+def bot_measures(counters: pd.DataFrame) -> pd.DataFrame:
+    """
+    Requests per bot type of heavy hitter counters
+    
+    Counted while the key held a counter, so each is a lower bound.
+    
+    Args:
+        counters: SpaceSaving.counters of a HEAVY_HITTERS summary
+    
+    Returns:
+        DataFrame with one column per bot type
+    """
+    columns = [column for column in counters.columns if column.startswith(BOT_MEASURE)]
+    return counters[columns].rename(columns=lambda column: column[len(BOT_MEASURE):])
+
+
+def _heavy_hitters(codes: Dict[str, KeyCodes], keys: Sequence[str], selected: np.ndarray,
+                   measures: Dict[str, np.ndarray], capacity: int) -> SpaceSaving:
+    """
+    Space-Saving summary of exact request counts per distinct key
+    
+    Args:
+        codes: Key codes of every column, per row
+        keys: Columns to count by
+        selected: Boolean mask of the rows to count
+        measures: Per-row values to sum alongside
+        capacity: Counters to keep
+    
+    Returns:
+        Summary of the largest counts; rows with a missing key are skipped
+    """
+    for column in keys:
+        selected = selected & (codes[column][0] >= 0)
+    key_codes = [(codes[column][0][selected], codes[column][1]) for column in keys]
+    ids = _group_ids(int(selected.sum()), key_codes)
+    first_rows = _first_rows(ids)
+    
+    counts = {'count': np.bincount(ids, minlength=len(first_rows))}
+    for name, weights in measures.items():
+        counts[name] = np.bincount(ids, weights=weights[selected], minlength=len(first_rows))
+    
+    # Only the keys of the largest counts (and the first one left out,
+    # which sets the floor) are looked up
+    kept = np.argsort(-counts['count'], kind='stable')[:capacity + 1]
+    values = [
+        np.asarray(uniques, dtype=object)[column_codes[first_rows[kept]]]
+        for column_codes, uniques in key_codes
+    ]
+    index = pd.MultiIndex.from_arrays(values, names=list(keys)) if len(keys) > 1 else pd.Index(values[0], name=keys[0])
+    frame = pd.DataFrame({name: total[kept].astype(np.int64) for name, total in counts.items()}, index=index)
+    
+    return SpaceSaving.from_counts(frame, capacity, total=len(ids))
+
+
+def status_classes(status: pd.Series) -> pd.Series:
+    """Status class labels ('2xx', '4xx', ...) of a status column"""
+    codes, classes = pd.factorize(status // 100, sort=False)
+    # Missing statuses (code -1) pick the trailing None
+    labels = np.array([f"{int(value)}xx" for value in classes] + [None], dtype=object)
+    return pd.Series(labels[codes], index=status.index, name='status_class')
+
+
+def _bound(stamps: List[pd.Timestamp], func: str) -> Optional[pd.Timestamp]:
+    """min or max of per-chunk bounds, skipping NaT like Series.min()"""
+    stamps = [stamp for stamp in stamps if stamp is not None]
+    return getattr(pd.Series(stamps), func)() if stamps else None
+
+
+def _sum_dtype(dtype) -> np.dtype:
+    """dtype numpy gives the sum of an integer column (e.g. uint32 -> uint64)"""
+    return np.zeros(1, dtype=dtype).sum().dtype
+
+
+class CrawlAggregates:
+    """
+    Request and byte totals of bot traffic per (bot_type, path, status,
+    date, hour)
+    
+    Built with one grouping pass over the bot rows; the reports then group
+    this much smaller table instead of rescanning the rows. Groups keep the
+    order in which they first appear in the log, and each group of any
+    coarser key set also first appears in that order, so reports that
+    depend on appearance order (value_counts ties, unique bots per path)
+    come out exactly as if computed from the rows. Key columns keep their
+    dtypes.
+    
+    The integer codes of the key columns are kept too, so value counts,
+    distinct counts and string matches work on integers or on the distinct
+    values only.
+    
+    Aggregates of consecutive chunks of a log combine with merge() into
+    the aggregates of the whole log: totals add up, groups are matched by
+    key and the time range widens. Memory grows with the number of
+    distinct groups and response sizes, not with the number of rows.
+    
+    With a precision, distinct paths are also counted approximately, in a
+    HyperLogLog sketch per SKETCH_KEYS cell; sketches merge with the rest.
+    With counters as well, the grain leaves out the paths (see
+    APPROXIMATE_GRAIN) and the per-path reports are answered from
+    Space-Saving summaries of the HEAVY_HITTERS keys instead.
+    
+    Attributes:
+        grain: DataFrame with the keys columns, 'requests', 'bytes' and the
+            STATUS_INDICATORS columns
+        keys: Key columns of grain: GRAIN, or APPROXIMATE_GRAIN with counters
+        categories: Categories of the categorical key columns of the
+            parsed frame, bot rows or not
+        dtypes: Column dtypes of the parsed frame
+        total_requests: Requests in the log, bots or not
+        bot_requests: Bot requests
+        start: Earliest timestamp in the log (None without rows)
+        end: Latest timestamp in the log (None without rows)
+        byte_sizes: Number of bot responses per response size in bytes
+        precision: HyperLogLog precision of the path sketches (None: exact
+            distinct counts only)
+        sketch_keys: DataFrame of the SKETCH_KEYS cells
+        sketch_registers: Registers of the path sketch of every cell
+        counters: Counters per heavy hitter summary (None: exact per-path
+            reports)
+        heavy_hitters: SpaceSaving summary per HEAVY_HITTERS name, with the
+            requests of each bot type (see bot_measures) and the
+            successful requests of 'paths' as extra measures
+    """
+    
+    def __init__(self, df: pd.DataFrame, rows: Optional[np.ndarray] = None,
+                 precision: Optional[int] = None, counters: Optional[int] = None):
+        """
+        Args:
+            df: Parsed log DataFrame
+            rows: Positions of the bot rows in df (default: every row is a
+                bot row). The columns needed are then taken one at a time,
+                so the bot rows are never copied as a whole.
+            precision: Also sketch the distinct paths of every SKETCH_KEYS
+                cell, with 2 ** precision registers per sketch
+            counters: Drop the paths from the grain and keep this many
+                counters per heavy hitter summary (needs a precision)
+        """
+        if precision is not None:
+            check_precision(precision)
+        if counters is not None and precision is None:
+            raise ValueError("counters need a precision: without paths in the grain, distinct paths are only sketched")
+        
+        def bot_values(column: str) -> pd.Series:
+            return df[column] if rows is None else df[column].take(rows)
+        
+        # bots_only frames hold just the bot rows plus the overall count
+        self.total_requests = df.attrs.get('total_requests', len(df))
+        self.bot_requests = len(df) if rows is None else len(rows)
+        self.start = df['timestamp'].min() if not df.empty else None
+        self.end = df['timestamp'].max() if not df.empty else None
+        self.dtypes = df.dtypes
+        self.keys = GRAIN if counters is None else APPROXIMATE_GRAIN
+        self.categories = {
+            column: df[column].cat.categories for column in self.keys
+            if column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype)
+        }
+        self.precision = precision
+        self.counters = counters
+        self.sketch_keys = None
+        self.sketch_registers = None
+        self.heavy_hitters = None
+        
+        if not self.bot_requests:
+            self._set_grain(pd.DataFrame(columns=[*self.keys, *MEASURES]), {})
+            self.byte_sizes = pd.Series(dtype=np.int64)
+            if precision is not None:
+                self.sketch_keys = pd.DataFrame(columns=list(SKETCH_KEYS))
+                self.sketch_registers = np.zeros((0, 1 << precision), dtype=np.uint8)
+            return
+        
+        ids, first_rows, codes = _group_grain(bot_values, self.bot_requests, self.keys)
+        positions = first_rows if rows is None else rows[first_rows]
+        grain = pd.DataFrame({
+            column: df[column].take(positions).reset_index(drop=True) for column in self.keys
+        })
+        grain['requests'] = np.bincount(ids, minlength=len(first_rows)).astype(np.int64)
+        bot_bytes = bot_values('bytes')
+        byte_sums = np.bincount(ids, weights=bot_bytes.to_numpy(), minlength=len(first_rows))
+        grain['bytes'] = byte_sums.astype(_sum_dtype(df['bytes'].dtype))
+        
+        # status is part of the grain, so a group's requests either all
+        # match an indicator or none do
+        status = grain['status']
+        for name, (low, high) in STATUS_INDICATORS.items():
+            grain[name] = grain['requests'].where((status >= low) & (status < high), 0)
+        
+        self.byte_sizes = bot_bytes.value_counts(sort=False).rename_axis(None)
+        self._set_grain(grain, {
+            column: (column_codes[first_rows], uniques)
+            for column, (column_codes, uniques) in zip(self.keys, codes)
+        })
+        
+        if precision is None:
+            return
+        
+        # Sketches and summaries reuse the key codes of the grouping above
+        key_codes = dict(zip(self.keys, codes))
+        if 'path' not in key_codes:
+            key_codes['path'] = _key_codes(bot_values('path'))
+        
+        classes = status_classes(bot_values('status'))
+        cell_ids = _group_ids(self.bot_requests, [
+            key_codes['date'], key_codes['bot_type'], _key_codes(classes)
+        ])
+        first_cells = _first_rows(cell_ids)
+        cell_rows = first_cells if rows is None else rows[first_cells]
+        self.sketch_keys = pd.DataFrame({
+            'date': df['date'].take(cell_rows).reset_index(drop=True),
+            'bot_type': df['bot_type'].take(cell_rows).reset_index(drop=True),
+            'status_class': classes.iloc[first_cells].reset_index(drop=True),
+        })
+        
+        # Paths are hashed once per distinct value
+        path_codes, paths = key_codes['path']
+        present = path_codes >= 0
+        hashes = hash_values(paths)[0][path_codes[present]]
+        self.sketch_registers = grouped_registers(cell_ids[present], len(first_cells), hashes, precision)
+        
+        if counters is None:
+            return
+        
+        # Each chunk is counted exactly and cut down to its largest counts
+        status = bot_values('status').to_numpy()
+        bot_codes, bot_types = key_codes['bot_type']
+        # Missing bot types (code -1) pick the trailing False
+        is_googlebot = np.array([GOOGLEBOT in str(bot).lower() for bot in bot_types] + [False])
+        selections = {
+            'paths': np.ones(self.bot_requests, dtype=bool),
+            'googlebot_paths': is_googlebot[bot_codes],
+            'error_paths': status >= ERROR_STATUS,
+        }
+        self.heavy_hitters = {}
+        for name, selected in selections.items():
+            measures = {'successful': status == 200} if name == 'paths' else {}
+            measures.update(_bot_measures(key_codes['bot_type'], selected))
+            self.heavy_hitters[name] = _heavy_hitters(
+                key_codes, HEAVY_HITTERS[name], selected, measures, counters
+            )
+    
+    def _set_grain(self, grain: pd.DataFrame, codes: Dict[str, KeyCodes]):
+        self.grain = grain
+        self._codes = codes
+        self._grouped = {}
+    
+    def _extend_categories(self):
+        """Give the categorical grain keys every category in self.categories"""
+        grain, codes = self.grain, self._codes
+        for column, categories in self.categories.items():
+            values = grain[column]
+            if not isinstance(values.dtype, pd.CategoricalDtype) or values.cat.categories.equals(categories):
+                continue
+            if grain is self.grain:
+                grain, codes = grain.copy(deep=False), dict(codes)
+            grain[column] = values.cat.set_categories(categories)
+            codes[column] = _key_codes(grain[column])
+        if grain is not self.grain:
+            self._set_grain(grain, codes)
+    
+    @classmethod
+    def merge(cls, parts: Iterable[CrawlAggregates]) -> CrawlAggregates:
+        """
+        Combine the aggregates of consecutive chunks of a log
+        
+        The result equals the aggregates of the concatenated chunks
+        (concat_frames), group order and categories included, as long as
+        the parts are given in log order. Merging is associative, so
+        partial results may be merged again.
+        
+        Args:
+            parts: CrawlAggregates of the chunks, in log order
+        
+        Returns:
+            New CrawlAggregates
+        """
+        parts = list(parts)
+        with_bots = [part for part in parts if part.bot_requests]
+        modes = {(part.precision, part.counters) for part in parts}
+        if len(modes) > 1:
+            raise ValueError(f"cannot merge aggregates of different (precision, counters): {modes}")
+        
+        merged = cls.__new__(cls)
+        merged.precision, merged.counters = modes.pop()
+        merged.keys = parts[0].keys
+        # Chunks without bots add no groups but still add categories
+        merged.categories = _union_categories(part.categories for part in parts)
+        merged.total_requests = sum(part.total_requests for part in parts)
+        merged.bot_requests = sum(part.bot_requests for part in with_bots)
+        merged.start = _bound([part.start for part in parts], 'min')
+        merged.end = _bound([part.end for part in parts], 'max')
+        merged.dtypes = (with_bots or parts)[0].dtypes
+        
+        if len(with_bots) < 2:
+            source = with_bots[0] if with_bots else parts[0]
+            merged.byte_sizes = source.byte_sizes
+            merged._set_grain(source.grain, source._codes)
+            merged.sketch_keys = source.sketch_keys
+            merged.sketch_registers = source.sketch_registers
+            merged.heavy_hitters = source.heavy_hitters
+            merged._extend_categories()
+            return merged
+        
+        merged.byte_sizes = pd.concat(
+            [part.byte_sizes for part in with_bots]
+        ).groupby(level=0, sort=False).sum()
+        
+        # concat_frames unions the categories of categorical keys
+        stacked = concat_frames(part.grain for part in with_bots)
+        ids, first_rows, codes = _group_grain(stacked.__getitem__, len(stacked), merged.keys)
+        grain = pd.DataFrame({
+            column: stacked[column].take(first_rows).reset_index(drop=True) for column in merged.keys
+        })
+        for column in MEASURES:
+            totals = np.bincount(ids, weights=stacked[column].to_numpy(), minlength=len(first_rows))
+            grain[column] = totals.astype(stacked[column].dtype)
+        
+        merged._set_grain(grain, {
+            column: (column_codes[first_rows], uniques)
+            for column, (column_codes, uniques) in zip(merged.keys, codes)
+        })
+        merged._extend_categories()
+        
+        merged.sketch_keys = None
+        merged.sketch_registers = None
+        if merged.precision is not None:
+            keys = concat_frames(part.sketch_keys for part in with_bots)
+            cell_ids = _group_ids(len(keys), [_key_codes(keys[column]) for column in SKETCH_KEYS])
+            first_cells = _first_rows(cell_ids)
+            merged.sketch_keys = keys.take(first_cells).reset_index(drop=True)
+            merged.sketch_registers = merge_registers(
+                cell_ids, len(first_cells), np.concatenate([part.sketch_registers for part in with_bots])
+            )
+        
+        merged.heavy_hitters = None
+        if merged.counters is not None:
+            merged.heavy_hitters = {
+                name: SpaceSaving.union([part.heavy_hitters[name] for part in with_bots])
+                for name in HEAVY_HITTERS
+            }
+        return merged
+    
+    def response_sizes(self) -> Dict:
+        """
+        Statistics of the bot response sizes, from their distribution
+        
+        Same values as the mean(), median(), max(), min() and sum() of the
+        bytes of the bot rows.
+        
+        Returns:
+            Dict with mean, median, max, min and total
+        """
+        sizes = self.byte_sizes.sort_index()
+        values = sizes.index.to_numpy()
+        counts = sizes.to_numpy()
+        n = counts.sum()
+        # Summed in the dtype Series.sum() uses (uint32 -> uint64)
+        dtype = _sum_dtype(values.dtype)
+        total = (values.astype(dtype) * counts.astype(dtype)).sum()
+        
+        # The middle response, or the two middle ones for an even count
+        cumulative = np.cumsum(counts)
+        low, high = values[np.searchsorted(cumulative, [(n - 1) // 2, n // 2], side='right')]
+        
+        return {
+            'mean': np.float64(total) / n,
+            'median': (np.float64(low) + np.float64(high)) / 2,
+            'max': values[-1],
+            'min': values[0],
+            'total': total,
+        }
+    
+    def __len__(self) -> int:
+        return len(self.grain)
+    
+    def _is_categorical(self, column: str) -> bool:
+        return isinstance(self.grain[column].dtype, pd.CategoricalDtype)
+    
+    def grouped(self, by: str):
+        """
+        grain.groupby(by, observed=True), kept so that every report
+        grouping by the same column factorizes it only once
+        """
+        if by not in self._grouped:
+            self._grouped[by] = self.grain.groupby(by, observed=True)
+        return self._grouped[by]
+    
+    def nunique(self, column: str) -> int:
+        """Number of distinct values of a GRAIN column, like Series.nunique()"""
+        codes, uniques = self._codes[column]
+        if self._is_categorical(column):
+            return int(np.count_nonzero(np.bincount(codes[codes >= 0], minlength=len(uniques))))
+        return len(uniques)
+    
+    def distinct_paths(self, by: Sequence[str] = ()):
+        """
+        Number of distinct paths, overall or per group of SKETCH_KEYS columns
+        
+        Exact without a precision. Otherwise estimated from the merged path
+        sketches of the cells, with a relative standard error of about
+        1.04 / sqrt(2 ** precision).
+        
+        Args:
+            by: SKETCH_KEYS columns to group by (default: no grouping)
+        
+        Returns:
+            int without by, else int64 Series indexed like groupby(by)
+        """
+        by = list(by)
+        if self.precision is None:
+            if not by:
+                return self.nunique('path')
+            if by == ['date']:
+                groups = self.grouped('date')
+            else:
+                grain = self.grain
+                if 'status_class' in by:
+                    grain = grain.assign(status_class=status_classes(grain['status']))
+                groups = grain.groupby(by, observed=True)
+            
+            # Count distinct (group, path code) pairs on integers
+            group_ids = groups.ngroup().to_numpy()
+            codes, paths = self._codes['path']
+            present = (group_ids >= 0) & (codes >= 0)
+            size = len(paths) + 1
+            pairs = pd.unique(group_ids[present] * size + codes[present])
+            counts = np.bincount(pairs // size, minlength=groups.ngroups)
+            return pd.Series(counts.astype(np.int64), index=groups.size().index)
+        
+        if not by:
+            if not len(self.sketch_registers):
+                return 0
+            return int(round(float(estimate(self.sketch_registers.max(axis=0)))))
+        
+        groups = self.sketch_keys.groupby(by, observed=True)
+        registers = merge_registers(groups.ngroup().to_numpy(), groups.ngroups, self.sketch_registers)
+        return pd.Series(np.round(estimate(registers)).astype(np.int64), index=groups.size().index)
+    
+    def contains(self, column: str, pattern: str, case: bool = True) -> pd.Series:
+        """
+        Rows of grain where a string column matches, like
+        grain[column].str.contains(pattern, case=case, na=False) but tested
+        once per distinct value
+        
+        Returns:
+            Boolean Series aligned with grain
+        """
+        codes, uniques = self._codes[column]
+        matches = pd.Series(uniques).str.contains(pattern, case=case, na=False)
+        # Missing values (code -1) pick the trailing False
+        hits = np.append(matches.to_numpy(dtype=bool), False)
+        return pd.Series(hits[codes], index=self.grain.index)
+    
+    def value_counts(self, column: str, rows: pd.DataFrame = None) -> pd.Series:
+        """
+        Requests per value of a column, like rows[column].value_counts()
+        
+        Same order as pandas: sorted by count, with the unsorted order
+        (categories for categoricals, first appearance otherwise) deciding
+        between equal counts.
+        
+        Args:
+            column: One of the GRAIN columns
+            rows: Boolean selection of grain (defaults to all of it)
+        
+        Returns:
+            Series of request counts indexed by value
+        """
+        codes, uniques = self._codes[column]
+        rows = self.grain if rows is None else rows
+        weights = rows['requests'].to_numpy()
+        if rows is not self.grain:
+            codes = codes[rows.index.to_numpy()]
+        
+        present = codes >= 0
+        if self._is_categorical(column):
+            # Every category is listed, including unseen ones
+            counts = np.bincount(codes[present], weights=weights[present], minlength=len(uniques))
+            values = uniques
+        else:
+            local, seen = pd.factorize(codes[present], sort=False)
+            counts = np.bincount(local, weights=weights[present], minlength=len(seen))
+            values = uniques.take(seen)
+        
+        counts = pd.Series(counts.astype(np.int64), index=values.rename(column), name='count')
+        return counts.sort_values(ascending=False, kind='stable')
+    
+    def top_value(self, by: str, column: str) -> pd.Series:
+        """
+        Most requested value of a column within each group, like
+        grain.groupby(by)[column].agg(lambda x: x.value_counts().index[0])
+        
+        Args:
+            by: GRAIN column to group by
+            column: GRAIN column whose top value is reported
+        
+        Returns:
+            Series of values (in the column's dtype) indexed by group
+        """
+        groups = self.grouped(by)
+        group_ids = groups.ngroup().to_numpy()
+        codes, uniques = self._codes[column]
+        size = len(uniques) + 1
+        
+        pair_ids, pairs = pd.factorize(group_ids * size + (codes + 1), sort=False)
+        counts = np.bincount(pair_ids, weights=self.grain['requests'].to_numpy())
+        pair_groups, pair_values = np.divmod(pairs, size)
+        
+        # Ties go to the value value_counts lists first
+        rank = pair_values if self._is_categorical(column) else np.arange(len(pairs))
+        order = np.lexsort((rank, -counts, pair_groups))
+        order = order[(pair_groups[order] >= 0) & (pair_values[order] > 0)]
+        winners = order[np.diff(pair_groups[order], prepend=-1) > 0]
+        
+        top = self.grain[column].iloc[_first_rows(pair_ids)[winners]]
+        return top.set_axis(groups.size().index.take(pair_groups[winners]))
+    
+    def joined_unique(self, by: str, column: str, rows: pd.DataFrame,
+                      sep: str = ', ') -> pd.Series:
+        """
+        Distinct values of a column within each group, in order of first
+        appearance, joined into one string per group, like
+        rows.groupby(by)[column].agg(lambda x: sep.join(x.unique()))
+        
+        Args:
+            by: GRAIN column to group by
+            column: GRAIN column whose values are joined
+            rows: Boolean selection of grain
+            sep: Separator between values
+        
+        Returns:
+            Series of strings indexed by group, sorted like groupby(by)
+        """
+        groups = rows.groupby(by, observed=True)
+        group_ids = groups.ngroup().to_numpy()
+        codes = self._codes[column][0][rows.index.to_numpy()]
+        
+        # First row of every (group, value) pair, ordered by group and then
+        # by position
+        _, first = np.unique(group_ids * (codes.max() + 2) + (codes + 1), return_index=True)
+        first = first[group_ids[first] >= 0]
+        first = first[np.lexsort((first, group_ids[first]))]
+        
+        values = rows[column].iloc[first].to_numpy(dtype=object)
+        bounds = np.flatnonzero(np.diff(group_ids[first])) + 1
+        
+        return pd.Series([sep.join(group) for group in np.split(values, bounds)],
+                         index=groups.size().index)
+    
+    def source_dtypes(self, frame: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+        """
+        Give integer totals the dtype of the column they were summed from
+        
+        pandas reports a grouped integer sum in the column's own dtype when
+        every total fits (e.g. int32 status counts stay int32), so totals
+        taken from the grain are cast the same way to match the reports
+        computed from the rows.
+        
+        Args:
+            frame: Grouped totals
+            columns: Result column -> source column of the bot rows
+        
+        Returns:
+            frame, with the columns cast where they fit
+        """
+        for result, source in columns.items():
+            dtype = self.dtypes[source]
+            values = frame[result]
+            if not (isinstance(dtype, np.dtype) and dtype.kind in 'iu' and values.dtype.kind in 'iu'):
+                continue
+            limits = np.iinfo(dtype)
+            if values.empty or (values.min() >= limits.min and values.max() <= limits.max):
+                frame[result] = values.astype(dtype)
+        return frame
@@ -3,26 +3,231 @@ SEO Log Analyzer
 Analyzes parsed log data for SEO insights and crawl budget optimization
 """
 
-import pandas as pd
-from typing import Dict, List, Optional
+from __future__ import annotations
+
+import copy
+import functools
+import inspect
+from typing import Dict, List, Optional, Tuple
 from collections import Counter
 
+from .aggregates import ERROR_STATUS, CrawlAggregates, bot_measures, status_classes
+from .lazy import lazy_import
+from .sketches import DEFAULT_COUNTERS, DEFAULT_PRECISION, check_precision
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+def _frame_version(df: pd.DataFrame) -> Tuple:
+    """
+    Cheap fingerprint of a frame
+    
+    Changes when the frame is replaced, rows are appended or dropped,
+    columns are added or removed, or the overall request count of a
+    bots_only frame changes. Values edited in place are not seen.
+    """
+    return id(df), df.shape, tuple(df.columns), df.attrs.get('total_requests')
+
+
+def _bot_positions(df: pd.DataFrame) -> np.ndarray:
+    """Positions of the bot rows of a parsed frame"""
+    if 'is_bot' not in df.columns:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero((df['is_bot'] == True).to_numpy())
+
+
+def _memoized(method):
+    """
+    Cache a report's result per argument values
+    
+    Arguments are bound to the signature with defaults applied, so
+    report() and report(default_value) share an entry. Callers get a copy
+    of the cached result and may modify it freely.
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def report(self, *args, **kwargs):
+        self._sync()
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(bound.arguments.items())[1:]
+        
+        try:
+            cached = key in self._results
+        except TypeError:
+            # Unhashable argument values are not cached
+            self.cache_misses += 1
+            return method(self, *args, **kwargs)
+        
+        if cached:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            self._results[key] = method(self, *args, **kwargs)
+        return copy.deepcopy(self._results[key])
+    
+    return report
+
 
 class SEOLogAnalyzer:
     """
     Analyze parsed log data for SEO insights
+    
+    Reports are answered from CrawlAggregates, totals of the bot rows per
+    (bot_type, path, status, date, hour) built once on first use, rather
+    than by grouping the bot rows again in every report.
+    
+    Report results are cached per method and arguments, so the dashboard
+    and the individual plots share them. The cache, bot rows and
+    aggregates are rebuilt when df changes (replaced, rows appended,
+    columns added); call invalidate() after editing values in place.
+    cache_hits and cache_misses count cached and computed reports.
+    
+    With bot_view=True the bot rows are not copied out of df: only their
+    positions are kept (8 bytes per bot row), and the aggregates read the
+    few columns they need through them.
+    
+    Logs too large for one frame can be fed chunk by chunk with update():
+    each chunk is reduced to its aggregates and dropped, and the reports
+    cover df and every chunk, exactly as for the concatenated rows.
+    
+    With approximate=True, no table of every distinct path is kept:
+    distinct path counts (unique_pages_crawled and the unique_paths of
+    daily_crawl_report) are HyperLogLog estimates, and the per-path
+    reports (crawl_frequency_by_path, identify_crawl_traps, Googlebot's
+    top_crawled_paths, get_error_pages) come from Space-Saving heavy
+    hitter summaries with a fixed number of counters. Both merge across
+    chunks like the other aggregates.
     """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: Optional[pd.DataFrame] = None, bot_view: bool = False,
+                 approximate: bool = False, precision: int = DEFAULT_PRECISION,
+                 counters: int = DEFAULT_COUNTERS):
         """
         Initialize analyzer with parsed log DataFrame
         
         Args:
-            df: DataFrame from ApacheLogParser
+            df: DataFrame from ApacheLogParser (default: no rows, for
+                analyzers fed with update())
+            bot_view: Keep the positions of the bot rows instead of a copy
+                of them (bot_df is then built on each access)
+            approximate: Estimate distinct path counts with HyperLogLog
+                sketches and per-path counts with heavy hitter summaries
+                instead of counting them exactly
+            precision: Sketch precision with approximate: 2 ** precision
+                registers per sketch, for a relative standard error of
+                about 1.04 / sqrt(2 ** precision) (0.8% at 14)
+            counters: Counters per heavy hitter summary with approximate;
+                paths crawled more than bot requests / counters times are
+                never missed
+        """
+        check_precision(precision)
+        if counters < 1:
+            raise ValueError(f"counters must be at least 1, got {counters}")
+        self.df = pd.DataFrame() if df is None else df
+        self.bot_view = bot_view
+        self.approximate = approximate
+        self.precision = precision
+        self.counters = counters
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._results = {}
+        self._chunks: List[CrawlAggregates] = []
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop cached reports and rebuild the bot rows from df (chunks added with update() are kept)"""
+        df = self.df
+        self._bot_df = None
+        self._bot_rows = None
+        if 'is_bot' not in df.columns:
+            self._bot_df = pd.DataFrame()
+            self._bot_count = 0
+        elif self.bot_view:
+            self._bot_rows = _bot_positions(df)
+            self._bot_count = len(self._bot_rows)
+        else:
+            self._bot_df = df[df['is_bot'] == True].copy()
+            self._bot_count = len(self._bot_df)
+        self._bot_count += sum(chunk.bot_requests for chunk in self._chunks)
+        
+        self._frame_aggregates = None
+        self._aggregates = None
+        self._results.clear()
+        self._version = _frame_version(df)
+    
+    def update(self, chunk_df: pd.DataFrame):
+        """
+        Add a chunk of parsed rows to the analysis
+        
+        Only the chunk's CrawlAggregates are kept, so memory grows with the
+        number of distinct (bot_type, path, status, date, hour) groups and
+        response sizes rather than with the number of rows. Reports then
+        cover df and every chunk added so far, with the same results as an
+        analyzer of concat_frames([df, *chunks]); df and bot_df themselves
+        are left unchanged.
+        
+        Args:
+            chunk_df: DataFrame from ApacheLogParser, e.g. one chunk of
+                iter_chunks(), later in the log than df and earlier chunks
+        """
+        self._sync()
+        chunk = CrawlAggregates(chunk_df, _bot_positions(chunk_df), **self._approximation)
+        self._chunks.append(chunk)
+        self._bot_count += chunk.bot_requests
+        
+        # Fold the chunks into one once they outgrow the earlier ones, so
+        # that every group is regrouped only a logarithmic number of times
+        if sum(len(part) for part in self._chunks[1:]) >= len(self._chunks[0]):
+            self._chunks = [CrawlAggregates.merge(self._chunks)]
+        
+        self._aggregates = None
+        self._results.clear()
+    
+    @property
+    def bot_df(self) -> pd.DataFrame:
+        """Bot rows of df (a new frame on each access with bot_view)"""
+        self._sync()
+        if self._bot_rows is None:
+            return self._bot_df
+        return self.df.iloc[self._bot_rows]
+    
+    def _sync(self):
+        """Invalidate when df has changed since the cache was filled"""
+        if _frame_version(self.df) != self._version:
+            self.invalidate()
+    
+    def cache_info(self) -> Dict:
         """
-        self.df = df
-        self.bot_df = df[df['is_bot'] == True].copy() if 'is_bot' in df.columns else pd.DataFrame()
+        Statistics of the report cache
+        
+        Returns:
+            Dict with hits, misses and the number of cached results
+        """
+        return {'hits': self.cache_hits, 'misses': self.cache_misses, 'size': len(self._results)}
+    
+    @property
+    def _approximation(self) -> Dict:
+        """Sketch arguments of CrawlAggregates"""
+        if not self.approximate:
+            return {}
+        return {'precision': self.precision, 'counters': self.counters}
     
+    @property
+    def aggregates(self) -> CrawlAggregates:
+        """Base aggregates of df and the chunks, computed on first access"""
+        self._sync()
+        if self._aggregates is None:
+            if self._frame_aggregates is None:
+                rows = self._bot_rows if self._bot_rows is not None else _bot_positions(self.df)
+                self._frame_aggregates = CrawlAggregates(self.df, rows, **self._approximation)
+            parts = [self._frame_aggregates, *self._chunks]
+            self._aggregates = parts[0] if len(parts) == 1 else CrawlAggregates.merge(parts)
+        return self._aggregates
+    
+    @_memoized
     def crawl_budget_summary(self) -> Dict:
         """
         High-level crawl budget metrics
@@ -30,21 +235,23 @@ class SEOLogAnalyzer:
         Returns:
             Dict with key metrics
         """
-        total_requests = len(self.df)
-        bot_requests = len(self.bot_df)
+        aggregates = self.aggregates
+        total_requests = aggregates.total_requests
+        bot_requests = aggregates.bot_requests
         
         return {
             'total_requests': total_requests,
             'bot_requests': bot_requests,
             'bot_percentage': round(bot_requests / total_requests * 100, 2) if total_requests > 0 else 0,
-            'unique_bots': int(self.bot_df['bot_type'].nunique()) if not self.bot_df.empty else 0,
-            'unique_pages_crawled': int(self.bot_df['path'].nunique()) if not self.bot_df.empty else 0,
+            'unique_bots': aggregates.nunique('bot_type') if bot_requests else 0,
+            'unique_pages_crawled': aggregates.distinct_paths() if bot_requests else 0,
             'date_range': {
-                'start': str(self.df['timestamp'].min()) if not self.df.empty else None,
-                'end': str(self.df['timestamp'].max()) if not self.df.empty else None
+                'start': str(aggregates.start) if aggregates.start is not None else None,
+                'end': str(aggregates.end) if aggregates.end is not None else None
             }
         }
     
+    @_memoized
     def bot_distribution(self) -> pd.DataFrame:
         """
         Breakdown of requests by bot type
@@ -52,18 +259,17 @@ class SEOLogAnalyzer:
         Returns:
             DataFrame with bot stats
         """
-        if self.bot_df.empty:
+        if not self._bot_count:
             return pd.DataFrame()
         
-        bot_stats = self.bot_df.groupby('bot_type').agg({
-            'path': 'count',
-            'status': lambda x: (x == 200).sum(),
-            'bytes': 'sum'
-        }).rename(columns={
-            'path': 'total_requests',
-            'status': 'successful_requests',
-            'bytes': 'total_bytes'
-        })
+        bot_stats = self.aggregates.grouped('bot_type').agg(
+            total_requests=('requests', 'sum'),
+            successful_requests=('is_200', 'sum'),
+            total_bytes=('bytes', 'sum')
+        )
+        bot_stats = self.aggregates.source_dtypes(
+            bot_stats, {'successful_requests': 'status', 'total_bytes': 'bytes'}
+        )
         
         bot_stats['success_rate'] = round(
             bot_stats['successful_requests'] / bot_stats['total_requests'] * 100, 2
@@ -71,6 +277,7 @@ class SEOLogAnalyzer:
         
         return bot_stats.sort_values('total_requests', ascending=False)
     
+    @_memoized
     def googlebot_analysis(self) -> Dict:
         """
         Deep dive into Googlebot behavior
@@ -78,25 +285,34 @@ class SEOLogAnalyzer:
         Returns:
             Dict with Googlebot-specific metrics
         """
-        if self.bot_df.empty:
+        if not self._bot_count:
             return {'error': 'No bot activity found'}
         
-        googlebot_df = self.bot_df[
-            self.bot_df['bot_type'].str.contains('googlebot', na=False, case=False)
-        ]
+        aggregates = self.aggregates
+        googlebot = aggregates.grain[aggregates.contains('bot_type', 'googlebot', case=False)]
         
-        if googlebot_df.empty:
+        if googlebot.empty:
             return {'error': 'No Googlebot activity found'}
         
+        # Categorical columns report every category, including unseen ones
+        bot_counts = aggregates.value_counts('bot_type', googlebot)
+        if aggregates.heavy_hitters is None:
+            path_counts = aggregates.value_counts('path', googlebot)
+            top_paths = path_counts[path_counts > 0].head(20)
+        else:
+            top_paths = aggregates.heavy_hitters['googlebot_paths'].counters['count'].head(20)
+        total_crawls = googlebot['requests'].sum()
+        
         return {
-            'total_crawls': int(len(googlebot_df)),
-            'mobile_vs_desktop': googlebot_df['bot_type'].value_counts().to_dict(),
-            'crawl_by_hour': googlebot_df.groupby('hour')['path'].count().to_dict(),
-            'top_crawled_paths': googlebot_df['path'].value_counts().head(20).to_dict(),
-            'status_codes': googlebot_df['status'].value_counts().to_dict(),
-            'avg_response_size': round(googlebot_df['bytes'].mean(), 2) if len(googlebot_df) > 0 else 0
+            'total_crawls': int(total_crawls),
+            'mobile_vs_desktop': bot_counts[bot_counts > 0].to_dict(),
+            'crawl_by_hour': googlebot.groupby('hour')['requests'].sum().to_dict(),
+            'top_crawled_paths': top_paths.to_dict(),
+            'status_codes': aggregates.value_counts('status', googlebot).to_dict(),
+            'avg_response_size': round(googlebot['bytes'].sum() / total_crawls, 2)
         }
     
+    @_memoized
     def status_code_analysis(self) -> pd.DataFrame:
         """
         Analyze HTTP status codes for bot traffic
@@ -104,10 +320,12 @@ class SEOLogAnalyzer:
         Returns:
             DataFrame with status code breakdown
         """
-        if self.bot_df.empty:
+        if not self._bot_count:
             return pd.DataFrame()
         
-        status_analysis = self.bot_df.groupby(['bot_type', 'status']).size().unstack(fill_value=0)
+        status_analysis = self.aggregates.grain.groupby(
+            ['bot_type', 'status'], observed=True
+        )['requests'].sum().unstack(fill_value=0)
         
         # Add categories
         status_cols = status_analysis.columns
@@ -118,51 +336,84 @@ class SEOLogAnalyzer:
         
         return status_analysis
     
+    @_memoized
     def crawl_frequency_by_path(self, min_crawls: int = 5) -> pd.DataFrame:
         """
         Identify most frequently crawled paths
         
+        With approximate, only the paths holding a heavy hitter counter are
+        listed, with estimated (upper bound) crawl counts.
+        
         Args:
             min_crawls: Minimum number of crawls to include
             
         Returns:
             DataFrame with path crawl frequency
         """
-        if self.bot_df.empty:
+        if not self._bot_count:
             return pd.DataFrame()
         
-        path_freq = self.bot_df.groupby('path').agg({
-            'timestamp': 'count',
-            'bot_type': lambda x: x.value_counts().index[0] if len(x) > 0 else None,
-            'status': lambda x: (x == 200).sum() / len(x) * 100 if len(x) > 0 else 0
-        }).rename(columns={
-            'timestamp': 'crawl_count',
-            'bot_type': 'primary_bot',
-            'status': 'success_rate'
+        if self.aggregates.heavy_hitters is not None:
+            return self._approximate_crawl_frequency(min_crawls)
+        
+        totals = self.aggregates.grouped('path').agg(
+            crawl_count=('requests', 'sum'),
+            successful=('is_200', 'sum')
+        )
+        
+        path_freq = pd.DataFrame({
+            'crawl_count': totals['crawl_count'],
+            'primary_bot': self.aggregates.top_value('path', 'bot_type'),
+            'success_rate': totals['successful'] / totals['crawl_count'] * 100
         })
         
         path_freq = path_freq[path_freq['crawl_count'] >= min_crawls]
         
         return path_freq.sort_values('crawl_count', ascending=False)
     
+    def _approximate_crawl_frequency(self, min_crawls: int) -> pd.DataFrame:
+        """crawl_frequency_by_path from the heavy hitter summaries"""
+        paths = self.aggregates.heavy_hitters['paths'].counters
+        
+        # Primary bot: the bot type with the most requests counted by the
+        # path's counter
+        path_freq = pd.DataFrame({
+            'crawl_count': paths['count'],
+            'primary_bot': bot_measures(paths).idxmax(axis=1),
+            'success_rate': paths['successful'] / paths['count'] * 100
+        })
+        
+        path_freq = path_freq[path_freq['crawl_count'] >= min_crawls]
+        
+        return path_freq.sort_values('crawl_count', ascending=False)
+        
+    @_memoized
     def identify_crawl_traps(self, threshold: int = 100) -> List[str]:
         """
         Find URLs that might be crawl traps (crawled excessively)
         
+        With approximate, counts are upper bounds from the heavy hitter
+        summary; no trap is missed as long as threshold is at least its
+        floor (aggregates.heavy_hitters['paths'].floor).
+        
         Args:
             threshold: Number of crawls to consider excessive
             
         Returns:
             List of potential crawl trap URLs
         """
-        if self.bot_df.empty:
+        if not self._bot_count:
             return []
         
-        crawl_counts = self.bot_df['path'].value_counts()
+        if self.aggregates.heavy_hitters is not None:
+            return self.aggregates.heavy_hitters['paths'].above(threshold).index.tolist()
+        
+        crawl_counts = self.aggregates.value_counts('path')
         traps = crawl_counts[crawl_counts > threshold].index.tolist()
         
         return traps
     
+    @_memoized
     def time_series_analysis(self, bot_type: Optional[str] = None) -> pd.DataFrame:
         """
         Crawl activity over time
@@ -173,24 +424,24 @@ class SEOLogAnalyzer:
         Returns:
             DataFrame with daily crawl counts
         """
-        if self.bot_df.empty:
+        if not self._bot_count:
             return pd.DataFrame()
         
-        df = self.bot_df if bot_type is None else self.bot_df[self.bot_df['bot_type'] == bot_type]
+        grain = self.aggregates.grain
+        rows = grain if bot_type is None else grain[grain['bot_type'] == bot_type]
         
-        if df.empty:
+        if rows.empty:
             return pd.DataFrame()
         
-        time_series = df.groupby('date').agg({
-            'path': 'count',
-            'status': lambda x: (x == 200).sum()
-        }).rename(columns={
-            'path': 'total_crawls',
-            'status': 'successful_crawls'
-        })
+        groups = self.aggregates.grouped('date') if bot_type is None else rows.groupby('date')
+        time_series = groups.agg(
+            total_crawls=('requests', 'sum'),
+            successful_crawls=('is_200', 'sum')
+        )
         
-        return time_series
+        return self.aggregates.source_dtypes(time_series, {'successful_crawls': 'status'})
     
+    @_memoized
     def response_time_analysis(self) -> Dict:
         """
         Analyze response times (bytes as proxy for response time)
@@ -199,66 +450,120 @@ class SEOLogAnalyzer:
         Returns:
             Dict with response size statistics
         """
-        if self.bot_df.empty:
+        if not self._bot_count:
             return {'error': 'No bot data available'}
         
+        sizes = self.aggregates.response_sizes()
+        
         return {
-            'avg_bytes': round(self.bot_df['bytes'].mean(), 2),
-            'median_bytes': round(self.bot_df['bytes'].median(), 2),
-            'max_bytes': int(self.bot_df['bytes'].max()),
-            'min_bytes': int(self.bot_df['bytes'].min()),
-            'total_bandwidth': int(self.bot_df['bytes'].sum())
+            'avg_bytes': round(sizes['mean'], 2),
+            'median_bytes': round(sizes['median'], 2),
+            'max_bytes': int(sizes['max']),
+            'min_bytes': int(sizes['min']),
+            'total_bandwidth': int(sizes['total'])
         }
     
+    @_memoized
     def get_error_pages(self, status_code: int = 404) -> pd.DataFrame:
         """
         Get all pages returning specific error code
         
+        With approximate, pages come from the heavy hitter summary of error
+        responses (status codes from ERROR_STATUS up), with estimated counts
+        and the affected bots by descending count.
+        
         Args:
             status_code: HTTP status code to filter (default 404)
             
         Returns:
             DataFrame with error pages and their crawl frequency
         """
-        if self.bot_df.empty:
+        if self.approximate and status_code < ERROR_STATUS:
+            raise ValueError(f"approximate analyzers only track error pages with status codes from {ERROR_STATUS}")
+        
+        if not self._bot_count:
             return pd.DataFrame()
         
-        error_df = self.bot_df[self.bot_df['status'] == status_code]
+        if self.aggregates.heavy_hitters is not None:
+            return self._approximate_error_pages(status_code)
+        
+        grain = self.aggregates.grain
+        errors = grain[grain['status'] == status_code]
+        
+        if errors.empty:
+            return pd.DataFrame()
+        
+        error_summary = pd.DataFrame({
+            'error_count': errors.groupby('path', observed=True)['requests'].sum(),
+            'bots_affected': self.aggregates.joined_unique('path', 'bot_type', errors)
+        }).sort_values('error_count', ascending=False)
+        
+        return error_summary
+    
+    def _approximate_error_pages(self, status_code: int) -> pd.DataFrame:
+        """get_error_pages from the heavy hitter summary of error responses"""
+        counters = self.aggregates.heavy_hitters['error_paths'].counters
+        errors = counters[counters.index.get_level_values('status') == status_code].droplevel('status')
         
-        if error_df.empty:
+        if errors.empty:
             return pd.DataFrame()
         
-        error_summary = error_df.groupby('path').agg({
-            'timestamp': 'count',
-            'bot_type': lambda x: ', '.join(x.unique())
-        }).rename(columns={
-            'timestamp': 'error_count',
-            'bot_type': 'bots_affected'
+        # Bots with requests counted by each path's counter, most first
+        bots = bot_measures(errors).rename_axis(columns='bot_type').stack()
+        bots = bots[bots > 0].sort_values(ascending=False, kind='stable').reset_index('bot_type')
+        
+        error_summary = pd.DataFrame({
+            'error_count': errors['count'],
+            'bots_affected': bots.groupby(level=0, sort=False)['bot_type'].agg(', '.join)
         }).sort_values('error_count', ascending=False)
         
         return error_summary
     
-    def daily_crawl_report(self) -> pd.DataFrame:
+    @_memoized
+    def daily_crawl_report(self, by: Optional[str] = None, unique_paths: bool = False) -> pd.DataFrame:
         """
         Generate daily summary report
         
+        Args:
+            by: Also break each day down by 'bot_type' or 'status_class'
+                ('2xx', '3xx', ...)
+            unique_paths: Add the number of distinct paths crawled, a
+                HyperLogLog estimate with approximate (which always adds it)
+                
         Returns:
-            DataFrame with daily metrics
+            DataFrame with daily metrics, indexed by date (and by)
         """
-        if self.bot_df.empty:
+        if by not in (None, 'bot_type', 'status_class'):
+            raise ValueError(f"by must be None, 'bot_type' or 'status_class', got {by!r}")
+        
+        if not self._bot_count:
             return pd.DataFrame()
         
-        daily_report = self.bot_df.groupby('date').agg({
-            'path': 'count',
-            'status': [
-                ('successful', lambda x: (x == 200).sum()),
-                ('errors_4xx', lambda x: ((x >= 400) & (x < 500)).sum()),
-                ('errors_5xx', lambda x: ((x >= 500) & (x < 600)).sum())
-            ],
-            'bot_type': lambda x: x.nunique(),
-            'bytes': 'sum'
+        aggregates = self.aggregates
+        if by is None:
+            keys = ['date']
+            groups = aggregates.grouped('date')
+        else:
+            keys = ['date', by]
+            grain = aggregates.grain
+            if by == 'status_class':
+                grain = grain.assign(status_class=status_classes(grain['status']))
+            groups = grain.groupby(keys, observed=True)
+        
+        daily_report = groups.agg(
+            total_crawls=('requests', 'sum'),
+            successful=('is_200', 'sum'),
+            errors_4xx=('is_4xx', 'sum'),
+            errors_5xx=('is_5xx', 'sum'),
+            unique_bots=('bot_type', 'nunique'),
+            total_bytes=('bytes', 'sum')
+        )
+        if unique_paths or self.approximate:
+            daily_report['unique_paths'] = aggregates.distinct_paths(keys)
+        
+        return aggregates.source_dtypes(daily_report, {
+            'successful': 'status',
+            'errors_4xx': 'status',
+            'errors_5xx': 'status',
+            'total_bytes': 'bytes'
         })
-        
-        daily_report.columns = ['total_crawls', 'successful', 'errors_4xx', 'errors_5xx', 'unique_bots', 'total_bytes']
-        
-        return daily_report
@@ -0,0 +1,195 @@
+"""
+Parsed Log Cache
+Parquet copies of parsed DataFrames keyed by file fingerprint
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+from .lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+
+# Bytes hashed per sample, and samples taken across each file
+SAMPLE_SIZE = 1 << 16
+SAMPLE_COUNT = 8
+
+
+def file_fingerprint(filepath: str, sample_size: int = SAMPLE_SIZE,
+                     sample_count: int = SAMPLE_COUNT) -> Dict:
+    """
+    Cheap identity of a file's contents
+    
+    Combines the absolute path, size and mtime with a hash of sample_count
+    evenly spaced blocks (always including the first and last), so a
+    rewritten file is detected without reading all of it.
+    
+    Args:
+        filepath: Path to file
+        sample_size: Bytes read per sampled block
+        sample_count: Number of sampled blocks
+    
+    Returns:
+        Dict with path, size, mtime_ns and sample_hash
+    """
+    stat = os.stat(filepath)
+    digest = hashlib.blake2b(digest_size=16)
+    
+    with open(filepath, 'rb') as f:
+        last = max(stat.st_size - sample_size, 0)
+        offsets = sorted({last * i // max(sample_count - 1, 1) for i in range(sample_count)})
+        for offset in offsets:
+            f.seek(offset)
+            digest.update(f.read(sample_size))
+    
+    return {
+        'path': os.path.abspath(filepath),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sample_hash': digest.hexdigest(),
+    }
+
+
+class ParsedLogCache:
+    """
+    Directory of parsed DataFrames stored as Parquet
+    
+    Entries are keyed by the fingerprints of the input files together with
+    the parser settings that shape the output (log pattern, BOT_PATTERNS,
+    strict mode and parse options), so an edited log or a changed bot
+    pattern is simply a miss. Each file name starts with a digest of the
+    parser configuration, which lets prune() drop entries built by an older
+    configuration. Total size is capped with least-recently-used eviction,
+    using file mtimes as the access clock.
+    """
+    
+    SUFFIX = '.parquet'
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 2 << 30):
+        """
+        Args:
+            cache_dir: Directory holding the Parquet files (created if missing)
+            max_bytes: Total size above which the least recently used
+                entries are evicted
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("ParsedLogCache requires the 'pyarrow' package for Parquet files")
+        
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def config_digest(settings: Dict) -> str:
+        """Short digest of the parser configuration an entry was built with"""
+        encoded = json.dumps(settings, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=6).hexdigest()
+    
+    def key(self, filepaths: Sequence[str], settings: Dict, options: Dict) -> str:
+        """
+        Cache key for parsing filepaths with the given settings
+        
+        Args:
+            filepaths: Input files, in parse order
+            settings: Parser configuration (see config_digest)
+            options: Per-call parse options that change the result
+        
+        Returns:
+            File name stem of the entry
+        """
+        payload = {
+            'files': [file_fingerprint(path) for path in filepaths],
+            'options': options,
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode('utf-8')
+        content = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+        return f"{self.config_digest(settings)}-{content}"
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+    
+    def _entries(self) -> List[os.DirEntry]:
+        with os.scandir(self.cache_dir) as entries:
+            return [entry for entry in entries if entry.name.endswith(self.SUFFIX)]
+    
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Read a cached DataFrame
+        
+        Args:
+            key: Entry key from key()
+        
+        Returns:
+            DataFrame, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        
+        # Mark as recently used for eviction
+        os.utime(path)
+        self.hits += 1
+        return df
+    
+    def store(self, key: str, df: pd.DataFrame):
+        """
+        Write a DataFrame, then evict old entries beyond max_bytes
+        
+        Args:
+            key: Entry key from key()
+            df: Parsed DataFrame
+        """
+        path = self._path(key)
+        partial = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(partial, index=False)
+        os.replace(partial, path)
+        self.evict()
+    
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime_ns)
+        total = sum(entry.stat().st_size for entry in entries)
+        
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+    
+    def prune(self, settings: Dict) -> int:
+        """
+        Delete entries built with a different parser configuration
+        
+        Call after changing BOT_PATTERNS (or the log pattern) to reclaim
+        the space of entries that can no longer be hit.
+        
+        Args:
+            settings: Current parser configuration
+        
+        Returns:
+            Number of entries removed
+        """
+        prefix = self.config_digest(settings) + '-'
+        removed = 0
+        for entry in self._entries():
+            if not entry.name.startswith(prefix):
+                os.remove(entry.path)
+                removed += 1
+        return removed
+    
+    def clear(self):
+        """Delete every entry"""
+        for entry in self._entries():
+            os.remove(entry.path)
@@ -0,0 +1,158 @@
+"""
+Columnar Record Builder
+Accumulates parsed log fields in typed per-column buffers
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+class ColumnBuilder:
+    """
+    Append-only columnar buffer for parsed log lines
+    
+    Replaces a list of per-line dicts: numeric fields (status, bytes, ...)
+    are converted on append into compact array buffers, timestamps are
+    dictionary-encoded (each distinct string stored once, rows keep an
+    int32 code), and text fields are interned per builder so repeated
+    paths, IPs and user agents share one string object instead of keeping
+    a fresh copy per line. to_frame() wraps the numeric buffers without
+    copying them.
+    """
+    
+    def __init__(self, fields: Sequence[str],
+                 identify_bot: Optional[Callable[[str], Optional[str]]] = None,
+                 converters: Optional[Dict[str, Tuple[str, Callable[[str], object]]]] = None,
+                 bots_only: bool = False):
+        """
+        Args:
+            fields: Names of the regex groups, in match.groups() order
+            identify_bot: Bot classifier for user agents (None to skip
+                bot_type/is_bot)
+            converters: Field name -> (array typecode, converter) for
+                numeric fields; every other field except timestamp is text
+            bots_only: Discard lines identify_bot does not classify as a
+                bot, keeping only their count in `dropped`
+        """
+        converters = converters or {}
+        self.fields = list(fields)
+        self.identify_bot = identify_bot
+        self.bots_only = bots_only and identify_bot is not None
+        self.dropped = 0
+        
+        self._columns: Dict[str, object] = {}
+        self._timestamps: Dict[str, int] = {}
+        self._strings: Dict[str, str] = {}
+        self._appenders = []
+        
+        for field in self.fields:
+            if field in converters:
+                typecode, convert = converters[field]
+                column = self._columns[field] = array(typecode)
+                self._appenders.append(self._numeric_appender(column, convert))
+            elif field == 'timestamp':
+                column = self._columns[field] = array('i')
+                self._appenders.append(self._timestamp_appender(column))
+            else:
+                column = self._columns[field] = []
+                self._appenders.append(self._string_appender(column))
+        
+        if identify_bot is not None:
+            self._bot_type: List[Optional[str]] = []
+            self._is_bot = array('b')
+            self._user_agent_index = self.fields.index('user_agent')
+    
+    @staticmethod
+    def _numeric_appender(column: array, convert: Callable[[str], object]):
+        append = column.append
+        return lambda value: append(convert(value))
+    
+    def _timestamp_appender(self, column: array):
+        append = column.append
+        codes = self._timestamps
+        
+        def add(value: str):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+            append(code)
+        return add
+    
+    def _string_appender(self, column: List[str]):
+        append = column.append
+        interned = self._strings.setdefault
+        return lambda value: append(interned(value, value))
+    
+    def append(self, values: Sequence[str]):
+        """
+        Append one parsed line
+        
+        Args:
+            values: Captured groups of a log pattern match, in field order
+        """
+        if self.identify_bot is None:
+            for add, value in zip(self._appenders, values):
+                add(value)
+            return
+        
+        bot_type = self.identify_bot(values[self._user_agent_index])
+        if bot_type is None and self.bots_only:
+            self.dropped += 1
+            return
+        
+        for add, value in zip(self._appenders, values):
+            add(value)
+        self._bot_type.append(bot_type)
+        self._is_bot.append(bot_type is not None)
+    
+    def __len__(self) -> int:
+        return len(self._columns[self.fields[0]]) if self.fields else 0
+    
+    def timestamp_values(self, convert: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Convert the timestamp column, each distinct raw string once
+        
+        Args:
+            convert: Maps the distinct raw timestamp strings to int64 values
+        
+        Returns:
+            int64 array with one value per row
+        """
+        values = convert(list(self._timestamps))
+        codes = np.frombuffer(self._columns['timestamp'], dtype=np.int32)
+        return values.take(codes) if len(values) else np.empty(0, dtype=np.int64)
+    
+    def to_frame(self, convert_timestamps: Callable[[List[str]], np.ndarray]) -> pd.DataFrame:
+        """
+        Materialize the buffers as a DataFrame
+        
+        Args:
+            convert_timestamps: Maps the distinct raw timestamp strings to
+                int64 epoch nanoseconds (NaT for unparseable strings)
+        
+        Returns:
+            DataFrame with one column per field, plus bot_type/is_bot
+        """
+        data = {}
+        for field in self.fields:
+            column = self._columns[field]
+            if field == 'timestamp':
+                values = self.timestamp_values(convert_timestamps)
+                data[field] = pd.DatetimeIndex(values.view('datetime64[ns]')).tz_localize('UTC')
+            elif isinstance(column, array):
+                data[field] = np.frombuffer(column, dtype=np.dtype(column.typecode))
+            else:
+                data[field] = column
+        
+        if self.identify_bot is not None:
+            data['bot_type'] = self._bot_type
+            data['is_bot'] = np.frombuffer(self._is_bot, dtype=np.bool_)
+        
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,212 @@
+"""
+Compressed Log Input
+Detects gzip/bzip2/xz/zstd logs by magic bytes and streams them as text
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator, List, Optional, Sequence
+
+
+# Leading bytes of each supported container format
+MAGIC_BYTES = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+
+# Decompressed bytes per queued block, and blocks buffered per file
+BLOCK_SIZE = 1 << 20
+PREFETCH_BLOCKS = 8
+
+
+def detect_compression(filepath: str) -> Optional[str]:
+    """
+    Identify the compression format of a file from its magic bytes
+    
+    Args:
+        filepath: Path to file
+    
+    Returns:
+        'gzip', 'bz2', 'xz', 'zstd' or None for plain files
+    """
+    with open(filepath, 'rb') as f:
+        head = f.read(8)
+    
+    for name, magic in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _open_decompressed(filepath: str, compression: str) -> IO[bytes]:
+    """
+    Open a binary stream of the decompressed file contents
+    
+    Args:
+        filepath: Path to compressed file
+        compression: Format name from detect_compression
+    
+    Returns:
+        Readable binary file object
+    """
+    if compression == 'gzip':
+        return gzip.open(filepath, 'rb')
+    if compression == 'bz2':
+        return bz2.open(filepath, 'rb')
+    if compression == 'xz':
+        return lzma.open(filepath, 'rb')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                f"Reading zstd compressed logs ({filepath}) requires the 'zstandard' package"
+            )
+        raw = open(filepath, 'rb')
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    raise ValueError(f"Unsupported compression '{compression}'")
+
+
+class _QueueReader(io.RawIOBase):
+    """
+    Raw byte stream fed by a background decompression thread
+    
+    The producer decompresses BLOCK_SIZE blocks into a bounded queue, so
+    decompression (which releases the GIL) overlaps with line parsing in
+    the consumer while memory stays capped at PREFETCH_BLOCKS blocks.
+    """
+    
+    def __init__(self, filepath: str, compression: str, prefetch: int = PREFETCH_BLOCKS):
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._pending = memoryview(b'')
+        self._done = False
+        self._thread = threading.Thread(
+            target=self._produce, args=(filepath, compression), daemon=True
+        )
+        self._thread.start()
+    
+    def _put(self, item) -> bool:
+        # Poll so a consumer that stops early never leaves us blocked forever
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _produce(self, filepath: str, compression: str):
+        try:
+            with _open_decompressed(filepath, compression) as f:
+                while not self._stop.is_set():
+                    block = f.read(BLOCK_SIZE)
+                    if not block:
+                        break
+                    if not self._put(block):
+                        return
+            self._put(None)
+        except BaseException as e:
+            self._put(e)
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            if self._done:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._done = True
+                return 0
+            if isinstance(item, BaseException):
+                self._done = True
+                raise item
+            self._pending = memoryview(item)
+        
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+    
+    def close(self):
+        self._stop.set()
+        super().close()
+
+
+@contextmanager
+def open_log(filepath: str, prefetch: int = PREFETCH_BLOCKS) -> Iterator[IO[str]]:
+    """
+    Open a log file as text, decompressing transparently
+    
+    Plain files are opened directly. Compressed files are decompressed by a
+    background thread into a bounded queue while the caller reads lines.
+    Decoding matches open(..., encoding='utf-8', errors='ignore').
+    
+    Args:
+        filepath: Path to plain or compressed log file
+        prefetch: Decompressed blocks buffered ahead of the reader
+    
+    Yields:
+        Text stream of log lines
+    """
+    compression = detect_compression(filepath)
+    
+    if compression is None:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            yield f
+        return
+    
+    raw = _QueueReader(filepath, compression, prefetch)
+    with io.TextIOWrapper(io.BufferedReader(raw), encoding='utf-8', errors='ignore') as f:
+        yield f
+
+
+def iter_log_lines(filepaths: Sequence[str], parallel: int = 2,
+                   prefetch: int = PREFETCH_BLOCKS) -> Iterator[str]:
+    """
+    Yield lines of several log files back to back
+    
+    Up to `parallel` files are opened ahead of the one being read, so
+    their decompression threads run concurrently, each bounded by its own
+    prefetch queue.
+    
+    Args:
+        filepaths: Log files in the order their lines should be yielded
+        parallel: Number of files decompressing at the same time
+        prefetch: Decompressed blocks buffered per file
+    
+    Yields:
+        Raw lines, including their line terminators
+    """
+    filepaths = list(filepaths)
+    opened: List = []
+    
+    def open_next():
+        index = len(opened)
+        if index < len(filepaths):
+            context = open_log(filepaths[index], prefetch)
+            opened.append((context, context.__enter__()))
+    
+    try:
+        for _ in range(max(parallel, 1)):
+            open_next()
+        
+        for index in range(len(filepaths)):
+            context, f = opened[index]
+            yield from f
+            context.__exit__(None, None, None)
+            opened[index] = (None, None)
+            open_next()
+    finally:
+        for context, _ in opened:
+            if context is not None:
+                context.__exit__(None, None, None)
@@ -0,0 +1,286 @@
+"""
+Timestamp Index
+Sparse (byte offset, timestamp) sidecar for seeking into large logs by time
+"""
+
+import bisect
+import hashlib
+import json
+import os
+from itertools import accumulate
+from typing import Callable, List, Optional, Tuple
+
+
+# Parses the timestamp of one log line to epoch seconds (None if unparseable)
+LineTime = Callable[[str], Optional[float]]
+
+# Lines between index entries
+INDEX_EVERY = 10000
+
+# Seconds a line may be logged out of order; seeks widen the range by this
+ORDER_TOLERANCE = 300.0
+
+# Leading bytes hashed to notice a log that was replaced or truncated
+HEAD_BYTES = 256
+
+
+def _head_hash(filepath: str, length: int) -> str:
+    with open(filepath, 'rb') as f:
+        return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+def _probe(f, offset: int, end: int, line_time: LineTime) -> Tuple[int, Optional[float]]:
+    """
+    Timestamp of the first parseable line starting at or after offset
+    
+    Args:
+        f: Log file opened in binary mode
+        offset: Byte offset to probe from (need not be line-aligned)
+        end: Offset to give up at
+        line_time: Line timestamp parser
+    
+    Returns:
+        (line start offset, epoch seconds), or (end, None) if no line before
+        end has a timestamp
+    """
+    f.seek(max(offset - 1, 0))
+    if offset > 0:
+        # Skip to the start of the next line (offset itself may be one)
+        f.readline()
+    position = f.tell()
+    
+    while position < end:
+        raw = f.readline()
+        if not raw:
+            break
+        seconds = line_time(raw.decode('utf-8', errors='ignore'))
+        if seconds is not None:
+            return position, seconds
+        position += len(raw)
+    
+    return end, None
+
+
+def bisect_offset(filepath: str, target: float, line_time: LineTime,
+                  lo: int = 0, hi: Optional[int] = None) -> int:
+    """
+    Offset of the first line logged at or after target, by binary search
+    
+    Probes O(log n) lines instead of reading the file, assuming lines are
+    (mostly) in time order.
+    
+    Args:
+        filepath: Path to plain log file
+        target: Epoch seconds
+        line_time: Line timestamp parser
+        lo: Lowest offset to consider (line-aligned)
+        hi: Highest offset to consider (defaults to the file size)
+    
+    Returns:
+        Line-aligned byte offset (hi if every line is earlier)
+    """
+    if hi is None:
+        hi = os.path.getsize(filepath)
+    end = hi
+    
+    with open(filepath, 'rb') as f:
+        # Smallest probe offset whose next parseable line is not earlier
+        while lo < hi:
+            mid = (lo + hi) // 2
+            _, seconds = _probe(f, mid, end, line_time)
+            if seconds is None or seconds >= target:
+                hi = mid
+            else:
+                lo = mid + 1
+        
+        position, _ = _probe(f, lo, end, line_time)
+    
+    return position
+
+
+def time_bounds(filepath: str, line_time: LineTime,
+                block_size: int = 1 << 16) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Timestamps of the first and last parseable lines of a plain log file
+    
+    Reads from both ends only, so it is cheap for files of any size.
+    
+    Args:
+        filepath: Path to plain log file
+        line_time: Line timestamp parser
+        block_size: Bytes read per step backwards from the end
+    
+    Returns:
+        (first, last) epoch seconds, None where no line has a timestamp
+    """
+    size = os.path.getsize(filepath)
+    
+    with open(filepath, 'rb') as f:
+        _, first = _probe(f, 0, size, line_time)
+        if first is None:
+            return None, None
+        
+        position = size
+        tail = b''
+        while position > 0:
+            read_from = max(position - block_size, 0)
+            f.seek(read_from)
+            tail = f.read(position - read_from) + tail
+            position = read_from
+            
+            # The first line of the block may be cut off unless it starts the file
+            lines = tail.split(b'\n')
+            complete = lines if position == 0 else lines[1:]
+            for raw in reversed(complete):
+                seconds = line_time(raw.decode('utf-8', errors='ignore'))
+                if seconds is not None:
+                    return first, seconds
+            tail = lines[0]
+    
+    return first, first
+
+
+class TimestampIndex:
+    """
+    Sparse index of a log file: the offset and timestamp of every Nth line
+    
+    Stored next to the log as <log>.tsidx (JSON). update() scans only the
+    bytes appended since the last update, so keeping the index current on
+    a growing log is cheap; a truncated or replaced log is re-indexed from
+    scratch. seek() turns a time range into a byte range with two bisects
+    over the entries.
+    """
+    
+    SUFFIX = '.tsidx'
+    
+    def __init__(self, filepath: str, line_time: LineTime, every: int = INDEX_EVERY):
+        """
+        Args:
+            filepath: Path to plain (uncompressed) log file
+            line_time: Line timestamp parser, e.g. ApacheLogParser._line_timestamp
+            every: Lines between index entries
+        """
+        self.filepath = filepath
+        self.sidecar_path = filepath + self.SUFFIX
+        self.line_time = line_time
+        self.every = every
+        
+        self.offsets: List[int] = []
+        self.times: List[float] = []
+        self.indexed_size = 0
+        self.pending_lines = 0
+        self.head = ''
+    
+    @classmethod
+    def load(cls, filepath: str, line_time: LineTime) -> Optional['TimestampIndex']:
+        """
+        Read the sidecar of a log file
+        
+        Returns:
+            TimestampIndex, or None if the log has no sidecar
+        """
+        index = cls(filepath, line_time)
+        if not os.path.exists(index.sidecar_path):
+            return None
+        
+        with open(index.sidecar_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        
+        index.every = state['every']
+        index.offsets = state['offsets']
+        index.times = state['times']
+        index.indexed_size = state['indexed_size']
+        index.pending_lines = state['pending_lines']
+        index.head = state['head']
+        return index
+    
+    def save(self):
+        """Write the sidecar atomically"""
+        state = {
+            'every': self.every,
+            'offsets': self.offsets,
+            'times': self.times,
+            'indexed_size': self.indexed_size,
+            'pending_lines': self.pending_lines,
+            'head': self.head,
+        }
+        partial = f"{self.sidecar_path}.{os.getpid()}.tmp"
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(partial, self.sidecar_path)
+    
+    def update(self) -> int:
+        """
+        Index lines appended since the last update
+        
+        Returns:
+            Number of entries added
+        """
+        size = os.path.getsize(self.filepath)
+        
+        if self.indexed_size and (
+            size < self.indexed_size
+            or _head_hash(self.filepath, min(self.indexed_size, HEAD_BYTES)) != self.head
+        ):
+            # Rotated, truncated or rewritten: start over
+            self.offsets, self.times = [], []
+            self.indexed_size = self.pending_lines = 0
+        
+        added = 0
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.indexed_size)
+            position = self.indexed_size
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    # Still being written; index it on the next update
+                    break
+                if self.pending_lines == 0:
+                    seconds = self.line_time(raw.decode('utf-8', errors='ignore'))
+                    if seconds is not None:
+                        self.offsets.append(position)
+                        self.times.append(seconds)
+                        added += 1
+                        self.pending_lines = self.every
+                if self.pending_lines:
+                    self.pending_lines -= 1
+                position += len(raw)
+        
+        self.indexed_size = position
+        self.head = _head_hash(self.filepath, min(position, HEAD_BYTES))
+        return added
+    
+    def seek(self, since: Optional[float] = None, until: Optional[float] = None,
+             tolerance: float = ORDER_TOLERANCE) -> Tuple[int, int]:
+        """
+        Byte range holding every line logged in [since, until)
+        
+        The range starts at the last entry more than `tolerance` seconds
+        before since and ends at the first entry more than `tolerance`
+        seconds after until; the unindexed tail is always included. Callers
+        filter the parsed rows on their exact timestamps.
+        
+        Args:
+            since: Epoch seconds (None for the start of the file)
+            until: Epoch seconds (None for the end of the file)
+            tolerance: Seconds a line may be logged out of order
+        
+        Returns:
+            (start, end) byte offsets, line-aligned
+        """
+        start, end = 0, os.path.getsize(self.filepath)
+        
+        # Running maximum / suffix minimum keep both searches sorted even
+        # when entries step backwards in time
+        if since is not None and self.times:
+            peaks = list(accumulate(self.times, max))
+            i = bisect.bisect_left(peaks, since - tolerance)
+            if i > 0:
+                start = self.offsets[i - 1]
+        
+        if until is not None and self.times:
+            floors = list(accumulate(reversed(self.times), min))[::-1]
+            j = bisect.bisect_right(floors, until + tolerance)
+            if j < len(self.offsets):
+                end = self.offsets[j]
+        
+        return start, max(start, end)
@@ -0,0 +1,39 @@
+"""
+Lazy Imports
+Defers pandas, numpy and plotting imports until they are first used
+"""
+
+import importlib
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access"""
+    
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        # Later lookups hit the copied attributes without this hook
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Module object for `name` that is imported when an attribute is read
+    
+    Used as `pd = lazy_import('pandas')` in modules whose import must stay
+    cheap: parsing single lines, classifying user agents or reading records
+    never touches pd, so pandas is only loaded by code that builds a
+    DataFrame. Annotations that mention such modules must not be evaluated
+    at import time (from __future__ import annotations).
+    
+    Args:
+        name: Absolute module name, e.g. 'matplotlib.pyplot'
+    
+    Returns:
+        The module itself if already imported, otherwise a lazy stand-in
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
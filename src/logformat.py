@@ -0,0 +1,225 @@
+"""
+Log Format Compiler
+Builds the line regex and typed field converters from an Apache LogFormat
+or nginx log_format string
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+APACHE_COMBINED = '%h %l %u %t "%r" %>s %b "%{Referer}i" "%{User-Agent}i"'
+NGINX_COMBINED = (
+    '$remote_addr - $remote_user [$time_local] "$request" '
+    '$status $body_bytes_sent "$http_referer" "$http_user_agent"'
+)
+
+
+def _bytes_or_zero(value: str) -> int:
+    """%b logs '-' for empty responses"""
+    return int(value) if value != '-' else 0
+
+
+def _microseconds(value: str) -> float:
+    return int(value) / 1e6
+
+
+def _seconds(value: str) -> float:
+    return float(value) if value != '-' else float('nan')
+
+
+# Field name -> (array typecode, converter) for numeric columns
+Converter = Tuple[str, Callable[[str], object]]
+
+STATUS = ('i', int)
+BYTES = ('q', _bytes_or_zero)
+COUNT = ('q', int)
+MICROSECONDS = ('d', _microseconds)
+SECONDS = ('d', _seconds)
+
+# Hand-written Apache Combined pattern (ApacheLogParser.LOG_PATTERN)
+COMBINED_PATTERN = re.compile(
+    r'(?P<ip>[\d.]+) '
+    r'- - '
+    r'\[(?P<timestamp>[^\]]+)\] '
+    r'"(?P<method>\w+) (?P<path>[^\s]+) HTTP/[\d.]+" '
+    r'(?P<status>\d+) '
+    r'(?P<bytes>\d+|-) '
+    r'"(?P<referer>[^"]*)" '
+    r'"(?P<user_agent>[^"]*)"'
+)
+
+# Converters of COMBINED_PATTERN
+COMBINED_CONVERTERS: Dict[str, Converter] = {'status': STATUS, 'bytes': BYTES}
+
+# Sub-patterns for values that are not simple tokens
+_TOKEN = r'\S+'
+_QUOTED = r'[^"]*'
+_IP = r'[0-9A-Fa-f:.]+'
+_REQUEST = r'(?P<method>\w+) (?P<path>\S+) (?P<protocol>HTTP/[\d.]+)'
+_BRACKETED_TIME = r'\[(?P<timestamp>[^\]]+)\]'
+
+# Apache directive -> (field, regex, converter); None field means _REQUEST-style
+# multi-field patterns that already carry their group names
+_APACHE_DIRECTIVES: Dict[str, Tuple[Optional[str], str, Optional[Converter]]] = {
+    'h': ('ip', _TOKEN, None),
+    'a': ('ip', _IP, None),
+    'l': ('ident', _TOKEN, None),
+    'u': ('user', _TOKEN, None),
+    't': (None, _BRACKETED_TIME, None),
+    'r': (None, _REQUEST, None),
+    's': ('status', r'\d{3}', STATUS),
+    'b': ('bytes', r'\d+|-', BYTES),
+    'B': ('bytes', r'\d+', BYTES),
+    'D': ('response_time', r'\d+', MICROSECONDS),
+    'T': ('response_time', r'\d+', SECONDS),
+    'v': ('host', _TOKEN, None),
+    'V': ('host', _TOKEN, None),
+    'p': ('port', r'\d+', COUNT),
+    'I': ('bytes_received', r'\d+', COUNT),
+    'O': ('bytes_sent', r'\d+', COUNT),
+    'm': ('method', r'\w+', None),
+    'U': ('path', _TOKEN, None),
+    'H': ('protocol', _TOKEN, None),
+}
+
+# Request headers with dedicated column names (others become header_<name>)
+_HEADER_FIELDS = {'referer': 'referer', 'user-agent': 'user_agent'}
+
+# nginx variable -> (field, regex, converter); unknown variables are kept as text
+_NGINX_VARIABLES: Dict[str, Tuple[Optional[str], str, Optional[Converter]]] = {
+    'remote_addr': ('ip', _IP, None),
+    'remote_user': ('user', _TOKEN, None),
+    'time_local': ('timestamp', r'[^\]]+', None),
+    'time_iso8601': ('timestamp', _TOKEN, None),
+    'request': (None, _REQUEST, None),
+    'request_method': ('method', r'\w+', None),
+    'request_uri': ('path', _TOKEN, None),
+    'server_protocol': ('protocol', _TOKEN, None),
+    'status': ('status', r'\d{3}', STATUS),
+    'body_bytes_sent': ('bytes', r'\d+|-', BYTES),
+    'bytes_sent': ('bytes_sent', r'\d+', COUNT),
+    'request_length': ('bytes_received', r'\d+', COUNT),
+    'request_time': ('response_time', r'[\d.]+', SECONDS),
+    'upstream_response_time': ('upstream_response_time', r'[\d.:-]+(?:, [\d.:-]+)*', None),
+    'http_referer': ('referer', _QUOTED, None),
+    'http_user_agent': ('user_agent', _QUOTED, None),
+    'host': ('host', _TOKEN, None),
+    'server_name': ('host', _TOKEN, None),
+    'server_port': ('port', r'\d+', COUNT),
+}
+
+_APACHE_TOKEN = re.compile(r'%(?:%|[<>]?(?:\{(?P<arg>[^}]*)\})?(?P<directive>[a-zA-Z]))')
+_NGINX_TOKEN = re.compile(r'\$(?:\{(?P<braced>\w+)\}|(?P<name>\w+))')
+
+
+class CompiledLogFormat(NamedTuple):
+    """Regex and converters compiled from one log format string"""
+    log_format: str
+    pattern: re.Pattern
+    converters: Dict[str, Converter]
+    
+    @property
+    def fields(self) -> List[str]:
+        """Captured field names in match.groups() order"""
+        return list(self.pattern.groupindex)
+
+
+def _apache_field(match: re.Match) -> Tuple[Optional[str], str, Optional[Converter]]:
+    directive, arg = match.group('directive'), match.group('arg')
+    
+    if arg is not None:
+        if directive == 'i':
+            header = arg.lower()
+            name = _HEADER_FIELDS.get(header, 'header_' + re.sub(r'\W', '_', header))
+            return name, _TOKEN, None
+        if directive == 'a':
+            return 'ip', _IP, None
+        if directive == 'D' or (directive == 'T' and arg == 'us'):
+            return 'response_time', r'\d+', MICROSECONDS
+        if directive == 'T' and arg == 's':
+            return 'response_time', r'\d+', SECONDS
+        raise ValueError(f"Unsupported LogFormat directive '{match.group(0)}'")
+    
+    if directive not in _APACHE_DIRECTIVES:
+        raise ValueError(f"Unsupported LogFormat directive '{match.group(0)}'")
+    return _APACHE_DIRECTIVES[directive]
+
+
+def _nginx_field(match: re.Match) -> Tuple[Optional[str], str, Optional[Converter]]:
+    variable = match.group('braced') or match.group('name')
+    if variable in _NGINX_VARIABLES:
+        return _NGINX_VARIABLES[variable]
+    if variable.startswith('http_'):
+        return 'header_' + variable[5:], _TOKEN, None
+    return variable, _TOKEN, None
+
+
+@lru_cache(maxsize=64)
+def compile_log_format(log_format: str) -> CompiledLogFormat:
+    """
+    Compile an Apache LogFormat or nginx log_format string
+    
+    Apache directives (%h, %t, "%r", %>s, %{User-Agent}i, %D, ...) and
+    nginx variables ($remote_addr, $time_local, $request_time, ...) become
+    named groups using the same column names as LOG_PATTERN (ip, timestamp,
+    method, path, status, bytes, referer, user_agent), plus ident, user,
+    protocol, response_time (seconds) and friends for the extra fields.
+    Literal text is matched verbatim. Values between double quotes may
+    contain spaces; all other values are single tokens. A field that
+    appears twice is only captured the first time.
+    
+    Compiled formats are cached, so every parser for the same format shares
+    one regex.
+    
+    Args:
+        log_format: LogFormat directive string or nginx log_format string
+            (without the 'log_format name' prefix)
+    
+    Returns:
+        CompiledLogFormat with the anchored regex and numeric converters
+    
+    Raises:
+        ValueError: On directives that cannot be parsed into a column
+    """
+    nginx = '$' in log_format and '%' not in log_format.replace('%%', '')
+    token_pattern = _NGINX_TOKEN if nginx else _APACHE_TOKEN
+    field_for = _nginx_field if nginx else _apache_field
+    
+    parts: List[str] = []
+    converters: Dict[str, Converter] = {}
+    seen = set()
+    position = 0
+    
+    for match in token_pattern.finditer(log_format):
+        literal = log_format[position:match.start()]
+        parts.append(re.escape(literal))
+        position = match.end()
+        
+        if match.group(0) == '%%':
+            parts.append('%')
+            continue
+        
+        field, regex, converter = field_for(match)
+        quoted = literal.endswith('"') and log_format[position:position + 1] == '"'
+        if quoted and regex == _TOKEN:
+            regex = _QUOTED
+        
+        if field is None:
+            names = re.findall(r'\(\?P<(\w+)>', regex)
+            if seen.intersection(names):
+                regex = re.sub(r'\(\?P<\w+>', '(?:', regex)
+            seen.update(names)
+            parts.append(regex)
+        elif field in seen:
+            parts.append(f'(?:{regex})')
+        else:
+            seen.add(field)
+            parts.append(f'(?P<{field}>{regex})')
+            if converter is not None:
+                converters[field] = converter
+    
+    parts.append(re.escape(log_format[position:]))
+    
+    return CompiledLogFormat(log_format, re.compile(''.join(parts)), converters)
@@ -3,10 +3,484 @@ Apache Log Parser for SEO Analysis
 Parses Apache Combined Log Format and identifies search engine bots
 """
 
-import re
-from datetime import datetime
-from typing import Dict, List, Optional
-import pandas as pd
+from __future__ import annotations
+
+import heapq
+import mmap
+import os
+from collections import deque
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .cache import ParsedLogCache
+from .classifier import SEO_BOT_PATTERNS, BotClassifier
+from .columns import ColumnBuilder
+from .compression import detect_compression, iter_log_lines
+from .index import INDEX_EVERY, ORDER_TOLERANCE, TimestampIndex, bisect_offset, time_bounds
+from .lazy import lazy_import
+from .logformat import APACHE_COMBINED, COMBINED_CONVERTERS, COMBINED_PATTERN, compile_log_format
+from .records import (
+    NAIVE_TIMESTAMP_FORMAT, TIMESTAMP_FORMAT, LogRecord, RecordSource,
+    _parse_timestamp, build_records, open_lines,
+)
+from .schema import compact_frame
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Only needed for glob patterns and worker pools
+futures = lazy_import('concurrent.futures')
+glob = lazy_import('glob')
+
+
+# UTC offset at the end of an ISO 8601 timestamp
+ISO_OFFSET = r'(?:Z|[+-]\d{2}:?\d{2})$'
+
+# A single log file path or an ordered list of them
+LogPaths = Union[str, Sequence[str]]
+
+# Bound of a time range: datetime, pandas Timestamp or parseable string
+TimeBound = Union[str, datetime, 'pd.Timestamp', None]
+
+
+def concat_frames(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate parsed chunks, keeping categorical columns categorical
+    
+    Chunks are dictionary-encoded independently, so categories are unified
+    first (pd.concat would otherwise fall back to object columns). Columns
+    that were all-null in some chunk are re-inferred afterwards, giving the
+    same dtypes as parsing everything into one frame. total_requests
+    counts of bots_only chunks are summed.
+    
+    Args:
+        frames: DataFrames from ApacheLogParser.iter_chunks (left unchanged)
+        
+    Returns:
+        Single DataFrame with a fresh RangeIndex
+    """
+    frames = list(frames)
+    
+    # bots_only chunks carry the number of requests they were filtered from
+    total_requests = None
+    if any('total_requests' in frame.attrs for frame in frames):
+        total_requests = sum(frame.attrs.get('total_requests', len(frame)) for frame in frames)
+    
+    # Shallow copies take the unified categories and attrs
+    frames = [frame.copy(deep=False) for frame in frames if not frame.empty]
+    
+    if not frames:
+        df = pd.DataFrame()
+    elif len(frames) == 1:
+        df = frames[0]
+    else:
+        for column in frames[0].columns:
+            if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+                categories = frames[0][column].cat.categories
+                for frame in frames[1:]:
+                    categories = categories.union(frame[column].cat.categories)
+                for frame in frames:
+                    frame[column] = frame[column].cat.set_categories(categories)
+        
+        df = pd.concat(frames, ignore_index=True).infer_objects()
+    
+    if total_requests is not None:
+        df.attrs['total_requests'] = total_requests
+    return df
+
+
+def _as_path_list(filepath: LogPaths) -> List[str]:
+    """Normalize a path or sequence of paths to a list"""
+    if isinstance(filepath, (str, os.PathLike)):
+        return [filepath]
+    return list(filepath)
+
+
+def _resolve_log_paths(paths_or_glob: LogPaths) -> List[str]:
+    """
+    Expand a glob pattern (or list of paths and patterns) to log file paths
+    
+    Raises:
+        FileNotFoundError: If a pattern matches no file
+    """
+    paths = []
+    for pattern in _as_path_list(paths_or_glob):
+        if isinstance(pattern, str) and any(char in pattern for char in '*?['):
+            matches = sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+            if not matches:
+                raise FileNotFoundError(f"No log files match '{pattern}'")
+            paths.extend(matches)
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def _is_plain_file(filepaths: List[str]) -> bool:
+    """True for a single uncompressed file (mmap and byte ranges apply)"""
+    return len(filepaths) == 1 and detect_compression(filepaths[0]) is None
+
+
+def _read_lines(filepath: str, start: int, end: int) -> Iterator[str]:
+    """
+    Yield decoded lines from the byte range [start, end) of a file
+    
+    start must sit on a line boundary; the range ends after the line that
+    crosses end.
+    
+    Args:
+        filepath: Path to log file
+        start: Byte offset of the first line
+        end: Byte offset to stop at
+        
+    Yields:
+        Lines decoded as UTF-8, invalid bytes dropped
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            raw = f.readline()
+            if not raw:
+                break
+            position += len(raw)
+            yield raw.decode('utf-8', errors='ignore')
+
+
+def _limit_offset(filepath: str, limit: int, block_size: int = 1 << 20, start: int = 0) -> int:
+    """
+    Byte offset just past the first `limit` lines of a file
+    
+    Args:
+        filepath: Path to log file
+        limit: Number of lines
+        block_size: Read size in bytes
+        start: Line-aligned offset to count from
+        
+    Returns:
+        Offset after the limit-th newline, or the file size if shorter
+    """
+    remaining = limit
+    position = start
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return position
+            newlines = block.count(b'\n')
+            if newlines < remaining:
+                remaining -= newlines
+                position += len(block)
+                continue
+            index = -1
+            for _ in range(remaining):
+                index = block.index(b'\n', index + 1)
+            return position + index + 1
+
+
+def _split_byte_ranges(filepath: str, end: int, parts: int,
+                       start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Split [start, end) of a file into roughly equal newline-aligned ranges
+    
+    Args:
+        filepath: Path to log file
+        end: Byte offset where the last range stops
+        parts: Desired number of ranges
+        start: Line-aligned offset where the first range starts
+        
+    Returns:
+        List of (start, end) byte offsets in file order
+    """
+    boundaries = [start]
+    with open(filepath, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(max(start + (end - start) * i // parts - 1, boundaries[-1]))
+            f.readline()
+            boundary = min(f.tell(), end)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    if end > boundaries[-1]:
+        boundaries.append(end)
+    
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _iter_byte_range(parser: 'ApacheLogParser', filepath: str, start: int, end: int,
+                     deferred_bots: bool, engine: str = 'text',
+                     compact: bool = False, bots_only: bool = False) -> Iterator[pd.DataFrame]:
+    """Parse one byte range of a file in chunks of parser.CHUNK_ROWS rows"""
+    skipped = [0] if bots_only else None
+    
+    if engine == 'mmap':
+        with _map_file(filepath) as buffer:
+            rows = parser._scan_buffer(buffer, start, end, skipped=skipped)
+            yield from parser._iter_record_chunks(
+                rows, parser.CHUNK_ROWS, deferred_bots, compact, skipped
+            )
+        return
+    
+    rows = parser._scan_lines(_read_lines(filepath, start, end), skipped=skipped)
+    yield from parser._iter_record_chunks(
+        rows, parser.CHUNK_ROWS, deferred_bots, compact, skipped
+    )
+
+
+def _parse_byte_range(parser: 'ApacheLogParser', filepath: str, start: int, end: int,
+                      deferred_bots: bool, engine: str = 'text',
+                      compact: bool = False, bots_only: bool = False) -> pd.DataFrame:
+    """Process pool entry point: parse one byte range into a DataFrame"""
+    return concat_frames(_iter_byte_range(
+        parser, filepath, start, end, deferred_bots, engine, compact, bots_only
+    ))
+
+
+def _parse_whole_file(parser: 'ApacheLogParser', filepath: str, deferred_bots: bool,
+                      compact: bool = False, bots_only: bool = False) -> pd.DataFrame:
+    """Process pool entry point: parse one file into a DataFrame"""
+    return concat_frames(parser.iter_chunks(
+        filepath, deferred_bots=deferred_bots, compact=compact, bots_only=bots_only
+    ))
+
+
+def _tag_source(df: pd.DataFrame, code: int, sources: pd.Index) -> pd.DataFrame:
+    """Add the categorical source column (file path) to a parsed frame"""
+    if not df.empty:
+        codes = np.full(len(df), code, dtype=np.int32)
+        df['source'] = pd.Categorical.from_codes(codes, categories=sources)
+    return df
+
+
+def _result_chunks(future, code: Optional[int], sources: pd.Index,
+                   chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Split a file parsed by the process pool into chunks for merge_chunks"""
+    df = future.result()
+    if code is not None:
+        df = _tag_source(df, code, sources)
+    if df.empty:
+        yield df
+        return
+    
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        # The bots_only request count belongs to the file, not every chunk
+        chunk.attrs = dict(df.attrs) if start == 0 else {}
+        yield chunk
+
+
+def _iter_buffer_lines(buffer, start: int, end: int, block_size: int = 1 << 22) -> Iterator[str]:
+    """
+    Yield decoded lines from [start, end) of a bytes-like buffer
+    
+    The buffer is cut into blocks ending on a newline, and each block is
+    decoded with a single call instead of line by line.
+    
+    Args:
+        buffer: bytes or mmap holding log data
+        start: Offset of the first line
+        end: Offset to stop at (the line crossing it is still read)
+        block_size: Approximate bytes decoded per block
+        
+    Yields:
+        Lines without their trailing newline, invalid UTF-8 dropped
+    """
+    size = len(buffer)
+    position = start
+    
+    while position < end:
+        stop = buffer.find(b'\n', min(position + block_size, end) - 1)
+        stop = size if stop == -1 else stop + 1
+        
+        lines = buffer[position:stop].decode('utf-8', errors='ignore').split('\n')
+        if lines[-1] == '':
+            # Block ended on a newline, not on an unterminated last line
+            lines.pop()
+        yield from lines
+        
+        position = stop
+
+
+@contextmanager
+def _map_file(filepath: str):
+    """
+    Memory-map a file read-only (empty files map to b'')
+    
+    Args:
+        filepath: Path to file
+        
+    Yields:
+        mmap object supporting find() and regex matching
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def _utc_timestamp(value: TimeBound) -> Optional[pd.Timestamp]:
+    """Time range bound as a UTC Timestamp (naive input is read as UTC)"""
+    if value is None:
+        return None
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize('UTC')
+    return timestamp.tz_convert('UTC')
+
+
+def _select_time_range(df: pd.DataFrame, since: Optional[pd.Timestamp],
+                       until: Optional[pd.Timestamp]) -> pd.DataFrame:
+    """Rows with since <= timestamp < until"""
+    if df.empty:
+        return df
+    
+    keep = np.ones(len(df), dtype=bool)
+    if since is not None:
+        keep &= (df['timestamp'] >= since).to_numpy()
+    if until is not None:
+        keep &= (df['timestamp'] < until).to_numpy()
+    if keep.all():
+        return df
+    
+    return df[keep].reset_index(drop=True)
+
+
+def _head_in_time_range(frames: Iterable[pd.DataFrame], since: Optional[pd.Timestamp],
+                        until: Optional[pd.Timestamp], limit: Optional[int]) -> pd.DataFrame:
+    """
+    The first limit rows with since <= timestamp < until of a chunk stream
+    
+    Chunks are only read until limit rows in the range have been found.
+    
+    Args:
+        frames: Parsed chunks in file order
+        since: Lower bound (inclusive) or None
+        until: Upper bound (exclusive) or None
+        limit: Maximum number of rows, or None for all
+        
+    Returns:
+        Single DataFrame with a fresh RangeIndex
+    """
+    if limit:
+        read, in_range = [], 0
+        for df in frames:
+            read.append(df)
+            in_range += len(_select_time_range(df, since, until))
+            if in_range >= limit:
+                break
+        frames = read
+    
+    df = _select_time_range(concat_frames(frames), since, until)
+    return df.head(limit) if limit else df
+
+
+# One time-ordered input of merge_chunks: (first timestamp in epoch ns or
+# None if unknown, iterator of DataFrame chunks)
+MergeSource = Tuple[Optional[int], Iterator['pd.DataFrame']]
+
+
+def _nanoseconds(df: pd.DataFrame, column: str) -> np.ndarray:
+    """int64 view of a datetime column (tz-aware columns are stored as UTC)"""
+    return df[column].values.view(np.int64)
+
+
+def merge_chunks(sources: Sequence[MergeSource],
+                 column: str = 'timestamp') -> Iterator[pd.DataFrame]:
+    """
+    Streaming k-way merge of chunk streams that are each ordered by time
+    
+    A heap holds the latest timestamp buffered from every open stream. Its
+    minimum is a watermark: no stream can still produce an earlier row, so
+    all buffered rows up to it are emitted as one batch, ordered with a
+    stable argsort (the batch is k sorted runs, which numpy's stable merge
+    sort combines in O(n log k)). The streams that set the watermark are
+    then refilled. At most one chunk per stream is buffered and rows with
+    equal timestamps keep stream order.
+    
+    Streams must be given in order of their first timestamp. A stream is
+    only opened once the watermark reaches that timestamp, so rotated files
+    of one server are read one after another rather than all at once.
+    
+    bots_only chunks carry df.attrs['total_requests']; the counts of the
+    chunks consumed for a batch are attached to it, and a remainder is
+    yielded last as an empty frame.
+    
+    Args:
+        sources: (first timestamp, chunk iterator) pairs
+        column: Datetime column to merge on
+        
+    Yields:
+        DataFrames in timestamp order
+    """
+    pending = deque(sources)
+    streams: Dict[int, Iterator[pd.DataFrame]] = {}
+    buffers: Dict[int, pd.DataFrame] = {}
+    heap: List[Tuple[int, int]] = []
+    total_requests = 0
+    counted = False
+    
+    def refill(order: int):
+        nonlocal total_requests, counted
+        for chunk in streams[order]:
+            if 'total_requests' in chunk.attrs:
+                total_requests += chunk.attrs['total_requests']
+                counted = True
+            if not chunk.empty:
+                buffers[order] = chunk
+                heapq.heappush(heap, (int(_nanoseconds(chunk, column).max()), order))
+                return
+        del streams[order]
+    
+    def open_next():
+        order = len(sources) - len(pending)
+        streams[order] = iter(pending.popleft()[1])
+        refill(order)
+    
+    while heap or pending:
+        if not heap:
+            open_next()
+            continue
+        
+        # Streams starting before the watermark may hold earlier rows
+        while pending and (pending[0][0] is None or pending[0][0] <= heap[0][0]):
+            open_next()
+        watermark = heap[0][0]
+        
+        parts = []
+        for order in sorted(buffers):
+            buffer = buffers[order]
+            due = _nanoseconds(buffer, column) <= watermark
+            if due.all():
+                parts.append(buffer)
+                del buffers[order]
+            elif due.any():
+                parts.append(buffer[due])
+                buffers[order] = buffer[~due]
+        
+        drained = []
+        while heap and heap[0][0] <= watermark:
+            drained.append(heapq.heappop(heap)[1])
+        
+        batch = concat_frames(parts)
+        batch = batch.take(np.argsort(_nanoseconds(batch, column), kind='stable'))
+        batch = batch.reset_index(drop=True)
+        # Counts are taken from the chunks as they are consumed, not from parts
+        batch.attrs = {}
+        if counted:
+            batch.attrs['total_requests'] = total_requests
+            total_requests = 0
+        yield batch
+        
+        for order in drained:
+            refill(order)
+    
+    if total_requests:
+        df = pd.DataFrame()
+        df.attrs['total_requests'] = total_requests
+        yield df
 
 
 class ApacheLogParser:
@@ -16,81 +490,193 @@ class ApacheLogParser:
     """
     
     # Regex pattern for Apache Combined format
-    LOG_PATTERN = re.compile(
-        r'(?P<ip>[\d.]+) '
-        r'- - '
-        r'\[(?P<timestamp>[^\]]+)\] '
-        r'"(?P<method>\w+) (?P<path>[^\s]+) HTTP/[\d.]+" '
-        r'(?P<status>\d+) '
-        r'(?P<bytes>\d+|-) '
-        r'"(?P<referer>[^"]*)" '
-        r'"(?P<user_agent>[^"]*)"'
-    )
+    LOG_PATTERN = COMBINED_PATTERN
     
     # Common SEO bots
-    BOT_PATTERNS = {
-        'googlebot': r'Googlebot',
-        'googlebot_mobile': r'Googlebot-Mobile',
-        'bingbot': r'bingbot',
-        'yandex': r'YandexBot',
-        'baidu': r'Baiduspider',
-        'duckduckgo': r'DuckDuckBot',
-        'semrush': r'SemrushBot',
-        'ahrefs': r'AhrefsBot',
-        'screaming_frog': r'Screaming Frog',
-        'mj12bot': r'MJ12bot',
-        'dotbot': r'DotBot',
-        'ahrefsbot': r'AhrefsBot',
-        'semrushbot': r'SemrushBot'
-    }
-    
-    def __init__(self):
-        """Initialize parser"""
+    BOT_PATTERNS = SEO_BOT_PATTERNS
+    
+    # Parsed rows per DataFrame when streaming a file in chunks
+    CHUNK_ROWS = 100000
+    
+    # Compressed files decompressing concurrently when parsing a path list
+    DECOMPRESS_PARALLEL = 2
+    
+    # Fields a custom log format must capture
+    REQUIRED_FIELDS = ('timestamp', 'path', 'user_agent')
+    
+    def __init__(self, strict_bots: bool = False, cache: Optional[ParsedLogCache] = None,
+                 log_format: Optional[str] = None):
+        """
+        Initialize parser
+        
+        Args:
+            strict_bots: Classify bots by most specific pattern instead of
+                first match (e.g. Googlebot-Mobile is not reported as Googlebot)
+            cache: Serve parse_file results for unchanged files from this
+                Parquet cache
+            log_format: Apache LogFormat or nginx log_format string to parse
+                instead of LOG_PATTERN (see logformat.compile_log_format).
+                Extra fields such as %D or $request_time become columns.
+        """
         self.parsed_logs = []
+        self.bot_classifier = BotClassifier(self.BOT_PATTERNS, strict=strict_bots)
+        self.cache = cache
+        self.log_format = log_format
+        self.field_converters = COMBINED_CONVERTERS
+        
+        if log_format is not None:
+            compiled = compile_log_format(log_format)
+            missing = [field for field in self.REQUIRED_FIELDS if field not in compiled.fields]
+            if missing:
+                raise ValueError(f"Log format does not capture required fields: {', '.join(missing)}")
+            self.LOG_PATTERN = compiled.pattern
+            self.field_converters = compiled.converters
+        
+        self._bot_tokens = self.bot_classifier.prefilter_tokens()
+        
+        # Layout a line skipped by the bot prefilter needs to count as a
+        # request: the quotes of the format and the [time] brackets
+        self._line_quotes = (log_format or APACHE_COMBINED).count('"')
+        self._line_brackets = '\\[' in self.LOG_PATTERN.pattern
+    
+    def cache_settings(self) -> Dict:
+        """
+        Parser configuration that determines parse output
+        
+        Part of every cache key, so entries built with other bot patterns
+        or log pattern are never served. Pass it to ParsedLogCache.prune
+        after changing BOT_PATTERNS to delete the outdated entries.
+        
+        Returns:
+            JSON-serializable dict
+        """
+        return {
+            'log_format': self.log_format,
+            'log_pattern': self.LOG_PATTERN.pattern,
+            'bot_patterns': self.bot_classifier.patterns,
+            'strict_bots': self.bot_classifier.strict,
+        }
     
-    def parse_line(self, line: str) -> Optional[Dict]:
+    def parse_line(self, line: str, identify_bots: bool = True) -> Optional[Dict]:
         """
         Parse single log line into structured dict
         
         Args:
             line: Raw log line string
+            identify_bots: Add bot_type/is_bot fields (skipped when the
+                caller classifies user agents in bulk afterwards)
             
         Returns:
             Dict with parsed fields or None if parsing fails
         """
-        match = self.LOG_PATTERN.match(line)
+        data = self._scan_line(line, identify_bots)
         
-        if not match:
+        if data is None:
             return None
         
-        data = match.groupdict()
-        
         # Convert timestamp to datetime
-        try:
-            data['timestamp'] = datetime.strptime(
-                data['timestamp'], 
-                '%d/%b/%Y:%H:%M:%S %z'
-            )
-        except ValueError:
-            # Fallback for logs without timezone
-            try:
-                data['timestamp'] = datetime.strptime(
-                    data['timestamp'].split()[0], 
-                    '%d/%b/%Y:%H:%M:%S'
-                )
-            except ValueError:
-                return None
+        data['timestamp'] = _parse_timestamp(data['timestamp'])
+        if data['timestamp'] is None:
+            return None
         
-        # Convert status and bytes to int
-        data['status'] = int(data['status'])
-        data['bytes'] = int(data['bytes']) if data['bytes'] != '-' else 0
+        return data
+    
+    def iter_records(self, source: RecordSource, identify_bots: bool = True,
+                     limit: Optional[int] = None) -> Iterator[LogRecord]:
+        """
+        Parse a log into compact LogRecords one line at a time
+        
+        The lightweight alternative to parse_line for consumers that do
+        not need a DataFrame. Processes that must not import pandas can
+        use records.iter_records instead, which parses the same way.
+        
+        Args:
+            source: Log path (plain or compressed), '-' for stdin, an open
+                text or binary stream, or an iterable of lines
+            identify_bots: Fill in bot_type
+            limit: Optional limit on number of lines to parse
+            
+        Yields:
+            LogRecord for every matching line, in file order
+        """
+        classify = self.bot_classifier.classify if identify_bots else None
+        with open_lines(source) as lines:
+            rows = self._scan_lines(lines, limit)
+            yield from build_records(rows, self.LOG_PATTERN.groupindex, self.field_converters, classify)
+    
+    def _scan_line(self, line: str, identify_bots: bool = True) -> Optional[Dict]:
+        """
+        Match a log line, keeping the timestamp as its raw string
+        
+        Used by parse_line; bulk parsing feeds _scan_lines field tuples
+        straight into a ColumnBuilder instead.
+        
+        Args:
+            line: Raw log line string
+            identify_bots: Add bot_type/is_bot fields
+            
+        Returns:
+            Dict with parsed fields or None if the line does not match
+        """
+        match = self.LOG_PATTERN.match(line)
+        if not match:
+            return None
+        data = match.groupdict()
+        
+        # Convert status, bytes and other numeric fields
+        for field, (_, convert) in self.field_converters.items():
+            data[field] = convert(data[field])
         
         # Identify bot type
-        data['bot_type'] = self._identify_bot(data['user_agent'])
-        data['is_bot'] = data['bot_type'] is not None
+        if identify_bots:
+            data['bot_type'] = self._identify_bot(data['user_agent'])
+            data['is_bot'] = data['bot_type'] is not None
         
         return data
     
+    def _line_timestamp(self, line: str) -> Optional[float]:
+        """
+        Epoch seconds of one log line, for TimestampIndex and time seeks
+        
+        Args:
+            line: Raw log line string
+            
+        Returns:
+            Seconds since the epoch (timestamps without timezone are UTC),
+            or None if the line does not match
+        """
+        match = self.LOG_PATTERN.match(line.strip())
+        if not match:
+            return None
+        timestamp = _parse_timestamp(match.group('timestamp'))
+        if timestamp is None:
+            return None
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    
+    def build_index(self, filepath: str, every: int = INDEX_EVERY) -> TimestampIndex:
+        """
+        Create or refresh the timestamp index sidecar of a plain log file
+        
+        Only lines appended since the last call are scanned. Once a log
+        has a sidecar, parse_file(since=..., until=...) keeps it current
+        and seeks with it instead of bisecting the file.
+        
+        Args:
+            filepath: Path to plain (uncompressed) log file
+            every: Lines between index entries (ignored for an existing index)
+            
+        Returns:
+            The saved TimestampIndex
+        """
+        index = TimestampIndex.load(filepath, self._line_timestamp)
+        if index is None:
+            index = TimestampIndex(filepath, self._line_timestamp, every)
+        index.update()
+        index.save()
+        return index
+    
     def _identify_bot(self, user_agent: str) -> Optional[str]:
         """
         Identify bot type from user agent string
@@ -101,68 +687,667 @@ class ApacheLogParser:
         Returns:
             Bot type name or None if not a bot
         """
-        for bot_name, pattern in self.BOT_PATTERNS.items():
-            if re.search(pattern, user_agent, re.IGNORECASE):
-                return bot_name
-        return None
+        return self.bot_classifier.classify(user_agent)
     
-    def parse_file(self, filepath: str, limit: Optional[int] = None) -> pd.DataFrame:
+    def _classify_user_agents(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Parse entire log file into pandas DataFrame
+        Add bot_type/is_bot by classifying each distinct user agent once
+        
+        The user_agent column is dictionary-encoded into a categorical and
+        the per-UA classification is broadcast back through its codes.
+        Categories are sorted so groupby output order matches object columns.
         
         Args:
-            filepath: Path to log file
-            limit: Optional limit on number of lines to parse
+            df: Parsed DataFrame without bot columns
+            
+        Returns:
+            DataFrame with categorical user_agent and bot_type columns
+        """
+        codes, user_agents = pd.factorize(df['user_agent'], sort=True)
+        bot_names = pd.Series([self._identify_bot(ua) for ua in user_agents], dtype=object)
+        bot_codes, bot_types = pd.factorize(bot_names, sort=True)
+        row_bot_codes = bot_codes[codes]
+        
+        position = df.columns.get_loc('user_agent')
+        df['user_agent'] = pd.Categorical.from_codes(codes, categories=user_agents)
+        df.insert(position + 1, 'bot_type', pd.Categorical.from_codes(row_bot_codes, categories=bot_types))
+        df.insert(position + 2, 'is_bot', row_bot_codes >= 0)
+        
+        return df
+    
+    def _convert_timestamps(self, raw: List[str]) -> np.ndarray:
+        """
+        Convert distinct raw log timestamps to UTC epoch nanoseconds
+        
+        Called once per chunk with every distinct timestamp string (the
+        builder dictionary-encodes them, and consecutive lines usually
+        share the same second), so the conversion is a single vectorized
+        pass. Timestamps without a timezone are read as UTC; ISO 8601
+        timestamps (nginx $time_iso8601) are accepted as a last resort.
+        
+        Args:
+            raw: Distinct timestamp strings as found in the log
+            
+        Returns:
+            int64 array of epoch nanoseconds, NaT where unparseable
+        """
+        uniques = pd.Series(raw, dtype=object)
+        
+        converted = pd.to_datetime(uniques, format=TIMESTAMP_FORMAT, errors='coerce', utc=True)
+        
+        missing = converted.isna()
+        if missing.any():
+            # Fallback for logs without timezone
+            naive = pd.to_datetime(
+                uniques[missing].str.split().str[0],
+                format=NAIVE_TIMESTAMP_FORMAT,
+                errors='coerce'
+            )
+            converted[missing] = naive.dt.tz_localize('UTC')
+            
+            missing = converted.isna()
+            if missing.any():
+                # nginx $time_iso8601
+                converted[missing] = pd.to_datetime(
+                    uniques[missing], format='ISO8601', errors='coerce', utc=True
+                )
+        
+        converted = converted.dt.tz_convert(None).astype('datetime64[ns]')
+        return converted.to_numpy().view(np.int64)
+    
+    def _convert_local_times(self, raw: List[str]) -> np.ndarray:
+        """
+        Convert distinct raw log timestamps to the wall-clock time logged
+        
+        The UTC offset is dropped instead of applied, so the date and hour
+        columns follow the server's local time, as written in the log.
+        
+        Args:
+            raw: Distinct timestamp strings as found in the log
+            
+        Returns:
+            int64 array of naive epoch nanoseconds, NaT where unparseable
+        """
+        uniques = pd.Series(raw, dtype=object)
+        
+        local = pd.to_datetime(
+            uniques.str.split().str[0], format=NAIVE_TIMESTAMP_FORMAT, errors='coerce'
+        )
+        
+        missing = local.isna()
+        if missing.any():
+            # nginx $time_iso8601
+            local[missing] = pd.to_datetime(
+                uniques[missing].str.replace(ISO_OFFSET, '', regex=True),
+                format='ISO8601', errors='coerce'
+            )
+        
+        return local.astype('datetime64[ns]').to_numpy().view(np.int64)
+    
+    def _new_builder(self, deferred_bots: bool = False, bots_only: bool = False) -> ColumnBuilder:
+        """Columnar buffer for matches of LOG_PATTERN"""
+        identify_bot = None if deferred_bots else self._identify_bot
+        return ColumnBuilder(
+            self.LOG_PATTERN.groupindex, identify_bot, self.field_converters, bots_only
+        )
+    
+    def _to_dataframe(self, builder: ColumnBuilder, deferred_bots: bool = False,
+                      compact: bool = False, bots_only: bool = False) -> pd.DataFrame:
+        """
+        Build DataFrame from parsed records and add derived SEO columns
+        
+        Args:
+            builder: Columnar buffer filled by _iter_record_chunks
+            deferred_bots: Records were parsed without bot detection
+            compact: Convert to the compact schema (see schema.compact_frame)
+            bots_only: Keep only bot rows and record the number of parsed
+                requests in df.attrs['total_requests']
             
         Returns:
             DataFrame with parsed log data
         """
-        parsed_data = []
+        if not len(builder):
+            df = pd.DataFrame()
+            if bots_only:
+                df.attrs['total_requests'] = builder.dropped
+            return df
         
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            for i, line in enumerate(f):
-                if limit and i >= limit:
-                    break
-                
-                parsed = self.parse_line(line.strip())
-                if parsed:
-                    parsed_data.append(parsed)
+        df = builder.to_frame(self._convert_timestamps)
+        local = builder.timestamp_values(self._convert_local_times)
         
-        df = pd.DataFrame(parsed_data)
+        # Lines with unparseable timestamps are dropped, as in parse_line
+        parsed = df['timestamp'].notna().to_numpy()
+        if not parsed.all():
+            df = df[parsed].reset_index(drop=True)
+            local = local[parsed]
+        
+        total_requests = len(df) + builder.dropped
         
         # Add useful SEO columns
         if not df.empty:
-            df['date'] = df['timestamp'].dt.date
-            df['hour'] = df['timestamp'].dt.hour
+            # date and hour in the time zone of the log, timestamp in UTC
+            unknown = local == np.iinfo(np.int64).min
+            if unknown.any():
+                local[unknown] = _nanoseconds(df, 'timestamp')[unknown]
+            local = pd.DatetimeIndex(local.view('datetime64[ns]'))
+            df['date'] = local.date
+            df['hour'] = local.hour
+            
+            # status is buffered as int32; only the compact schema narrows it
+            if not compact and 'status' in df.columns:
+                df['status'] = df['status'].astype(np.int64)
+            
+            if deferred_bots:
+                df = self._classify_user_agents(df)
+                if bots_only:
+                    df = df[df['is_bot']].reset_index(drop=True)
             df['is_html'] = df['path'].str.endswith(('.html', '.htm', '/'))
             df['file_extension'] = df['path'].str.extract(r'\.([a-z0-9]+)$')[0]
             
+            if compact:
+                df = compact_frame(df)
+        
+        if bots_only:
+            df.attrs['total_requests'] = total_requests
+            
         return df
     
-    def parse_string(self, log_string: str) -> pd.DataFrame:
+    def iter_chunks(self, filepath: LogPaths, chunk_rows: Optional[int] = None,
+                    limit: Optional[int] = None,
+                    deferred_bots: bool = False,
+                    engine: str = 'text',
+                    compact: bool = False,
+                    bots_only: bool = False) -> Iterator[pd.DataFrame]:
         """
-        Parse log data from string (useful for testing)
+        Parse a log file as a stream of bounded DataFrames
+        
+        Only one chunk of records is held at a time, so memory stays flat
+        regardless of file size. Every chunk carries the same derived
+        columns as parse_file.
+        
+        gzip, bzip2, xz and zstd files are detected by their magic bytes and
+        decompressed by background threads while lines are parsed. A list
+        of paths is read back to back as one stream, with the next
+        DECOMPRESS_PARALLEL files decompressing concurrently.
         
         Args:
-            log_string: Multi-line string of log entries
+            filepath: Path to log file, or list of paths read in order
+            chunk_rows: Maximum number of parsed rows per chunk
+                (defaults to CHUNK_ROWS)
+            limit: Optional limit on number of lines to parse
+            deferred_bots: Classify distinct user agents once per chunk
+            engine: 'text' reads the file through a decoding text stream;
+                'mmap' memory-maps it, finds line boundaries on the raw
+                buffer and decodes whole newline-aligned blocks at once.
+                Compressed files and path lists are always streamed.
+            compact: Convert each chunk to the compact schema
+            bots_only: Keep only bot rows (see parse_file). A chunk may
+                then be empty, carrying just its total_requests count.
+            
+        Yields:
+            DataFrames with parsed log data
+        """
+        if engine not in ('text', 'mmap'):
+            raise ValueError(f"Unknown engine '{engine}', expected 'text' or 'mmap'")
+        
+        chunk_rows = chunk_rows or self.CHUNK_ROWS
+        filepaths = _as_path_list(filepath)
+        skipped = [0] if bots_only else None
+        
+        if engine == 'mmap' and _is_plain_file(filepaths):
+            with _map_file(filepaths[0]) as buffer:
+                rows = self._scan_buffer(buffer, 0, len(buffer), limit, skipped)
+                yield from self._iter_record_chunks(rows, chunk_rows, deferred_bots, compact, skipped)
+            return
+        
+        with closing(iter_log_lines(filepaths, parallel=self.DECOMPRESS_PARALLEL)) as lines:
+            rows = self._scan_lines(lines, limit, skipped)
+            yield from self._iter_record_chunks(rows, chunk_rows, deferred_bots, compact, skipped)
+    
+    def _scan_lines(self, lines: Iterable[str], limit: Optional[int] = None,
+                    skipped: Optional[List[int]] = None) -> Iterator[Tuple[str, ...]]:
+        """
+        Split raw text lines into LOG_PATTERN fields
+        
+        Args:
+            lines: Raw log lines (surrounding whitespace is stripped)
+            limit: Optional limit on number of lines to parse
+            skipped: Enables the bot prefilter: ASCII lines containing none
+                of the bot tokens (case-insensitive) are not parsed at all.
+                Each one with the quotes and brackets of a log line is
+                counted in skipped[0]; blank and garbage lines are not.
+                Without tokens (regex BOT_PATTERNS) every line is parsed.
+            
+        Yields:
+            Field values in LOG_PATTERN group order for every matching line
+        """
+        match_line = self.LOG_PATTERN.match
+        tokens = self._bot_tokens if skipped is not None else None
+        quotes, brackets = self._line_quotes, self._line_brackets
+                
+        for i, line in enumerate(lines):
+            if limit and i >= limit:
+                break
+            
+            line = line.strip()
+            if tokens is not None and line.isascii():
+                folded = line.lower()
+                for token in tokens:
+                    if token in folded:
+                        break
+                else:
+                    if line and line.count('"') == quotes and (not brackets or '[' in line):
+                        skipped[0] += 1
+                    continue
+            
+            match = match_line(line)
+            if match:
+                yield match.groups()
+    
+    def _scan_buffer(self, buffer, start: int, end: int, limit: Optional[int] = None,
+                     skipped: Optional[List[int]] = None) -> Iterator[Tuple[str, ...]]:
+        """
+        Match lines of a bytes-like buffer (e.g. an mmap) against LOG_PATTERN
+        
+        Args:
+            buffer: bytes or mmap holding log data
+            start: Offset of the first line
+            end: Offset to stop at (the line crossing it is still read)
+            limit: Optional limit on number of lines to parse
+            skipped: Bot prefilter counter (see _scan_lines)
+            
+        Yields:
+            Field values in LOG_PATTERN group order for every matching line
+        """
+        return self._scan_lines(_iter_buffer_lines(buffer, start, end), limit, skipped)
+    
+    def _iter_record_chunks(self, rows: Iterable[Tuple[str, ...]], chunk_rows: int,
+                            deferred_bots: bool = False,
+                            compact: bool = False,
+                            skipped: Optional[List[int]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Accumulate matched lines column-wise into bounded DataFrames
+        
+        Args:
+            rows: Field tuples from _scan_lines or _scan_buffer
+            chunk_rows: Maximum number of parsed rows per chunk
+            deferred_bots: Classify distinct user agents once per chunk
+            compact: Convert each chunk to the compact schema
+            skipped: Prefilter counter shared with _scan_lines; enables
+                bots_only mode, adding the lines skipped since the previous
+                chunk to its total_requests
+            
+        Yields:
+            DataFrames with parsed log data
+        """
+        bots_only = skipped is not None
+        builder = self._new_builder(deferred_bots, bots_only)
+        
+        def finish(builder: ColumnBuilder) -> pd.DataFrame:
+            df = self._to_dataframe(builder, deferred_bots, compact, bots_only)
+            if bots_only:
+                df.attrs['total_requests'] += skipped[0]
+                skipped[0] = 0
+            return df
+        
+        for values in rows:
+            builder.append(values)
+            
+            if len(builder) >= chunk_rows:
+                df = finish(builder)
+                builder = self._new_builder(deferred_bots, bots_only)
+                if not df.empty or df.attrs.get('total_requests'):
+                    yield df
+        
+        df = finish(builder)
+        if not df.empty or df.attrs.get('total_requests'):
+            yield df
+    
+    def parse_file(self, filepath: LogPaths, limit: Optional[int] = None,
+                   deferred_bots: bool = False,
+                   workers: Optional[int] = None,
+                   engine: str = 'text',
+                   compact: bool = False,
+                   bots_only: bool = False,
+                   since: TimeBound = None,
+                   until: TimeBound = None) -> pd.DataFrame:
+        """
+        Parse entire log file into pandas DataFrame
+        
+        Args:
+            filepath: Path to log file (plain or compressed), or list of
+                paths parsed back to back
+            limit: Optional limit on number of lines to parse
+            deferred_bots: Skip per-line bot detection and classify each
+                distinct user agent once after parsing. user_agent and
+                bot_type become categorical columns.
+            workers: Parse newline-aligned byte ranges of the file in this
+                many processes. The result is identical to a single-process
+                parse, in file order. Only applies to a single plain file;
+                compressed input is streamed in this process.
+            engine: Line scanner, 'text' or 'mmap' (see iter_chunks)
+            compact: Return the compact schema: categorical low-cardinality
+                text, string[pyarrow] paths/referers, int16 status, uint32
+                bytes and datetime64 dates (see schema.compact_frame)
+            bots_only: Return only bot rows. Lines are first checked for a
+                bot token with a case-insensitive substring test and human
+                traffic is skipped before any regex or timestamp work. The
+                number of requests is kept in df.attrs['total_requests']
+                (skipped lines are counted if their quotes and brackets are
+                laid out like a log line, without a full match), which
+                SEOLogAnalyzer.crawl_budget_summary reports.
+            since: Only return requests logged at or after this time
+                (datetime or string; naive values are UTC)
+            until: Only return requests logged before this time. For a
+                plain file only the byte range that can hold the range is
+                read: it is looked up in the build_index sidecar if the log
+                has one, otherwise found by bisecting the file on line
+                timestamps. limit then applies to the requests in the
+                range. Compressed files and path lists are parsed fully and
+                filtered.
             
         Returns:
             DataFrame with parsed log data
         """
-        parsed_data = []
+        filepaths = _as_path_list(filepath)
+        since, until = _utc_timestamp(since), _utc_timestamp(until)
         
-        for line in log_string.strip().split('\n'):
-            parsed = self.parse_line(line.strip())
-            if parsed:
-                parsed_data.append(parsed)
+        key = None
+        if self.cache is not None:
+            options = {
+                'limit': limit, 'deferred_bots': deferred_bots,
+                'compact': compact, 'bots_only': bots_only,
+            }
+            if since is not None or until is not None:
+                options['since'] = None if since is None else since.isoformat()
+                options['until'] = None if until is None else until.isoformat()
+            key = self.cache.key(filepaths, self.cache_settings(), options)
+            df = self.cache.load(key)
+            if df is not None:
+                return df
         
-        df = pd.DataFrame(parsed_data)
+        if since is not None or until is not None:
+            df = self._parse_time_range(
+                filepaths, since, until, limit, deferred_bots, workers, engine,
+                compact, bots_only
+            )
+        elif workers and workers > 1 and _is_plain_file(filepaths):
+            df = self._parse_file_parallel(
+                filepaths[0], limit, deferred_bots, workers, engine, compact, bots_only
+            )
+        else:
+            df = concat_frames(self.iter_chunks(
+                filepath, limit=limit, deferred_bots=deferred_bots, engine=engine,
+                compact=compact, bots_only=bots_only
+            ))
         
-        # Add useful SEO columns
+        if key is not None:
+            self.cache.store(key, df)
+        
+        return df
+    
+    def _parse_file_parallel(self, filepath: str, limit: Optional[int],
+                             deferred_bots: bool, workers: int,
+                             engine: str = 'text',
+                             compact: bool = False,
+                             bots_only: bool = False,
+                             start: int = 0,
+                             end: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parse a file across a process pool, one byte range per worker
+        
+        Args:
+            filepath: Path to log file
+            limit: Optional limit on number of lines to parse
+            deferred_bots: Classify distinct user agents once per range
+            workers: Number of worker processes
+            engine: Line scanner, 'text' or 'mmap'
+            compact: Convert each range to the compact schema
+            bots_only: Keep only bot rows
+            start: Line-aligned offset to start parsing at
+            end: Offset to stop at (defaults to the file size)
+            
+        Returns:
+            DataFrame with parsed log data
+        """
+        if end is None:
+            end = os.path.getsize(filepath)
+        if limit:
+            end = min(end, _limit_offset(filepath, limit, start=start))
+        ranges = _split_byte_ranges(filepath, end, workers, start)
+        
+        if len(ranges) <= 1:
+            return _parse_byte_range(
+                self, filepath, start, end, deferred_bots, engine, compact, bots_only
+            )
+        
+        with futures.ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            frames = list(executor.map(
+                _parse_byte_range,
+                repeat(self), repeat(filepath),
+                [start for start, _ in ranges], [stop for _, stop in ranges],
+                repeat(deferred_bots), repeat(engine), repeat(compact), repeat(bots_only)
+            ))
+        
+        return concat_frames(frames)
+    
+    def _parse_time_range(self, filepaths: List[str], since: Optional[pd.Timestamp],
+                          until: Optional[pd.Timestamp], limit: Optional[int],
+                          deferred_bots: bool, workers: Optional[int],
+                          engine: str, compact: bool, bots_only: bool) -> pd.DataFrame:
+        """
+        Parse the requests logged in [since, until)
+        
+        A plain file is only read between the offsets the timestamp index
+        (or a bisection of the file) gives for the range, widened by
+        index.ORDER_TOLERANCE for lines logged slightly out of order. Rows
+        are then filtered on their exact timestamps; limit counts the rows
+        left, so the widened start of the range does not change the result.
+        
+        bots_only does not prefilter lines here: skipped lines have no
+        timestamp, so they could not be counted into total_requests for
+        the range. Bot rows are selected after the time filter instead.
+        
+        Returns:
+            DataFrame with parsed log data
+        """
+        if not _is_plain_file(filepaths):
+            frames = self.iter_chunks(
+                filepaths, deferred_bots=deferred_bots, engine=engine, compact=compact
+            )
+            return self._select_bots(_head_in_time_range(frames, since, until, limit), bots_only)
+        
+        filepath = filepaths[0]
+        since_seconds = None if since is None else since.timestamp()
+        until_seconds = None if until is None else until.timestamp()
+        
+        index = TimestampIndex.load(filepath, self._line_timestamp)
+        if index is not None:
+            if index.update():
+                index.save()
+            start, end = index.seek(since_seconds, until_seconds)
+        else:
+            start, end = 0, os.path.getsize(filepath)
+            if since_seconds is not None:
+                start = bisect_offset(
+                    filepath, since_seconds - ORDER_TOLERANCE, self._line_timestamp
+                )
+            if until_seconds is not None:
+                end = bisect_offset(
+                    filepath, until_seconds + ORDER_TOLERANCE, self._line_timestamp, lo=start
+                )
+        
+        if workers and workers > 1:
+            frames = [self._parse_file_parallel(
+                filepath, None, deferred_bots, workers, engine, compact,
+                start=start, end=end
+            )]
+        else:
+            frames = _iter_byte_range(self, filepath, start, end, deferred_bots, engine, compact)
+        
+        return self._select_bots(_head_in_time_range(frames, since, until, limit), bots_only)
+    
+    def file_time_range(self, filepath: str) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """
+        Timestamps of the first and last requests in a log file
+        
+        Plain files are read at both ends only. Compressed files cannot be
+        read from the end, so only their first timestamp is returned.
+        
+        Args:
+            filepath: Path to log file (plain or compressed)
+            
+        Returns:
+            (first, last) UTC Timestamps, None where unknown
+        """
+        if detect_compression(filepath) is None:
+            first, last = time_bounds(filepath, self._line_timestamp)
+        else:
+            first = last = None
+            with closing(iter_log_lines([filepath], parallel=1)) as lines:
+                for line in lines:
+                    first = self._line_timestamp(line)
+                    if first is not None:
+                        break
+        
+        return tuple(
+            None if seconds is None else pd.Timestamp(seconds, unit='s', tz='UTC')
+            for seconds in (first, last)
+        )
+    
+    def iter_files(self, paths_or_glob: LogPaths, workers: Optional[int] = None,
+                   chunk_rows: Optional[int] = None,
+                   deferred_bots: bool = False,
+                   compact: bool = False,
+                   bots_only: bool = False,
+                   source: bool = False) -> Iterator[pd.DataFrame]:
+        """
+        Parse several logs (e.g. one per web node) as one time-ordered stream
+        
+        Files are ordered by their content time range (not by name, so
+        access.log.2.gz correctly precedes access.log.1), parsed, and
+        combined with merge_chunks, a streaming k-way merge on timestamp:
+        the combined stream is never sorted as a whole. Each file is
+        assumed to be in time order itself.
+        
+        Args:
+            paths_or_glob: Glob pattern, path, or list of paths and patterns
+            workers: Parse the files in this many processes. Each file is
+                then held in memory until merged; without workers files are
+                streamed chunk by chunk.
+            chunk_rows: Maximum number of rows read per file at a time
+                (defaults to CHUNK_ROWS)
+            deferred_bots: Classify distinct user agents once per chunk
+            compact: Convert each chunk to the compact schema
+            bots_only: Keep only bot rows (see parse_file)
+            source: Add a categorical 'source' column with each row's file path
+            
+        Yields:
+            DataFrames with parsed log data, in timestamp order
+            
+        Raises:
+            FileNotFoundError: If a glob pattern matches no file
+        """
+        paths = _resolve_log_paths(paths_or_glob)
+        chunk_rows = chunk_rows or self.CHUNK_ROWS
+        
+        bounds = {path: self.file_time_range(path) for path in paths}
+        
+        def time_order(path: str) -> Tuple[int, int, int]:
+            first, last = bounds[path]
+            if first is None:
+                return (0, 0, 0)
+            return (1, first.value, (last or first).value)
+        
+        paths.sort(key=time_order)
+        starts = [None if bounds[path][0] is None else bounds[path][0].value for path in paths]
+        sources = pd.Index(paths)
+        codes = range(len(paths)) if source else [None] * len(paths)
+        
+        if workers and workers > 1 and len(paths) > 1:
+            with futures.ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+                parsed = [
+                    executor.submit(_parse_whole_file, self, path, deferred_bots, compact, bots_only)
+                    for path in paths
+                ]
+                yield from merge_chunks([
+                    (start, _result_chunks(future, code, sources, chunk_rows))
+                    for start, future, code in zip(starts, parsed, codes)
+                ])
+            return
+        
+        def file_chunks(path: str, code: Optional[int]) -> Iterator[pd.DataFrame]:
+            for chunk in self.iter_chunks(
+                path, chunk_rows, deferred_bots=deferred_bots, compact=compact,
+                bots_only=bots_only
+            ):
+                yield chunk if code is None else _tag_source(chunk, code, sources)
+        
+        yield from merge_chunks([
+            (start, file_chunks(path, code)) for start, path, code in zip(starts, paths, codes)
+        ])
+    
+    def parse_files(self, paths_or_glob: LogPaths, workers: Optional[int] = None,
+                    deferred_bots: bool = False,
+                    compact: bool = False,
+                    bots_only: bool = False,
+                    source: bool = False) -> pd.DataFrame:
+        """
+        Parse several logs into one DataFrame ordered by timestamp
+        
+        See iter_files. Unlike parse_file with a list of paths, which reads
+        the files back to back, rows from different files are interleaved
+        by time.
+        
+        Args:
+            paths_or_glob: Glob pattern (e.g. 'logs/web*/access.log*'), path,
+                or list of paths and patterns
+            workers: Parse the files in this many processes
+            deferred_bots: Classify distinct user agents once per chunk
+            compact: Return the compact schema
+            bots_only: Return only bot rows (see parse_file)
+            source: Add a categorical 'source' column with each row's file path
+            
+        Returns:
+            DataFrame with parsed log data
+        """
+        return concat_frames(self.iter_files(
+            paths_or_glob, workers, deferred_bots=deferred_bots, compact=compact,
+            bots_only=bots_only, source=source
+        ))
+    
+    @staticmethod
+    def _select_bots(df: pd.DataFrame, bots_only: bool) -> pd.DataFrame:
+        """Keep bot rows, recording the request count in df.attrs['total_requests']"""
+        if not bots_only:
+            return df
+        total_requests = len(df)
         if not df.empty:
-            df['date'] = df['timestamp'].dt.date
-            df['hour'] = df['timestamp'].dt.hour
-            df['is_html'] = df['path'].str.endswith(('.html', '.htm', '/'))
-            df['file_extension'] = df['path'].str.extract(r'\.([a-z0-9]+)$')[0]
+            df = df[df['is_bot']].reset_index(drop=True)
+        df.attrs['total_requests'] = total_requests
+        return df
+    
+    def parse_string(self, log_string: str, deferred_bots: bool = False,
+                     compact: bool = False, bots_only: bool = False) -> pd.DataFrame:
+        """
+        Parse log data from string (useful for testing)
+        
+        Args:
+            log_string: Multi-line string of log entries
+            deferred_bots: Classify distinct user agents once after parsing
+            compact: Return the compact schema
+            bots_only: Return only bot rows (see parse_file)
             
+        Returns:
+            DataFrame with parsed log data
+        """
+        builder = self._new_builder(deferred_bots, bots_only)
+        skipped = [0] if bots_only else None
+        
+        for values in self._scan_lines(log_string.strip().split('\n'), skipped=skipped):
+            builder.append(values)
+        
+        df = self._to_dataframe(builder, deferred_bots, compact, bots_only)
+        if bots_only:
+            df.attrs['total_requests'] += skipped[0]
         return df
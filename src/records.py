@@ -0,0 +1,254 @@
+"""
+Log Records
+Streaming parser yielding compact record objects, without pandas
+"""
+
+import io
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import IO, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from .classifier import SEO_BOT_PATTERNS, BotClassifier
+from .compression import open_log
+from .logformat import COMBINED_CONVERTERS, COMBINED_PATTERN, Converter, compile_log_format
+
+
+TIMESTAMP_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+NAIVE_TIMESTAMP_FORMAT = '%d/%b/%Y:%H:%M:%S'
+
+# A log file path, '-' for stdin, an open text or binary stream, or lines
+RecordSource = Union[str, os.PathLike, IO, Iterable[str]]
+
+# Fields whose values repeat enough to share one string per distinct value
+SHARED_FIELDS = ('method', 'referer', 'user_agent')
+
+# Distinct shared values remembered before the table is reset
+SHARED_LIMIT = 100000
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(raw: str) -> Optional[datetime]:
+    """
+    Parse a single log timestamp, memoized for repeated seconds
+    
+    Args:
+        raw: Timestamp string as found in the log
+    
+    Returns:
+        datetime (tz-aware when the log has an offset) or None
+    """
+    try:
+        return datetime.strptime(raw, TIMESTAMP_FORMAT)
+    except ValueError:
+        pass
+    
+    # Fallback for logs without timezone
+    try:
+        return datetime.strptime(raw.split()[0], NAIVE_TIMESTAMP_FORMAT)
+    except (ValueError, IndexError):
+        pass
+    
+    # nginx $time_iso8601
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+class LogRecord:
+    """
+    One parsed request
+    
+    A __slots__ object instead of a dict: no per-record hash table, and
+    timestamps are shared datetime objects from the memoized parser, so a
+    record costs little more than its field strings. Fields a custom log
+    format captures beyond the Combined ones are kept in `extra`.
+    """
+    
+    __slots__ = (
+        'ip', 'timestamp', 'method', 'path', 'status', 'bytes',
+        'referer', 'user_agent', 'bot_type', 'extra',
+    )
+    
+    def __init__(self, ip: Optional[str], timestamp: datetime, method: Optional[str],
+                 path: str, status: Optional[int], bytes: Optional[int],
+                 referer: Optional[str], user_agent: str, bot_type: Optional[str] = None,
+                 extra: Optional[Dict] = None):
+        self.ip = ip
+        self.timestamp = timestamp
+        self.method = method
+        self.path = path
+        self.status = status
+        self.bytes = bytes
+        self.referer = referer
+        self.user_agent = user_agent
+        self.bot_type = bot_type
+        self.extra = extra
+    
+    @property
+    def is_bot(self) -> bool:
+        return self.bot_type is not None
+    
+    def to_dict(self) -> Dict:
+        """Fields as a dict shaped like ApacheLogParser.parse_line output"""
+        data = {name: getattr(self, name) for name in self.__slots__[:-1]}
+        data['is_bot'] = self.is_bot
+        if self.extra:
+            data.update(self.extra)
+        return data
+    
+    def __repr__(self) -> str:
+        return (f"LogRecord({self.timestamp.isoformat()} {self.method} {self.path} "
+                f"{self.status} bot={self.bot_type})")
+
+
+# Record fields filled from log format groups (all but bot_type and extra)
+_RECORD_FIELDS = LogRecord.__slots__[:8]
+
+
+def build_records(rows: Iterable[Tuple[str, ...]], fields: Sequence[str],
+                  converters: Dict[str, Converter],
+                  classify: Optional[Callable[[str], Optional[str]]] = None) -> Iterator[LogRecord]:
+    """
+    Turn field tuples of a log pattern into LogRecords
+    
+    Args:
+        rows: Field values in `fields` order (e.g. match.groups())
+        fields: Group names of the log pattern
+        converters: Numeric field converters
+        classify: User agent -> bot type (None skips bot detection)
+    
+    Yields:
+        LogRecord for every row with a parseable timestamp
+    """
+    fields = list(fields)
+    
+    # Records that are kept share one string object per distinct value
+    # of the SHARED_FIELDS
+    shared: Dict[str, str] = {}
+    share = shared.setdefault
+    
+    if fields == list(_RECORD_FIELDS) and set(converters) == {'status', 'bytes'}:
+        # Stock Combined groups are already in LogRecord argument order
+        to_status, to_bytes = converters['status'][1], converters['bytes'][1]
+        for ip, raw, method, path, status, size, referer, user_agent in rows:
+            timestamp = _parse_timestamp(raw)
+            if timestamp is None:
+                continue
+            if len(shared) > SHARED_LIMIT:
+                shared.clear()
+            user_agent = share(user_agent, user_agent)
+            yield LogRecord(
+                ip, timestamp, share(method, method), path, to_status(status), to_bytes(size),
+                share(referer, referer), user_agent,
+                classify(user_agent) if classify is not None else None
+            )
+        return
+    
+    convert = [(fields.index(name), func) for name, (_, func) in converters.items()]
+    shared_at = [i for i, name in enumerate(fields) if name in SHARED_FIELDS]
+    timestamp_at = fields.index('timestamp')
+    user_agent_at = fields.index('user_agent')
+    positions = [fields.index(name) if name in fields else None for name in _RECORD_FIELDS]
+    extras = [(i, name) for i, name in enumerate(fields) if name not in _RECORD_FIELDS]
+    
+    for values in rows:
+        timestamp = _parse_timestamp(values[timestamp_at])
+        if timestamp is None:
+            continue
+        
+        if len(shared) > SHARED_LIMIT:
+            shared.clear()
+        values = list(values)
+        values[timestamp_at] = timestamp
+        for i in shared_at:
+            values[i] = share(values[i], values[i])
+        for i, func in convert:
+            values[i] = func(values[i])
+        bot_type = classify(values[user_agent_at]) if classify is not None else None
+        
+        yield LogRecord(
+            *[values[i] if i is not None else None for i in positions],
+            bot_type,
+            {name: values[i] for i, name in extras} or None
+        )
+
+
+@contextmanager
+def open_lines(source: RecordSource) -> Iterator[Iterable[str]]:
+    """
+    Lines of a record source
+    
+    Paths are opened with compression.open_log (gzip, bzip2, xz and zstd
+    are decompressed transparently); '-' reads stdin. Binary streams are
+    decoded as UTF-8, ignoring errors, and are left open for the caller.
+    
+    Args:
+        source: Path, '-', text or binary stream, or iterable of lines
+    
+    Yields:
+        Iterable of text lines
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if source == '-':
+            yield sys.stdin
+            return
+        with open_log(source) as f:
+            yield f
+        return
+    
+    if hasattr(source, 'read') and not isinstance(source, io.TextIOBase):
+        text = io.TextIOWrapper(source, encoding='utf-8', errors='ignore')
+        try:
+            yield text
+        finally:
+            # Do not close the caller's stream with the wrapper
+            text.detach()
+        return
+    
+    yield source
+
+
+def iter_records(source: RecordSource, log_format: Optional[str] = None,
+                 bot_patterns: Optional[Dict[str, str]] = None,
+                 strict_bots: bool = False,
+                 identify_bots: bool = True) -> Iterator[LogRecord]:
+    """
+    Parse a log into LogRecords one line at a time
+    
+    Needs neither pandas nor numpy, for log shippers and other processes
+    that only forward records. ApacheLogParser.iter_records is the same
+    with the parser's pattern and bot classifier.
+    
+    Args:
+        source: Log path (plain or compressed), '-' for stdin, an open text
+            or binary stream, or an iterable of lines
+        log_format: Apache LogFormat or nginx log_format string (defaults
+            to Combined, matched with the same pattern as ApacheLogParser)
+        bot_patterns: Ordered bot name -> pattern mapping (defaults to
+            classifier.SEO_BOT_PATTERNS)
+        strict_bots: Classify bots by most specific pattern
+        identify_bots: Fill in bot_type
+    
+    Yields:
+        LogRecord for every matching line, in file order
+    """
+    pattern, converters = COMBINED_PATTERN, COMBINED_CONVERTERS
+    if log_format is not None:
+        compiled = compile_log_format(log_format)
+        pattern, converters = compiled.pattern, compiled.converters
+    
+    classify = None
+    if identify_bots:
+        classify = BotClassifier(bot_patterns or SEO_BOT_PATTERNS, strict=strict_bots).classify
+    
+    match_line = pattern.match
+    with open_lines(source) as lines:
+        rows = (
+            match.groups() for match in (match_line(line.strip()) for line in lines)
+            if match
+        )
+        yield from build_records(rows, pattern.groupindex, converters, classify)
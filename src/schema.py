@@ -0,0 +1,80 @@
+"""
+Compact Column Schema
+Memory-lean dtypes for parsed log DataFrames
+"""
+
+from __future__ import annotations
+
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+# Text columns with few distinct values relative to rows
+CATEGORY_COLUMNS = ['ip', 'method', 'user_agent', 'bot_type', 'file_extension']
+
+# Text columns that are mostly distinct per row
+STRING_COLUMNS = ['path', 'referer']
+
+
+def _string_dtype():
+    """
+    Arrow-backed strings if pyarrow is installed, categorical otherwise
+    
+    Without pyarrow there is no compact string storage in pandas, and
+    dictionary encoding still pays off because paths and referers repeat.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'category'
+    return pd.StringDtype('pyarrow')
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a parsed log DataFrame to the compact schema
+    
+    - ip, method, user_agent, bot_type, file_extension: category
+    - path, referer: string[pyarrow] (category without pyarrow)
+    - status: int16
+    - bytes: uint32, or int64 if any response exceeds 4 GiB
+    - date: datetime64[s] at midnight instead of datetime.date objects
+    - hour: int8
+    
+    Columns that are missing or already converted are left alone, so the
+    function is safe to apply to chunks and to concatenated frames.
+    
+    Args:
+        df: DataFrame from ApacheLogParser
+    
+    Returns:
+        The same DataFrame, converted in place
+    """
+    if df.empty:
+        return df
+    
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    
+    string_dtype = _string_dtype()
+    for column in STRING_COLUMNS:
+        if column in df.columns and df[column].dtype != string_dtype:
+            df[column] = df[column].astype(string_dtype)
+    
+    if 'status' in df.columns:
+        df['status'] = df['status'].astype(np.int16)
+    
+    if 'bytes' in df.columns:
+        fits = df['bytes'].max() <= np.iinfo(np.uint32).max
+        df['bytes'] = df['bytes'].astype(np.uint32 if fits else np.int64)
+    
+    if 'date' in df.columns and df['date'].dtype == object:
+        df['date'] = pd.to_datetime(df['date']).astype('datetime64[s]')
+    
+    if 'hour' in df.columns:
+        df['hour'] = df['hour'].astype(np.int8)
+    
+    return df
@@ -0,0 +1,347 @@
+"""
+Sketches
+Mergeable approximate summaries of values too numerous to keep
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional, Tuple
+
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+# Registers per sketch are 2 ** precision; the relative standard error of
+# a count is about 1.04 / sqrt(2 ** precision) (0.8% at 14, 16 KiB)
+DEFAULT_PRECISION = 14
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+# Counters per Space-Saving summary: about 1 MB of path counters, keys
+# occurring more than total / DEFAULT_COUNTERS times are never missed
+DEFAULT_COUNTERS = 10000
+
+
+def check_precision(precision: int):
+    """Raise ValueError for a precision outside MIN_PRECISION..MAX_PRECISION"""
+    if not MIN_PRECISION <= precision <= MAX_PRECISION:
+        raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}, got {precision}")
+
+
+def hash_values(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    64-bit hashes of values, equal for equal values in any process
+    
+    pandas' hash_array uses a fixed key, so sketches built by different
+    workers or runs can be merged. Categoricals are hashed once per
+    category.
+    
+    Args:
+        values: Series or array of values
+    
+    Returns:
+        uint64 hashes of the present values, and the mask of present values
+    """
+    values = pd.Series(values)
+    present = values.notna().to_numpy()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = np.asarray(values.cat.categories, dtype=object)
+        hashes = pd.util.hash_array(categories)
+        return hashes[values.cat.codes.to_numpy()[present]], present
+    return pd.util.hash_array(np.asarray(values[present], dtype=object)), present
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """int.bit_length() of every uint64 value, exactly (no float log2)"""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        wide = values >= np.uint64(1 << shift)
+        length[wide] += shift
+        values[wide] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+def register_updates(hashes: np.ndarray, precision: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Register index and rank of every hash
+    
+    The first precision bits pick the register; the rank is the position
+    of the first 1 bit among the remaining ones.
+    
+    Returns:
+        (index, rank) arrays
+    """
+    width = 64 - precision
+    index = (hashes >> np.uint64(width)).astype(np.int64)
+    rest = hashes & np.uint64((1 << width) - 1)
+    rank = (width + 1 - _bit_length(rest)).astype(np.uint8)
+    return index, rank
+
+
+def estimate(registers: np.ndarray) -> np.ndarray:
+    """
+    HyperLogLog cardinality estimates of the sketches along the last axis
+    
+    Uses linear counting for small cardinalities, where the raw estimate
+    is biased. 64-bit hashes need no large-range correction.
+    
+    Args:
+        registers: uint8 array of shape (..., 2 ** precision)
+    
+    Returns:
+        float64 estimates of shape registers.shape[:-1]
+    """
+    m = registers.shape[-1]
+    alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+    raw = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=-1)
+    zeros = (registers == 0).sum(axis=-1)
+    
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / zeros)
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+def grouped_registers(group_ids: np.ndarray, groups: int, hashes: np.ndarray,
+                      precision: int) -> np.ndarray:
+    """
+    Registers of one sketch per group, built in a single vectorized pass
+    
+    Args:
+        group_ids: Group of every hash, 0 .. groups - 1
+        groups: Number of groups
+        hashes: uint64 hashes of the values (see hash_values)
+        precision: Sketch precision
+    
+    Returns:
+        uint8 array of shape (groups, 2 ** precision)
+    """
+    index, rank = register_updates(hashes, precision)
+    registers = np.zeros((groups, 1 << precision), dtype=np.uint8)
+    np.maximum.at(registers, (group_ids, index), rank)
+    return registers
+
+
+def merge_registers(group_ids: np.ndarray, groups: int, registers: np.ndarray) -> np.ndarray:
+    """
+    Merge rows of sketch registers by group (register-wise maximum)
+    
+    Args:
+        group_ids: Group of every row of registers, 0 .. groups - 1, each
+            group present at least once
+        groups: Number of groups
+        registers: uint8 array of shape (rows, 2 ** precision)
+    
+    Returns:
+        uint8 array of shape (groups, 2 ** precision)
+    """
+    order = np.argsort(group_ids, kind='stable')
+    starts = np.searchsorted(group_ids[order], np.arange(groups))
+    return np.maximum.reduceat(registers[order], starts, axis=0)
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count in fixed memory (HyperLogLog)
+    
+    A sketch holds 2 ** precision one-byte registers whatever the number
+    of values added. Sketches of the same precision merge by taking the
+    register-wise maximum, which gives exactly the sketch of all their
+    values together, so chunks, days or workers can be counted apart and
+    combined in any order.
+    
+    Attributes:
+        precision: Number of index bits
+        registers: uint8 array of 2 ** precision registers
+    """
+    
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[np.ndarray] = None):
+        """
+        Args:
+            precision: Number of index bits, MIN_PRECISION to MAX_PRECISION
+            registers: Registers of an existing sketch (default: empty)
+        """
+        check_precision(precision)
+        self.precision = precision
+        if registers is None:
+            registers = np.zeros(1 << precision, dtype=np.uint8)
+        elif len(registers) != 1 << precision:
+            raise ValueError(f"expected {1 << precision} registers, got {len(registers)}")
+        self.registers = registers
+    
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of count()"""
+        return 1.04 / np.sqrt(1 << self.precision)
+    
+    def add(self, values) -> HyperLogLog:
+        """
+        Add values (missing ones are skipped)
+        
+        Args:
+            values: Series or array of values
+        
+        Returns:
+            self
+        """
+        hashes, _ = hash_values(values)
+        index, rank = register_updates(hashes, self.precision)
+        np.maximum.at(self.registers, index, rank)
+        return self
+    
+    def merge(self, other: HyperLogLog) -> HyperLogLog:
+        """
+        Add the values of another sketch of the same precision
+        
+        Returns:
+            self
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"cannot merge sketches of precision {self.precision} and {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+    
+    @classmethod
+    def union(cls, sketches: Iterable[HyperLogLog], precision: int = DEFAULT_PRECISION) -> HyperLogLog:
+        """
+        New sketch of the values of all sketches
+        
+        Args:
+            sketches: Sketches of the same precision
+            precision: Precision of the result when sketches is empty
+        """
+        sketches = list(sketches)
+        merged = cls(sketches[0].precision if sketches else precision)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+    
+    def count(self) -> int:
+        """Estimated number of distinct values added"""
+        return int(round(float(estimate(self.registers))))
+
+
+def _without_unused_keys(counters: pd.DataFrame) -> pd.DataFrame:
+    """Drop the key values of removed counters still held by MultiIndex levels"""
+    if isinstance(counters.index, pd.MultiIndex):
+        counters = counters.set_axis(counters.index.remove_unused_levels())
+    return counters
+
+
+class SpaceSaving:
+    """
+    Most frequent keys in a fixed number of counters (Space-Saving)
+    
+    Keeps at most capacity counters. Each estimated count is an upper
+    bound, overcounting the true count by at most its error, and a key
+    without a counter occurs at most floor times, which stays around
+    total / capacity or below. Every key occurring more than floor times
+    therefore has a counter, so top keys and keys over a threshold are
+    found in memory that does not grow with the number of distinct keys.
+    
+    Summaries merge (mergeable Space-Saving): a key missing from one
+    summary is counted at that summary's floor, both in count and error,
+    and the largest counters are kept. Extra measure columns (e.g. the
+    successful requests of a path) are summed along as lower bounds.
+    
+    Attributes:
+        capacity: Maximum number of counters
+        counters: DataFrame indexed by key with 'count', 'error' and the
+            extra measures, by descending count
+        total: Sum of all counts summarized
+        floor: Upper bound on the count of any key without a counter
+    """
+    
+    def __init__(self, capacity: int, counters: pd.DataFrame, total: int = 0, floor: int = 0):
+        """
+        Args:
+            capacity: Maximum number of counters
+            counters: Counters as in the counters attribute
+            total: Sum of all counts summarized
+            floor: Upper bound on the count of any key without a counter
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.counters = counters
+        self.total = total
+        self.floor = floor
+    
+    @classmethod
+    def from_counts(cls, counts: pd.DataFrame, capacity: int, total: Optional[int] = None) -> SpaceSaving:
+        """
+        Summary of exact counts, e.g. of one chunk
+        
+        Args:
+            counts: DataFrame indexed by key with a 'count' column and any
+                extra measures; the largest capacity + 1 counts suffice
+            capacity: Maximum number of counters
+            total: Sum of all counts (default: the sum of counts)
+                
+        Returns:
+            Summary of the capacity largest counts, with no error
+        """
+        counts = counts.sort_values('count', ascending=False, kind='stable')
+        floor = int(counts['count'].iloc[capacity]) if len(counts) > capacity else 0
+        counters = counts.iloc[:capacity].copy()
+        counters.insert(1, 'error', np.zeros(len(counters), dtype=np.int64))
+        total = int(counts['count'].sum()) if total is None else total
+        return cls(capacity, _without_unused_keys(counters), total, floor)
+    
+    @classmethod
+    def union(cls, summaries: Iterable[SpaceSaving]) -> SpaceSaving:
+        """
+        Summary of the keys of all summaries
+        
+        Args:
+            summaries: Summaries of the same keys and measures; the
+                capacity of the result is the largest of theirs
+        
+        Returns:
+            New summary
+        """
+        summaries = list(summaries)
+        keys = list(summaries[0].counters.index.names)
+        stacked = pd.concat([
+            summary.counters.reset_index().assign(floor=summary.floor) for summary in summaries
+        ], ignore_index=True)
+        
+        # A measure missing from a summary (e.g. a bot type it never saw)
+        # is 0 for all of its keys
+        measures = stacked.columns.difference([*keys, 'count', 'error', 'floor'], sort=False)
+        if stacked[measures].isna().any(axis=None):
+            stacked[measures] = stacked[measures].fillna(0).astype(np.int64)
+        
+        # A key missing from a summary counts as that summary's floor: add
+        # every floor, less those of the summaries that do count the key
+        merged = stacked.groupby(keys, sort=False, dropna=False).sum()
+        floors = sum(summary.floor for summary in summaries)
+        for column in ('count', 'error'):
+            merged[column] += floors - merged['floor']
+        merged = merged.drop(columns='floor').sort_values('count', ascending=False, kind='stable')
+        
+        capacity = max(summary.capacity for summary in summaries)
+        floor = floors
+        if len(merged) > capacity:
+            floor = max(floor, int(merged['count'].iloc[capacity]))
+        total = sum(summary.total for summary in summaries)
+        return cls(capacity, _without_unused_keys(merged.iloc[:capacity]), total, floor)
+    
+    def merge(self, other: SpaceSaving) -> SpaceSaving:
+        """New summary of the keys of both summaries"""
+        return SpaceSaving.union([self, other])
+    
+    def above(self, threshold: int) -> pd.DataFrame:
+        """
+        Counters whose estimated count exceeds threshold
+        
+        Complete when threshold >= floor: no key above it is missed. Keys
+        whose count - error also exceeds threshold are certain.
+        """
+        return self.counters[self.counters['count'] > threshold]
+    
+    def top(self, n: int) -> pd.DataFrame:
+        """The n counters with the largest estimated counts"""
+        return self.counters.head(n)
@@ -3,13 +3,18 @@ SEO Log Visualizer
 Creates visualizations for SEO log analysis
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
+from __future__ import annotations
+
 from typing import Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from .lazy import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+pd = lazy_import('pandas')
+
 
 class SEOLogVisualizer:
     """
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import write_log
+
+
+@pytest.fixture
+def access_log(tmp_path):
+    """Synthetic log of 20,000 lines spanning about 100 minutes"""
+    return write_log(str(tmp_path / 'access.log'), 20000, seed=1, unique_paths=500)
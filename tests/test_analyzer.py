@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from src.analyzer import SEOLogAnalyzer
+from src.parser import ApacheLogParser
+
+DAILY_COLUMNS = ['total_crawls', 'successful', 'errors_4xx', 'errors_5xx', 'unique_bots', 'total_bytes']
+
+
+@pytest.fixture
+def parsed_log(access_log):
+    return ApacheLogParser().parse_file(access_log)
+
+
+def test_daily_report_columns(parsed_log):
+    analyzer = SEOLogAnalyzer(parsed_log)
+    
+    assert list(analyzer.daily_crawl_report().columns) == DAILY_COLUMNS
+    assert list(analyzer.daily_crawl_report(by='bot_type').columns) == DAILY_COLUMNS
+    assert list(analyzer.daily_crawl_report(unique_paths=True).columns) == [*DAILY_COLUMNS, 'unique_paths']
+    assert list(SEOLogAnalyzer(parsed_log, approximate=True).daily_crawl_report().columns) == [
+        *DAILY_COLUMNS, 'unique_paths',
+    ]
+
+
+def test_daily_unique_paths(parsed_log):
+    report = SEOLogAnalyzer(parsed_log).daily_crawl_report(unique_paths=True)
+    bots = parsed_log[parsed_log['is_bot']]
+    
+    assert report['unique_paths'].tolist() == bots.groupby('date')['path'].nunique().tolist()
+
+
+def row_reports(bots):
+    """Reports computed directly from the bot rows, one groupby each"""
+    errors = bots[bots['status'] == 404]
+    return {
+        'bot_distribution': bots.groupby('bot_type').agg(
+            total_requests=('path', 'count'),
+            successful_requests=('status', lambda x: (x == 200).sum()),
+            total_bytes=('bytes', 'sum'),
+        ).assign(success_rate=lambda df: round(df['successful_requests'] / df['total_requests'] * 100, 2))
+        .sort_values('total_requests', ascending=False),
+        'crawl_frequency_by_path': bots.groupby('path').agg(
+            crawl_count=('timestamp', 'count'),
+            primary_bot=('bot_type', lambda x: x.value_counts().index[0]),
+            success_rate=('status', lambda x: (x == 200).sum() / len(x) * 100),
+        ).query('crawl_count >= 5').sort_values('crawl_count', ascending=False),
+        'time_series_analysis': bots.groupby('date').agg(
+            total_crawls=('path', 'count'),
+            successful_crawls=('status', lambda x: (x == 200).sum()),
+        ),
+        'get_error_pages': errors.groupby('path').agg(
+            error_count=('timestamp', 'count'),
+            bots_affected=('bot_type', lambda x: ', '.join(x.unique())),
+        ).sort_values('error_count', ascending=False),
+        'daily_crawl_report': bots.groupby('date').agg(
+            total_crawls=('path', 'count'),
+            successful=('status', lambda x: (x == 200).sum()),
+            errors_4xx=('status', lambda x: ((x >= 400) & (x < 500)).sum()),
+            errors_5xx=('status', lambda x: ((x >= 500) & (x < 600)).sum()),
+            unique_bots=('bot_type', 'nunique'),
+            total_bytes=('bytes', 'sum'),
+        ),
+    }
+
+
+def test_reports_match_row_computation(parsed_log):
+    analyzer = SEOLogAnalyzer(parsed_log)
+    bots = parsed_log[parsed_log['is_bot']]
+    
+    for report, expected in row_reports(bots).items():
+        pd.testing.assert_frame_equal(getattr(analyzer, report)(), expected, check_dtype=False)
+    
+    counts = bots['path'].value_counts()
+    assert analyzer.identify_crawl_traps(3) == counts[counts > 3].index.tolist()
+    assert analyzer.crawl_budget_summary()['unique_pages_crawled'] == bots['path'].nunique()
@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.cache import ParsedLogCache
+from src.parser import ApacheLogParser
+
+
+class ExampleBotParser(ApacheLogParser):
+    BOT_PATTERNS = {**ApacheLogParser.BOT_PATTERNS, 'examplebot': r'ExampleBot'}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParsedLogCache(str(tmp_path / 'cache'))
+
+
+def entries(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(cache.SUFFIX))
+
+
+@pytest.mark.parametrize('options', [{}, {'compact': True}, {'bots_only': True}])
+def test_hit_returns_parsed_frame(cache, access_log, options):
+    parser = ApacheLogParser(cache=cache)
+    
+    parsed = parser.parse_file(access_log, **options)
+    assert (cache.hits, cache.misses) == (0, 1)
+    
+    cached = parser.parse_file(access_log, **options)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Parquet has no second-resolution timestamps: compact dates come back in ms
+    pd.testing.assert_frame_equal(cached, parsed, check_dtype=not options.get('compact'))
+    assert cached.attrs == parsed.attrs
+    if options.get('bots_only'):
+        assert cached.attrs['total_requests'] == 20000
+
+
+def test_key_follows_file_and_options(cache, access_log):
+    parser = ApacheLogParser(cache=cache)
+    settings = parser.cache_settings()
+    key = cache.key([access_log], settings, {'compact': False})
+    
+    assert cache.key([access_log], settings, {'compact': False}) == key
+    assert cache.key([access_log], settings, {'compact': True}) != key
+    
+    stat = os.stat(access_log)
+    os.utime(access_log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    touched = cache.key([access_log], settings, {'compact': False})
+    assert touched != key
+    
+    with open(access_log, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    os.utime(access_log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.key([access_log], settings, {'compact': False}) not in (key, touched)
+
+
+def test_changed_file_is_a_miss(cache, access_log):
+    parser = ApacheLogParser(cache=cache)
+    before = parser.parse_file(access_log)
+    
+    with open(access_log, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+    with open(access_log, 'a', encoding='utf-8') as f:
+        f.write(first_line)
+    
+    after = parser.parse_file(access_log)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(after) == len(before) + 1
+
+
+def test_prune_after_bot_pattern_change(cache, access_log):
+    ApacheLogParser(cache=cache).parse_file(access_log)
+    
+    changed = ExampleBotParser(cache=cache)
+    assert changed.cache_settings() != ApacheLogParser().cache_settings()
+    
+    changed.parse_file(access_log)
+    assert cache.misses == 2
+    assert len(entries(cache)) == 2
+    
+    assert cache.prune(changed.cache_settings()) == 1
+    assert len(entries(cache)) == 1
+    changed.parse_file(access_log)
+    assert cache.hits == 1
+
+
+def test_evicts_least_recently_used(cache, access_log):
+    parser = ApacheLogParser(cache=cache)
+    parser.parse_file(access_log)
+    (first,) = entries(cache)
+    parser.parse_file(access_log, compact=True)
+    (compact,) = set(entries(cache)) - {first}
+    
+    # Reading the first entry again makes the compact one least recently used
+    os.utime(os.path.join(cache.cache_dir, first), ns=(0, 0))
+    os.utime(os.path.join(cache.cache_dir, compact), ns=(0, 10 ** 9))
+    parser.parse_file(access_log)
+    assert cache.hits == 1
+    
+    cache.max_bytes = os.path.getsize(os.path.join(cache.cache_dir, first))
+    cache.evict()
+    assert entries(cache) == [first]
@@ -0,0 +1,101 @@
+import bz2
+import gzip
+import lzma
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_log
+from src import compression
+from src.compression import detect_compression, iter_log_lines, open_log
+from src.parser import ApacheLogParser
+
+COMPRESSORS = {'gzip': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+
+
+def compressed_copy(filepath, name, suffix=None):
+    """Write filepath compressed with COMPRESSORS[name] next to it"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    target = f'{filepath}.{suffix or name}'
+    with open(target, 'wb') as f:
+        f.write(COMPRESSORS[name](data))
+    return target
+
+
+def read_text(filepath):
+    with open(filepath, encoding='utf-8') as f:
+        return f.read()
+
+
+def producer_threads():
+    return [thread for thread in threading.enumerate() if thread.name.endswith('(_produce)')]
+
+
+@pytest.fixture
+def plain_log(tmp_path):
+    return write_log(str(tmp_path / 'access.log'), 3000, seed=4, unique_paths=100)
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Decompress in many small blocks so the prefetch queue fills up"""
+    monkeypatch.setattr(compression, 'BLOCK_SIZE', 4096)
+
+
+@pytest.mark.parametrize('name', list(COMPRESSORS))
+def test_detects_magic_bytes_not_suffix(plain_log, name):
+    assert detect_compression(compressed_copy(plain_log, name)) == name
+    assert detect_compression(compressed_copy(plain_log, name, suffix='log')) == name
+    assert detect_compression(plain_log) is None
+
+
+def test_detects_zstd(tmp_path):
+    filepath = tmp_path / 'access.log.zst'
+    filepath.write_bytes(compression.MAGIC_BYTES['zstd'] + b'\x00' * 8)
+    
+    assert detect_compression(str(filepath)) == 'zstd'
+
+
+@pytest.mark.parametrize('name', list(COMPRESSORS))
+def test_open_log_streams_decompressed_text(plain_log, name, small_blocks):
+    with open_log(compressed_copy(plain_log, name), prefetch=2) as f:
+        assert f.read() == read_text(plain_log)
+
+
+@pytest.mark.parametrize('parallel', [1, 3])
+def test_iter_log_lines_reads_paths_in_order(tmp_path, plain_log, parallel, small_blocks):
+    paths = [compressed_copy(plain_log, 'bz2'), plain_log, compressed_copy(plain_log, 'gzip')]
+    
+    lines = list(iter_log_lines(paths, parallel=parallel, prefetch=2))
+    
+    assert ''.join(lines) == read_text(plain_log) * 3
+
+
+def test_producer_stops_when_consumer_closes_early(plain_log, small_blocks):
+    chunks = ApacheLogParser().iter_chunks(compressed_copy(plain_log, 'gzip'), chunk_rows=100)
+    next(chunks)
+    assert producer_threads()
+    
+    chunks.close()
+    deadline = time.monotonic() + 5
+    while producer_threads() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not producer_threads()
+
+
+@pytest.mark.parametrize('name', list(COMPRESSORS))
+@pytest.mark.parametrize('options', [{}, {'bots_only': True}])
+def test_compressed_parse_matches_plain(plain_log, name, options):
+    parser = ApacheLogParser()
+    expected = parser.parse_file(plain_log, **options)
+    compressed = compressed_copy(plain_log, name)
+    
+    pd.testing.assert_frame_equal(parser.parse_file(compressed, **options), expected)
+    
+    both = parser.parse_file([compressed, plain_log], **options)
+    assert len(both) == 2 * len(expected)
+    if options:
+        assert both.attrs['total_requests'] == 2 * expected.attrs['total_requests']
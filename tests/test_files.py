@@ -0,0 +1,71 @@
+import gzip
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_log
+from src.parser import ApacheLogParser, concat_frames
+
+
+@pytest.fixture
+def node_logs(tmp_path):
+    """Overlapping logs of three web nodes, one of them gzipped"""
+    paths = [
+        write_log(str(tmp_path / 'web1.log'), 3000, seed=1, unique_paths=200),
+        write_log(str(tmp_path / 'web2.log'), 1200, seed=2, unique_paths=200),
+    ]
+    plain = write_log(str(tmp_path / 'web3.log'), 2000, seed=3)
+    with open(plain, 'rb') as f, gzip.open(f'{plain}.gz', 'wb') as out:
+        shutil.copyfileobj(f, out)
+    os.remove(plain)
+    return [*paths, f'{plain}.gz']
+
+
+def sorted_rows(df):
+    df = df.astype(str)
+    return df.sort_values(list(df.columns), kind='stable').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+@pytest.mark.parametrize('options', [{}, {'deferred_bots': True}, {'compact': True}])
+def test_iter_files_merges_by_time(node_logs, options, workers):
+    parser = ApacheLogParser()
+    chunks = list(parser.iter_files(node_logs, workers=workers, chunk_rows=500, source=True, **options))
+    df = concat_frames(chunks)
+    
+    assert pd.concat([chunk['timestamp'] for chunk in chunks]).is_monotonic_increasing
+    
+    files = {path: parser.parse_file(path, **options) for path in node_logs}
+    expected = pd.concat(files.values(), ignore_index=True)
+    pd.testing.assert_frame_equal(sorted_rows(df.drop(columns='source')), sorted_rows(expected))
+    
+    assert set(df['source'].cat.categories) == set(node_logs)
+    assert df['source'].value_counts().to_dict() == {path: len(rows) for path, rows in files.items()}
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_bots_only_counts_every_request(node_logs, workers):
+    parser = ApacheLogParser()
+    everything = parser.parse_files(node_logs)
+    
+    chunks = list(parser.iter_files(node_logs, workers=workers, chunk_rows=500, bots_only=True))
+    assert sum(chunk.attrs.get('total_requests', 0) for chunk in chunks) == len(everything)
+    
+    df = parser.parse_files(node_logs, workers=workers, bots_only=True)
+    assert df.attrs['total_requests'] == len(everything)
+    assert df['timestamp'].is_monotonic_increasing
+    pd.testing.assert_frame_equal(
+        sorted_rows(df), sorted_rows(everything[everything['is_bot']].reset_index(drop=True))
+    )
+
+
+def test_glob_orders_files_by_content(tmp_path, node_logs):
+    parser = ApacheLogParser()
+    
+    by_glob = parser.parse_files(str(tmp_path / 'web*'))
+    by_list = parser.parse_files(node_logs[::-1])
+    
+    pd.testing.assert_frame_equal(by_glob, by_list)
+    assert len(by_glob) == 3000 + 1200 + 2000
@@ -0,0 +1,71 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.logformat import APACHE_COMBINED, NGINX_COMBINED, compile_log_format
+from src.parser import ApacheLogParser
+
+NGINX_LINE = ('2001:db8::1 - alice [01/Dec/2024:10:00:00 +0100] "GET /a.html HTTP/2.0" 200 512 '
+              '"https://example.com/" "Googlebot/2.1" 0.250')
+
+
+@pytest.mark.parametrize('log_format', [APACHE_COMBINED, NGINX_COMBINED])
+def test_combined_formats_match_stock_pattern(access_log, log_format):
+    expected = ApacheLogParser().parse_file(access_log)
+    df = ApacheLogParser(log_format=log_format).parse_file(access_log)
+    
+    pd.testing.assert_frame_equal(df[expected.columns], expected)
+
+
+def test_nginx_request_time():
+    row = ApacheLogParser(log_format=NGINX_COMBINED + ' $request_time').parse_string(NGINX_LINE).iloc[0]
+    
+    assert row['ip'] == '2001:db8::1'
+    assert row['user'] == 'alice'
+    assert row['timestamp'] == pd.Timestamp('2024-12-01 09:00:00', tz='UTC')
+    assert (row['path'], row['protocol'], row['status'], row['bytes']) == ('/a.html', 'HTTP/2.0', 200, 512)
+    assert row['referer'] == 'https://example.com/'
+    assert row['response_time'] == 0.25
+    assert row['is_bot']
+
+
+def test_apache_ipv6_ident_user_and_microseconds():
+    parser = ApacheLogParser(log_format=APACHE_COMBINED.replace('%h', '%a') + ' %D')
+    record = parser.parse_line(
+        '::1 ident42 bob [01/Dec/2024:10:00:00 +0000] "GET /b HTTP/1.1" 404 - "-" "bingbot/2.0" 1500000'
+    )
+    
+    assert (record['ip'], record['ident'], record['user']) == ('::1', 'ident42', 'bob')
+    assert (record['status'], record['bytes']) == (404, 0)
+    assert record['response_time'] == 1.5
+    assert record['bot_type'] is not None
+
+
+def test_time_iso8601():
+    parser = ApacheLogParser(log_format='$remote_addr [$time_iso8601] "$request" $status "$http_user_agent"')
+    record = parser.parse_line('10.0.0.1 [2024-12-01T10:00:00+02:00] "GET /c HTTP/1.1" 200 "YandexBot/3.0"')
+    
+    assert record['timestamp'] == datetime.datetime(2024, 12, 1, 8, tzinfo=datetime.timezone.utc)
+    assert record['status'] == 200
+
+
+def test_duplicate_fields_captured_once():
+    compiled = compile_log_format('%h %h %t "%r" %>s "%{User-Agent}i" "%r"')
+    
+    assert compiled.fields == ['ip', 'timestamp', 'method', 'path', 'protocol', 'status', 'user_agent']
+    match = compiled.pattern.match(
+        '10.0.0.1 10.0.0.2 [01/Dec/2024:10:00:00 +0000] "GET /d HTTP/1.1" 200 "bingbot" "POST /e HTTP/1.0"'
+    )
+    assert (match['ip'], match['path']) == ('10.0.0.1', '/d')
+
+
+@pytest.mark.parametrize('log_format', ['%h %t "%r" %>s %Z', '%h %t "%r" %>s %{X}e'])
+def test_unsupported_directive(log_format):
+    with pytest.raises(ValueError, match='Unsupported'):
+        compile_log_format(log_format)
+
+
+def test_missing_required_fields():
+    with pytest.raises(ValueError, match='user_agent'):
+        ApacheLogParser(log_format='%h %t "%r" %>s %b')
@@ -0,0 +1,89 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.parser import ApacheLogParser, concat_frames
+
+OFFSET_LOG = '''\
+66.249.66.1 - - [01/Dec/2024:23:30:00 -0500] "GET / HTTP/1.1" 200 512 "-" "Googlebot/2.1"
+66.249.66.1 - - [02/Dec/2024:00:30:00 +0200] "GET /a.html HTTP/1.1" 404 0 "-" "Mozilla/5.0"
+66.249.66.1 - - [02/Dec/2024:01:30:00] "GET /b.html HTTP/1.1" 200 64 "-" "bingbot/2.0"'''
+
+
+@pytest.mark.parametrize('options', [{}, {'deferred_bots': True}, {'compact': True}])
+def test_date_and_hour_follow_logged_offset(options):
+    df = ApacheLogParser().parse_string(OFFSET_LOG, **options)
+    
+    assert [str(timestamp) for timestamp in df['timestamp']] == [
+        '2024-12-02 04:30:00+00:00', '2024-12-01 22:30:00+00:00', '2024-12-02 01:30:00+00:00',
+    ]
+    assert list(df['hour']) == [23, 0, 1]
+    dates = [datetime.date(2024, 12, 1), datetime.date(2024, 12, 2), datetime.date(2024, 12, 2)]
+    assert [value.date() if options.get('compact') else value for value in df['date']] == dates
+
+
+def test_status_dtype():
+    parser = ApacheLogParser()
+    
+    assert parser.parse_string(OFFSET_LOG)['status'].dtype == 'int64'
+    assert parser.parse_string(OFFSET_LOG, deferred_bots=True)['status'].dtype == 'int64'
+    assert parser.parse_string(OFFSET_LOG, compact=True)['status'].dtype == 'int16'
+
+
+@pytest.mark.parametrize('options', [{}, {'compact': True}, {'bots_only': True}])
+def test_concat_frames_leaves_chunks_unchanged(access_log, options):
+    chunks = list(ApacheLogParser().iter_chunks(access_log, chunk_rows=3000, **options))
+    before = [(chunk.copy(), dict(chunk.attrs)) for chunk in chunks]
+    
+    df = concat_frames(chunks)
+    
+    assert len(df) == sum(len(chunk) for chunk in chunks)
+    for chunk, (frame, attrs) in zip(chunks, before):
+        pd.testing.assert_frame_equal(chunk, frame)
+        assert chunk.attrs == attrs
+    concat_frames(chunks[:1]).attrs['total_requests'] = -1
+    assert chunks[0].attrs == before[0][1]
+
+
+def test_bots_only_counts_requests_only(access_log):
+    with open(access_log, 'a', encoding='utf-8') as f:
+        f.write('\n\ngarbage line\n"half" quoted [line]\n')
+    parser = ApacheLogParser()
+    everything = parser.parse_file(access_log)
+    
+    for engine in ('text', 'mmap'):
+        bots = parser.parse_file(access_log, bots_only=True, engine=engine)
+        assert bots.attrs['total_requests'] == len(everything)
+        assert len(bots) == everything['is_bot'].sum()
+
+
+@pytest.mark.parametrize('options', [{}, {'compact': True}, {'deferred_bots': True}, {'bots_only': True}])
+@pytest.mark.parametrize('workers', [2, 3])
+def test_workers_match_single_process(access_log, options, workers):
+    parser = ApacheLogParser()
+    expected = parser.parse_file(access_log, **options)
+    df = parser.parse_file(access_log, workers=workers, **options)
+    
+    pd.testing.assert_frame_equal(df, expected)
+    assert df.attrs == expected.attrs
+
+
+@pytest.mark.parametrize('limit', [None, 1234])
+def test_workers_with_path_list(access_log, limit):
+    parser = ApacheLogParser()
+    expected = parser.parse_file(access_log, limit=limit)
+    
+    pd.testing.assert_frame_equal(parser.parse_file([access_log], limit=limit, workers=2), expected)
+    pd.testing.assert_frame_equal(parser.parse_file(access_log, limit=limit, workers=2), expected)
+
+
+@pytest.mark.parametrize('options', [{}, {'compact': True}, {'deferred_bots': True}, {'bots_only': True}])
+@pytest.mark.parametrize('workers', [None, 3])
+def test_mmap_matches_text_engine(access_log, options, workers):
+    parser = ApacheLogParser()
+    expected = parser.parse_file(access_log, **options)
+    df = parser.parse_file(access_log, engine='mmap', workers=workers, **options)
+    
+    pd.testing.assert_frame_equal(df, expected)
+    assert df.attrs == expected.attrs
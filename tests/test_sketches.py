@@ -0,0 +1,155 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import USER_AGENTS
+from src.aggregates import ERROR_STATUS
+from src.analyzer import SEOLogAnalyzer
+from src.parser import ApacheLogParser
+from src.sketches import HyperLogLog, SpaceSaving
+
+
+def exact_counts(keys: np.ndarray) -> pd.Series:
+    return pd.Series(keys).value_counts()
+
+
+def summarize(keys: np.ndarray, capacity: int) -> SpaceSaving:
+    counts = exact_counts(keys).rename('count').rename_axis('path').to_frame()
+    return SpaceSaving.from_counts(counts, capacity)
+
+
+@pytest.fixture
+def skewed_chunks():
+    """Zipf-distributed keys split into chunks of uneven sizes"""
+    rng = np.random.default_rng(7)
+    keys = np.array([f'/p/{value}' for value in rng.zipf(1.3, 60000) % 5000], dtype=object)
+    bounds = np.sort(rng.choice(np.arange(1, len(keys)), 7, replace=False))
+    return np.split(keys, bounds)
+
+
+@pytest.fixture
+def skewed_log(tmp_path):
+    """Bot requests for Zipf-distributed paths, spread evenly over the bots"""
+    rng = np.random.default_rng(5)
+    n = 30000
+    bots = [agent for _, agent in USER_AGENTS[3:]]
+    paths = rng.zipf(1.4, n) % 2000
+    agents = rng.integers(0, len(bots), n)
+    statuses = rng.choice([200, 404, 500], n, p=[0.7, 0.2, 0.1])
+    
+    filepath = tmp_path / 'skewed.log'
+    with open(filepath, 'w') as f:
+        for i in range(n):
+            f.write(f'66.249.66.1 - - [01/Dec/2024:{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d} +0000] '
+                    f'"GET /p/{paths[i]}/ HTTP/1.1" {statuses[i]} 100 "-" "{bots[agents[i]]}"\n')
+    return str(filepath)
+
+
+def assert_bounds(summary: SpaceSaving, exact: pd.Series):
+    counters = summary.counters
+    true = exact.reindex(counters.index, fill_value=0)
+    
+    assert summary.total == exact.sum()
+    assert (counters['count'] >= true).all()
+    assert (counters['count'] - counters['error'] <= true).all()
+    assert exact.drop(counters.index).max() <= summary.floor
+    
+    # Complete at the floor: every key occurring more often has a counter
+    found = set(summary.above(summary.floor).index)
+    assert set(exact[exact > summary.floor].index) <= found
+
+
+@pytest.mark.parametrize('capacity', [50, 200])
+def test_space_saving_union_bounds(skewed_chunks, capacity):
+    exact = exact_counts(np.concatenate(skewed_chunks))
+    summaries = [summarize(chunk, capacity) for chunk in skewed_chunks]
+    
+    merged = SpaceSaving.union(summaries)
+    
+    assert len(merged.counters) == capacity
+    assert merged.floor < exact.sum() / capacity * 2
+    assert_bounds(merged, exact)
+
+
+def test_space_saving_merge_order(skewed_chunks):
+    exact = exact_counts(np.concatenate(skewed_chunks))
+    summaries = [summarize(chunk, 100) for chunk in skewed_chunks]
+    
+    heavy = set(exact[exact > exact.sum() / 100].index)
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        order = rng.permutation(len(summaries))
+        folded = summaries[order[0]]
+        for i in order[1:]:
+            folded = folded.merge(summaries[i])
+        
+        assert_bounds(folded, exact)
+        assert heavy <= set(folded.above(folded.floor).index)
+
+
+def test_space_saving_nested_unions(skewed_chunks):
+    exact = exact_counts(np.concatenate(skewed_chunks))
+    summaries = [summarize(chunk, 100) for chunk in skewed_chunks]
+    
+    for split in range(1, len(summaries)):
+        halves = [SpaceSaving.union(summaries[:split]), SpaceSaving.union(summaries[split:])]
+        assert_bounds(SpaceSaving.union(halves), exact)
+
+
+def test_approximate_reports_bounds(skewed_log):
+    parser = ApacheLogParser()
+    exact = SEOLogAnalyzer(parser.parse_file(skewed_log))
+    analyzer = SEOLogAnalyzer(approximate=True, counters=50)
+    for chunk in parser.iter_chunks(skewed_log, chunk_rows=3000):
+        analyzer.update(chunk)
+    
+    bots = exact.bot_df
+    heavy_hitters = analyzer.aggregates.heavy_hitters
+    googlebot = bots['bot_type'].str.contains('googlebot', case=False)
+    errors = bots[bots['status'] >= ERROR_STATUS]
+    assert_bounds(heavy_hitters['paths'], bots['path'].value_counts())
+    assert_bounds(heavy_hitters['googlebot_paths'], bots.loc[googlebot, 'path'].value_counts())
+    assert_bounds(heavy_hitters['error_paths'], errors.groupby(['status', 'path'], observed=True).size())
+    
+    summary = heavy_hitters['error_paths']
+    for status_code in (404, 500):
+        pages = analyzer.get_error_pages(status_code)
+        true = exact.get_error_pages(status_code)
+        counts = true['error_count'].reindex(pages.index, fill_value=0)
+        error = summary.counters.loc[status_code, 'error'].reindex(pages.index)
+        
+        assert (pages['error_count'] >= counts).all()
+        assert (pages['error_count'] - error <= counts).all()
+        assert set(true.index[true['error_count'] > summary.floor]) <= set(pages.index)
+        for path, affected in pages['bots_affected'].items():
+            assert set(affected.split(', ')) <= set(true.loc[path, 'bots_affected'].split(', '))
+    
+    assert analyzer.crawl_frequency_by_path(min_crawls=1)['primary_bot'].notna().all()
+    
+    top_paths = analyzer.googlebot_analysis()['top_crawled_paths']
+    true = bots.loc[googlebot, 'path'].value_counts()
+    assert all(count >= true[path] for path, count in top_paths.items())
+    assert set(true.index[:20][true.iloc[:20] > heavy_hitters['googlebot_paths'].floor]) <= set(top_paths)
+
+
+@pytest.mark.parametrize('precision', [10, 14])
+@pytest.mark.parametrize('cardinality', [100, 5000, 200000])
+def test_hyperloglog_count(precision, cardinality):
+    sketch = HyperLogLog(precision).add(np.arange(cardinality))
+    
+    assert abs(sketch.count() - cardinality) <= 4 * sketch.relative_error * cardinality
+
+
+def test_hyperloglog_merge():
+    values = np.arange(30000)
+    parts = [HyperLogLog(12).add(chunk) for chunk in np.array_split(values, 4)]
+    whole = HyperLogLog(12).add(values)
+    
+    for order in itertools.permutations(parts):
+        merged = HyperLogLog.union(order)
+        np.testing.assert_array_equal(merged.registers, whole.registers)
+    
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(10))
@@ -0,0 +1,129 @@
+import gzip
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import iter_lines
+from src.parser import ApacheLogParser
+from src.tail import IncrementalLogReader
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / 'access.log')
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return IncrementalLogReader(str(tmp_path / 'state.json'))
+
+
+def lines(n, seed):
+    return [f'{line}\n' for line in iter_lines(n, seed=seed)]
+
+
+def append(filepath, new_lines, mode='a'):
+    with open(filepath, mode, encoding='utf-8') as f:
+        f.writelines(new_lines)
+
+
+def assert_rows(df, expected_lines):
+    expected = ApacheLogParser().parse_string(''.join(expected_lines))
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), expected, check_categorical=False)
+
+
+def test_reads_only_appended_lines(reader, log_path):
+    first, second = lines(200, seed=1), lines(50, seed=2)
+    append(log_path, first)
+    
+    assert_rows(reader.read(log_path), first)
+    assert reader.read(log_path).empty
+    
+    append(log_path, second)
+    assert_rows(reader.read(log_path), second)
+
+
+def test_partial_line_waits_for_newline(reader, log_path):
+    complete, (last,) = lines(20, seed=1), lines(1, seed=2)
+    append(log_path, [*complete, last[:40]])
+    
+    assert_rows(reader.read(log_path), complete)
+    assert reader.checkpoints[os.path.abspath(log_path)]['offset'] == len(''.join(complete))
+    
+    append(log_path, [last[40:]])
+    assert_rows(reader.read(log_path), [last])
+
+
+def test_restart_resumes_from_state(tmp_path, reader, log_path):
+    first, second = lines(100, seed=1), lines(30, seed=2)
+    append(log_path, first)
+    reader.read(log_path)
+    
+    with open(reader.state_path, encoding='utf-8') as f:
+        checkpoint = json.load(f)[os.path.abspath(log_path)]
+    stat = os.stat(log_path)
+    assert (checkpoint['device'], checkpoint['inode']) == (stat.st_dev, stat.st_ino)
+    assert checkpoint['offset'] == stat.st_size
+    assert checkpoint['signature']
+    
+    append(log_path, second)
+    restarted = IncrementalLogReader(reader.state_path)
+    assert_rows(restarted.read(log_path), second)
+
+
+def test_rename_rotation_finishes_rotated_file(reader, log_path):
+    first, late, fresh = lines(100, seed=1), lines(20, seed=2), lines(30, seed=3)
+    append(log_path, first)
+    reader.read(log_path)
+    
+    # logrotate 'create': lines written before the server reopens the log
+    # land in the renamed file
+    append(log_path, late)
+    os.rename(log_path, f'{log_path}.1')
+    append(log_path, fresh)
+    
+    assert_rows(reader.read(log_path), [*late, *fresh])
+    assert reader.checkpoints[os.path.abspath(log_path)]['inode'] == os.stat(log_path).st_ino
+
+
+@pytest.mark.parametrize('fresh_lines', [30, 300])
+def test_copytruncate_finishes_copy(reader, log_path, fresh_lines):
+    first, late, fresh = lines(100, seed=1), lines(20, seed=2), lines(fresh_lines, seed=3)
+    append(log_path, first)
+    reader.read(log_path)
+    inode = os.stat(log_path).st_ino
+    
+    # logrotate 'copytruncate': same inode, shorter or rewritten content
+    append(log_path, late)
+    shutil.copyfile(log_path, f'{log_path}.1')
+    append(log_path, fresh, mode='w')
+    assert os.stat(log_path).st_ino == inode
+    
+    assert_rows(reader.read(log_path), [*late, *fresh])
+
+
+def test_compressed_rotated_file_is_skipped(reader, log_path):
+    first, late, fresh = lines(100, seed=1), lines(20, seed=2), lines(30, seed=3)
+    append(log_path, first)
+    reader.read(log_path)
+    
+    append(log_path, late)
+    with open(log_path, 'rb') as f, gzip.open(f'{log_path}.1.gz', 'wb') as out:
+        shutil.copyfileobj(f, out)
+    os.remove(log_path)
+    assert reader.read(log_path).empty
+    
+    append(log_path, fresh)
+    assert_rows(reader.read(log_path), fresh)
+
+
+def test_reset_rereads_whole_file(reader, log_path):
+    first = lines(50, seed=1)
+    append(log_path, first)
+    reader.read(log_path)
+    
+    reader.reset(log_path)
+    assert_rows(reader.read(log_path), first)
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from src.parser import ApacheLogParser
+
+
+def in_range(df, since, until):
+    return df[(df['timestamp'] >= since) & (df['timestamp'] < until)].reset_index(drop=True)
+
+
+@pytest.fixture
+def bounds(access_log):
+    timestamps = ApacheLogParser().parse_file(access_log)['timestamp']
+    return timestamps.iloc[len(timestamps) // 3], timestamps.iloc[2 * len(timestamps) // 3]
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+@pytest.mark.parametrize('limit', [None, 10, 1000, 5000, 50000])
+def test_limit_counts_requests_in_range(access_log, bounds, limit, workers):
+    parser = ApacheLogParser()
+    since, until = bounds
+    expected = in_range(parser.parse_file(access_log), since, until).head(limit)
+    
+    bisected = parser.parse_file(access_log, limit=limit, since=since, until=until, workers=workers)
+    parser.build_index(access_log, every=500)
+    indexed = parser.parse_file(access_log, limit=limit, since=since, until=until, workers=workers)
+    
+    pd.testing.assert_frame_equal(bisected, expected)
+    pd.testing.assert_frame_equal(indexed, expected)
+
+
+def test_limit_in_range_of_path_list(access_log, bounds):
+    parser = ApacheLogParser()
+    since, until = bounds
+    expected = in_range(parser.parse_file(access_log), since, until).head(100)
+    
+    df = parser.parse_file([access_log], limit=100, since=since, until=until)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize('options', [
+    {'compact': True}, {'deferred_bots': True}, {'bots_only': True}, {'engine': 'mmap'},
+])
+def test_indexed_range_matches_filtered_parse(access_log, bounds, options):
+    parser = ApacheLogParser()
+    since, until = bounds
+    parse_options = {key: value for key, value in options.items() if key != 'bots_only'}
+    expected = in_range(parser.parse_file(access_log, **parse_options), since, until)
+    if options.get('bots_only'):
+        total_requests = len(expected)
+        expected = expected[expected['is_bot']].reset_index(drop=True)
+    
+    parser.build_index(access_log, every=500)
+    df = parser.parse_file(access_log, since=since, until=until, **options)
+    
+    # Categories only hold the values of the lines that were read
+    pd.testing.assert_frame_equal(df, expected, check_categorical=False)
+    if options.get('bots_only'):
+        assert df.attrs['total_requests'] == total_requests
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_log
+from src.aggregates import CrawlAggregates
+from src.analyzer import SEOLogAnalyzer
+from src.parser import ApacheLogParser
+
+
+@pytest.fixture
+def small_log(tmp_path):
+    return write_log(str(tmp_path / 'small.log'), 2000, seed=2, unique_paths=300)
+
+
+def test_chunks_without_bots_keep_categories(small_log):
+    parser = ApacheLogParser()
+    batch = SEOLogAnalyzer(parser.parse_file(small_log, compact=True))
+    streamed = SEOLogAnalyzer()
+    for chunk in parser.iter_chunks(small_log, chunk_rows=7, compact=True):
+        streamed.update(chunk)
+    
+    pd.testing.assert_frame_equal(streamed.crawl_frequency_by_path(), batch.crawl_frequency_by_path())
+    pd.testing.assert_frame_equal(streamed.get_error_pages(), batch.get_error_pages())
+    pd.testing.assert_frame_equal(streamed.get_error_pages(500), batch.get_error_pages(500))
+
+
+REPORTS = [
+    ('crawl_budget_summary', ()), ('bot_distribution', ()), ('googlebot_analysis', ()),
+    ('status_code_analysis', ()), ('crawl_frequency_by_path', ()), ('crawl_frequency_by_path', (1,)),
+    ('identify_crawl_traps', (3,)), ('time_series_analysis', ()), ('time_series_analysis', ('bingbot',)),
+    ('response_time_analysis', ()), ('get_error_pages', ()), ('get_error_pages', (500,)),
+    ('daily_crawl_report', ()), ('daily_crawl_report', ('bot_type', True)),
+]
+
+
+def assert_same(left, right):
+    if isinstance(left, pd.DataFrame):
+        pd.testing.assert_frame_equal(left, right)
+    elif isinstance(left, pd.Series):
+        pd.testing.assert_series_equal(left, right)
+    else:
+        assert left == right
+
+
+@pytest.mark.parametrize('chunk_rows', [13, 500])
+@pytest.mark.parametrize('options', [
+    {}, {'compact': True}, {'deferred_bots': True}, {'bots_only': True},
+])
+@pytest.mark.parametrize('bot_view', [False, True])
+def test_update_matches_batch(small_log, options, chunk_rows, bot_view):
+    parser = ApacheLogParser()
+    batch = SEOLogAnalyzer(parser.parse_file(small_log, **options), bot_view=bot_view)
+    streamed = SEOLogAnalyzer(bot_view=bot_view)
+    for chunk in parser.iter_chunks(small_log, chunk_rows=chunk_rows, **options):
+        streamed.update(chunk)
+    
+    for report, args in REPORTS:
+        assert_same(getattr(streamed, report)(*args), getattr(batch, report)(*args))
+
+
+def test_update_after_frame(small_log):
+    parser = ApacheLogParser()
+    chunks = list(parser.iter_chunks(small_log, chunk_rows=300))
+    batch = SEOLogAnalyzer(parser.parse_file(small_log))
+    streamed = SEOLogAnalyzer(chunks[0])
+    for chunk in chunks[1:]:
+        streamed.update(chunk)
+    
+    for report, args in REPORTS:
+        assert_same(getattr(streamed, report)(*args), getattr(batch, report)(*args))
+
+
+def test_merged_aggregates_match_batch(small_log):
+    parser = ApacheLogParser()
+    df = parser.parse_file(small_log)
+    bots = df[df['is_bot']].reset_index(drop=True)
+    parts = [
+        CrawlAggregates(chunk[chunk['is_bot']].reset_index(drop=True))
+        for chunk in parser.iter_chunks(small_log, chunk_rows=250)
+    ]
+    
+    merged = CrawlAggregates.merge(parts)
+    batch = CrawlAggregates(bots)
+    
+    pd.testing.assert_frame_equal(merged.grain, batch.grain)
+    assert merged.response_sizes() == batch.response_sizes()
+    assert (merged.start, merged.end) == (batch.start, batch.end)
+
+
+@pytest.mark.parametrize('options', [{}, {'compact': True}, {'deferred_bots': True}, {'bots_only': True}])
+def test_bot_view_matches_bot_copy(small_log, options):
+    df = ApacheLogParser().parse_file(small_log, **options)
+    copied = SEOLogAnalyzer(df)
+    viewed = SEOLogAnalyzer(df, bot_view=True)
+    
+    for report, args in REPORTS:
+        assert_same(getattr(viewed, report)(*args), getattr(copied, report)(*args))